@@ -29,11 +29,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'money_transfer.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'money_transfer.middleware.AccountMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -42,7 +44,7 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'money_transfer.template_backend.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -83,6 +85,22 @@ if not DEBUG:
         }
     }
 
+# Cache partagé entre processus (Redis si REDIS_URL est défini - paquet redis requis -, sinon cache mémoire local)
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'money-transfer',
+        }
+    }
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -124,19 +142,33 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Custom User Model
 AUTH_USER_MODEL = 'money_transfer.User'
 
+# Charge le compte virtuel avec l'utilisateur à chaque requête. ModelBackend reste listé
+# après lui : les sessions ouvertes avec l'ancien backend restent valides jusqu'à leur expiration.
+AUTHENTICATION_BACKENDS = [
+    'money_transfer.backends.AccountModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
 # Email Configuration
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
-EMAIL_USE_TLS = True
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', 'phineasbokopolo@gmail.com')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', 'fopk hxmx tabc vdip')
 DEFAULT_FROM_EMAIL = f"Money Transfer <{EMAIL_HOST_USER}>"
 
+# File d'envoi (outbox) : emails envoyés par le worker process_email_outbox
+EMAIL_OUTBOX_BATCH_SIZE = 50  # emails envoyés par lot sur une même connexion SMTP
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5  # tentatives avant abandon d'un email
+EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS = 30  # attente avant la 2e tentative, doublée ensuite
+EMAIL_OUTBOX_LEASE_SECONDS = 300  # réservation d'un lot par un worker (renvoi si le worker s'arrête)
+EMAIL_OUTBOX_RETENTION_DAYS = 7  # conservation des emails envoyés ou abandonnés
+
 
 # Logging Configuration
 LOGGING = {
@@ -183,7 +215,10 @@ LOGIN_REDIRECT_URL = 'dashboard'
 
 # Session Settings
 SESSION_COOKIE_AGE = 86400  # 24 h
-SESSION_SAVE_EVERY_REQUEST = True
+SESSION_SAVE_EVERY_REQUEST = True  # expiration glissante ; l'écriture en base est décidée par le moteur
+SESSION_ENGINE = 'money_transfer.session_backend'
+SESSION_REFRESH_THRESHOLD = SESSION_COOKIE_AGE - 15 * 60  # une session seulement lue est réécrite au plus tous les 1/4 h
+SESSION_WRITE_CACHE = bool(os.getenv('REDIS_URL'))  # cache de sessions seulement s'il est partagé entre processus
 
 # CSRF Settings
 CSRF_COOKIE_SECURE = not DEBUG
@@ -192,6 +227,36 @@ SESSION_COOKIE_SECURE = not DEBUG
 # OTP Settings
 OTP_EXPIRY_MINUTES = 10
 OTP_LENGTH = 6
+# Stockage des OTP : cache partagé (Redis) si disponible, sinon table OTP
+OTP_STORE = (
+    'money_transfer.services.otp_store.CacheOTPStore' if os.getenv('REDIS_URL')
+    else 'money_transfer.services.otp_store.DatabaseOTPStore'
+)
+
+# Transactions Settings
+ACCOUNT_LOCK_TIMEOUT_MS = int(os.getenv('ACCOUNT_LOCK_TIMEOUT_MS', 2000))  # attente max d'un verrou de compte
+TRANSACTION_MAX_ATTEMPTS = 3  # tentatives en cas d'interblocage / conflit de sérialisation
+TRANSACTION_RETRY_BACKOFF_MS = 20
+PLATFORM_FEE_STRIPES = int(os.getenv('PLATFORM_FEE_STRIPES', 8))  # sous-comptes de frais de la plateforme
+# Copie locale de la configuration : invalidée par la version partagée (Redis), sinon rechargée après 30 s
+PLATFORM_CONFIG_LOCAL_TTL = None if os.getenv('REDIS_URL') else 30
+PLATFORM_COUNTER_SHARDS = int(os.getenv('PLATFORM_COUNTER_SHARDS', 8))  # lignes par compteur global
+TRANSACTIONS_PAGE_SIZE = 50  # lignes par page des historiques (pagination par curseur)
+STATEMENT_CHUNK_SIZE = 2000  # lignes lues par aller-retour lors de l'export des relevés
+IDEMPOTENCY_KEY_TTL_HOURS = 24  # durée de validité d'une clé d'idempotence
+IDEMPOTENCY_CACHE_SIZE = 10_000  # entrées du cache LRU en mémoire (par processus)
+RETENTION_BATCH_SIZE = 1000  # lignes par DELETE des purges (plage de clés primaires)
+RETENTION_SLEEP_SECONDS = 0  # pause entre deux paquets des purges
+ACCOUNT_CACHE_ENABLED = bool(os.getenv('REDIS_URL'))  # soldes et statistiques des comptes en cache seulement s'il est partagé entre processus
+ACCOUNT_STATS_CACHE_TIMEOUT = 3600  # secondes ; invalidé à chaque mouvement du compte
+BALANCE_CACHE_TIMEOUT = 3600  # secondes ; versionné, la version change à chaque mouvement du compte
+
+# Monitoring Settings
+METRICS_DIR = os.getenv('METRICS_DIR')  # répertoire partagé par les workers gunicorn (vidé au démarrage)
+METRICS_FLUSH_INTERVAL = 5  # secondes entre deux recopies des histogrammes d'un worker
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # jeton Bearer du collecteur Prometheus (sinon session admin)
+SLOW_REQUEST_THRESHOLD_MS = int(os.getenv('SLOW_REQUEST_THRESHOLD_MS', 500))
+SLOW_REQUEST_MAX_QUERIES = 20  # requêtes SQL (les plus lentes) journalisées par requête lente
 
 TAILWIND_APP_NAME = 'theme'
 INTERNAL_IPS = [
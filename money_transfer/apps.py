@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MoneyTransferConfig(AppConfig):
     name = 'money_transfer'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,22 @@
+"""
+Backend d'authentification de Money Transfer
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class AccountModelBackend(ModelBackend):
+    """
+    ModelBackend qui charge le compte virtuel avec l'utilisateur (une seule requête par
+    requête HTTP) : user.virtual_account et hasattr(user, 'virtual_account') ne touchent
+    plus la base dans les décorateurs, services et vues.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related('virtual_account').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
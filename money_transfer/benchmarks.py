@@ -0,0 +1,164 @@
+"""
+Outils communs aux commandes de benchmark et de stress
+Mesure de latence, percentiles, création rapide de comptes de test,
+remplissage de l'historique et mesure de débit multi-threads
+"""
+import threading
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from money_transfer.models import User, VirtualAccount, Transaction
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from money_transfer.models.user import UserStatus
+
+
+def percentile(values, pct):
+    # Percentile (interpolation linéaire) d'une liste de valeurs
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class LatencyRecorder:
+    # Collecte thread-safe de latences (en secondes), résumé en millisecondes
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = []
+
+    def add(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def extend(self, samples):
+        with self._lock:
+            self.samples.extend(samples)
+
+    def summary(self):
+        samples_ms = [sample * 1000 for sample in self.samples]
+        return {
+            'count': len(samples_ms),
+            'mean_ms': round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+            'p50_ms': round(percentile(samples_ms, 50), 3),
+            'p95_ms': round(percentile(samples_ms, 95), 3),
+            'p99_ms': round(percentile(samples_ms, 99), 3),
+            'max_ms': round(max(samples_ms), 3) if samples_ms else 0.0,
+        }
+
+
+@transaction.atomic
+def create_benchmark_users(count, prefix='bench', balance=0):
+    # Crée (ou réutilise) `count` utilisateurs actifs et vérifiés avec leur compte virtuel.
+    # Mot de passe inutilisable : aucun hachage coûteux par utilisateur.
+    emails = [f"{prefix}{i}@{prefix}.local" for i in range(count)]
+    existing = set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    password = make_password(None)
+
+    User.objects.bulk_create([
+        User(
+            email=email,
+            phone=f"{prefix[:8]}-{i}",
+            first_name=prefix.capitalize(),
+            last_name=str(i),
+            password=password,
+            status=UserStatus.ACTIVE,
+            is_verified=True,
+        )
+        for i, email in enumerate(emails)
+        if email not in existing
+    ])
+
+    users = list(User.objects.filter(email__in=emails).select_related('virtual_account').order_by('id'))
+    VirtualAccount.objects.bulk_create([
+        VirtualAccount(user=user, balance=balance, is_active=True)
+        for user in users
+        if not hasattr(user, 'virtual_account')
+    ])
+
+    # Remettre les soldes au niveau demandé pour des runs reproductibles
+    VirtualAccount.objects.filter(user__in=users).update(balance=balance, is_active=True)
+    return list(User.objects.filter(email__in=emails).select_related('virtual_account').order_by('id'))
+
+
+def seed_transactions(accounts, rows, chunk_size=10_000):
+    # Insère `rows` dépôts répartis à tour de rôle sur les comptes, par paquets
+    inserted = 0
+    while inserted < rows:
+        size = min(chunk_size, rows - inserted)
+        with transaction.atomic():
+            Transaction.objects.bulk_create(
+                Transaction(
+                    type=TypeTransaction.DEPOSIT,
+                    status=TransactionStatus.SUCCESS,
+                    amount=100,
+                    net_amount=100,
+                    sender_account=accounts[(inserted + i) % len(accounts)],
+                    receiver_account=accounts[(inserted + i) % len(accounts)],
+                )
+                for i in range(size)
+            )
+        inserted += size
+    return inserted
+
+
+def measure_throughput(make_operation, threads, operations):
+    """
+    Exécute `operations` appels par thread sur `threads` threads concurrents.
+    `make_operation(thread_index)` est appelée dans le thread (objets et connexion propres)
+    et retourne l'opération à répéter ; une opération des services qui retourne
+    (False, message, ...) est comptée comme refusée, une exception comme erreur.
+    """
+    latencies = LatencyRecorder()
+    outcomes = {'success': 0, 'refused': 0, 'error': 0}
+    outcomes_lock = threading.Lock()
+    ready = threading.Barrier(threads + 1)
+
+    def worker(thread_index):
+        try:
+            try:
+                operation = make_operation(thread_index)
+            except Exception:
+                # Débloque les autres threads : la mesure échoue au lieu de rester bloquée
+                ready.abort()
+                raise
+            ready.wait()
+            samples = []
+            counts = {'success': 0, 'refused': 0, 'error': 0}
+            for _ in range(operations):
+                started = time.perf_counter()
+                try:
+                    result = operation()
+                    refused = isinstance(result, tuple) and result and result[0] is False
+                    counts['refused' if refused else 'success'] += 1
+                except Exception:
+                    counts['error'] += 1
+                samples.append(time.perf_counter() - started)
+            latencies.extend(samples)
+            with outcomes_lock:
+                for key, value in counts.items():
+                    outcomes[key] += value
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    # Le chronomètre démarre quand tous les threads sont prêts
+    ready.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    summary = latencies.summary()
+    summary.update(outcomes)
+    summary['threads'] = threads
+    summary['elapsed_s'] = round(elapsed, 3)
+    summary['ops_per_sec'] = round(summary['count'] / elapsed, 1) if elapsed else 0.0
+    return summary
@@ -1,8 +1,11 @@
 """
 Formulaires pour les actions administrateur
 """
+from datetime import timedelta
+
 from django import forms
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from money_transfer.models import User, Platform
 from money_transfer.models.user import UserStatus
 
@@ -252,6 +255,14 @@ class StatisticsFilterForm(forms.Form):
         ('custom', 'Période personnalisée'),
     ]
     
+    GRANULARITY_CHOICES = [
+        ('day', 'Par jour'),
+        ('hour', 'Par heure'),
+    ]
+    
+    # Au-delà, la granularité horaire retombe sur le jour (744 tranches au plus par type)
+    MAX_HOURLY_DAYS = 31
+    
     period = forms.ChoiceField(
         choices=PERIOD_CHOICES,
         required=False,
@@ -280,6 +291,12 @@ class StatisticsFilterForm(forms.Form):
         label="Au"
     )
     
+    granularity = forms.ChoiceField(
+        choices=GRANULARITY_CHOICES,
+        required=False,
+        label="Granularité"
+    )
+    
     def clean(self):
         """Validation des dates pour période personnalisée"""
         cleaned_data = super().clean()
@@ -296,4 +313,29 @@ class StatisticsFilterForm(forms.Form):
             if date_from > date_to:
                 raise ValidationError("La date de début doit être antérieure à la date de fin.")
         
-        return cleaned_data
\ No newline at end of file
+        return cleaned_data
+    
+    def get_date_range(self):
+        """Bornes (date_from, date_to) incluses de la période choisie (ce mois par défaut)"""
+        data = getattr(self, 'cleaned_data', {})
+        today = timezone.localdate()
+        period = data.get('period') or 'month'
+        
+        if period == 'custom':
+            return data['date_from'], data['date_to']
+        if period == 'today':
+            return today, today
+        if period == 'week':
+            return today - timedelta(days=today.weekday()), today
+        if period == 'year':
+            return today.replace(month=1, day=1), today
+        return today.replace(day=1), today
+    
+    def get_granularity(self, date_from, date_to):
+        """Granularité de la série : l'heure seulement sur une période d'au plus MAX_HOURLY_DAYS jours"""
+        data = getattr(self, 'cleaned_data', {})
+        days = (date_to - date_from).days + 1
+        granularity = data.get('granularity') or ('hour' if days == 1 else 'day')
+        if granularity == 'hour' and days > self.MAX_HOURLY_DAYS:
+            return 'day'
+        return granularity
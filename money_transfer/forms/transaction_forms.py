@@ -3,8 +3,8 @@ Formulaires pour les opérations financières
 """
 from django import forms
 from django.core.exceptions import ValidationError
-from money_transfer.models import User, Platform
-from money_transfer.services import AccountService
+from money_transfer.models import User
+from money_transfer.services import AccountService, PlatformConfigService
 
 
 class DepositForm(forms.Form):
@@ -62,12 +62,10 @@ class WithdrawalForm(forms.Form):
         
         # Récupérer les frais de la plateforme
         try:
-            platform = Platform.objects.first()
-            if platform:
-                self.fee_rate = platform.withdrawal_fee_rate
-                self.fields['amount'].help_text = (
-                    f"Des frais de {self.fee_rate}% seront appliqués sur le retrait"
-                )
+            self.fee_rate = PlatformConfigService.get_fee_rate()
+            self.fields['amount'].help_text = (
+                f"Des frais de {self.fee_rate}% seront appliqués sur le retrait"
+            )
         except:
             self.fee_rate = 0
     
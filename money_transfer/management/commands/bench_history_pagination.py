@@ -0,0 +1,87 @@
+"""
+Commande Django de benchmark de la pagination de l'historique
+Usage: python manage.py bench_history_pagination --rows 1000000 --depths 1 100 1000 10000
+
+Remplit (si besoin) l'historique d'un compte de test, puis compare pour
+plusieurs profondeurs de page le coût d'une pagination par OFFSET et
+celui de la pagination par curseur (created_at, id).
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from money_transfer.benchmarks import LatencyRecorder, create_benchmark_users, seed_transactions
+from money_transfer.models import Transaction
+from money_transfer.pagination import split_page
+from money_transfer.services import TransactionService
+
+
+class Command(BaseCommand):
+    help = 'Compare pagination par OFFSET et par curseur sur un historique volumineux'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Taille de l\'historique du compte')
+        parser.add_argument('--page-size', type=int, default=50, help='Lignes par page')
+        parser.add_argument('--depths', type=int, nargs='+', default=[1, 100, 1000, 10000], help='Numéros de page mesurés')
+        parser.add_argument('--repeat', type=int, default=20, help='Mesures par profondeur')
+        parser.add_argument('--chunk-size', type=int, default=10_000, help='Taille des paquets d\'insertion')
+        parser.add_argument('--prefix', type=str, default='history', help='Préfixe du compte de test')
+
+    def handle(self, *args, **options):
+        user, = create_benchmark_users(1, prefix=options['prefix'])
+        account = user.virtual_account
+        history = TransactionService.get_user_transactions(user, limit=None)
+
+        self.seed(account, options['rows'], options['chunk_size'])
+        total = Transaction.objects.filter(sender_account=account).count()
+        page_size = options['page_size']
+
+        self.stdout.write('\n' + '=' * 64)
+        self.stdout.write(f" Historique : {total:,} transactions, {page_size} lignes par page")
+        self.stdout.write('=' * 64)
+        self.stdout.write(f" {'Page':>8}{'OFFSET p50 (ms)':>20}{'Curseur p50 (ms)':>20}{'Ratio':>10}")
+        self.stdout.write('-' * 64)
+
+        for depth in options['depths']:
+            offset = (depth - 1) * page_size
+            if offset >= total:
+                continue
+
+            # Curseur de la page précédente (hors mesure)
+            cursor = None
+            if offset:
+                previous = history[offset - 1]
+                cursor = (previous.created_at, previous.id)
+
+            by_offset = LatencyRecorder()
+            by_cursor = LatencyRecorder()
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                list(history[offset:offset + page_size])
+                by_offset.add(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                split_page(
+                    TransactionService.get_user_transactions(user, limit=page_size + 1, cursor=cursor),
+                    page_size
+                )
+                by_cursor.add(time.perf_counter() - started)
+
+            offset_ms = by_offset.summary()['p50_ms']
+            cursor_ms = by_cursor.summary()['p50_ms']
+            ratio = offset_ms / cursor_ms if cursor_ms else 0
+            self.stdout.write(f" {depth:>8}{offset_ms:>20.2f}{cursor_ms:>20.2f}{ratio:>9.1f}x")
+
+        self.stdout.write('=' * 64)
+
+    def seed(self, account, rows, chunk_size):
+        # Complète l'historique du compte par paquets (dépôts : émetteur = récepteur)
+        existing = Transaction.objects.filter(sender_account=account).count()
+        missing = rows - existing
+        if missing <= 0:
+            return
+
+        self.stdout.write(self.style.HTTP_INFO(f' Insertion de {missing:,} transactions...'))
+        started = time.perf_counter()
+        seed_transactions([account], missing, chunk_size)
+        self.stdout.write(f' Insertion terminée en {time.perf_counter() - started:.1f} s')
@@ -0,0 +1,85 @@
+"""
+Commande Django de benchmark des OTP
+Usage: python manage.py bench_otp --users 50 --rounds 20 --stores db cache
+
+Pour chaque backend de stockage, émet puis valide `rounds` codes par utilisateur
+et affiche le débit et les latences de l'émission et de la validation.
+Le backend « cache » utilise le cache configuré (Redis si REDIS_URL est défini).
+"""
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from money_transfer.benchmarks import LatencyRecorder, create_benchmark_users
+from money_transfer.models.user import OTPType
+from money_transfer.services.otp_store import DatabaseOTPStore, CacheOTPStore, OTP_VALID
+from money_transfer.services.otp_service import OTPService
+
+STORES = {
+    'db': DatabaseOTPStore,
+    'cache': CacheOTPStore,
+}
+
+
+class Command(BaseCommand):
+    help = "Compare le débit d'émission et de validation des OTP selon le backend de stockage"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help="Nombre d'utilisateurs")
+        parser.add_argument('--rounds', type=int, default=20, help='Codes émis puis validés par utilisateur')
+        parser.add_argument('--stores', nargs='+', choices=list(STORES), default=list(STORES), help='Backends comparés')
+        parser.add_argument('--prefix', type=str, default='otp', help='Préfixe des comptes de test')
+
+    def handle(self, *args, **options):
+        users = create_benchmark_users(options['users'], prefix=options['prefix'])
+
+        self.stdout.write('\n' + '=' * 72)
+        self.stdout.write(f" {'Backend':<10}{'Opération':<12}{'Ops/s':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}{'Échecs':>9}")
+        self.stdout.write('=' * 72)
+
+        for name in options['stores']:
+            self.run(name, STORES[name](), users, options['rounds'])
+
+        self.stdout.write('=' * 72)
+
+    def run(self, name, store, users, rounds):
+        issued = LatencyRecorder()
+        verified = LatencyRecorder()
+        issue_time = verify_time = 0.0
+        failures = 0
+
+        for _ in range(rounds):
+            codes = []
+            started = time.perf_counter()
+            for user in users:
+                code = OTPService.generate_code()
+                op_started = time.perf_counter()
+                store.issue(user, OTPType.WITHDRAWAL, code, expires_at=self.expires_at())
+                issued.add(time.perf_counter() - op_started)
+                codes.append(code)
+            issue_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            for user, code in zip(users, codes):
+                op_started = time.perf_counter()
+                if store.consume(user, OTPType.WITHDRAWAL, code) != OTP_VALID:
+                    failures += 1
+                verified.add(time.perf_counter() - op_started)
+            verify_time += time.perf_counter() - started
+
+        store.cleanup()
+        for label, recorder, elapsed, errors in (
+            ('émission', issued, issue_time, 0),
+            ('validation', verified, verify_time, failures),
+        ):
+            summary = recorder.summary()
+            self.stdout.write(
+                f" {name:<10}{label:<12}{summary['count'] / elapsed:>12,.1f}"
+                f"{summary['p50_ms']:>11.3f}{summary['p99_ms']:>11.3f}{errors:>9}"
+            )
+
+    @staticmethod
+    def expires_at():
+        return timezone.now() + timedelta(minutes=2)
@@ -0,0 +1,81 @@
+"""
+Commande Django de benchmark des retraits concurrents
+Usage: python manage.py bench_platform_stripes --threads 8 --withdrawals 100 --stripes 1 8
+
+Chaque thread retire depuis son propre compte : seule la ligne du compte
+de frais de la plateforme est partagée. Compare le débit et les latences
+avec un seul sous-compte de frais et avec N sous-comptes.
+"""
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from money_transfer.benchmarks import LatencyRecorder, create_benchmark_users
+from money_transfer.models import User
+from money_transfer.services import AccountService, AccountLockService, TransactionService
+
+
+class Command(BaseCommand):
+    help = 'Compare le débit des retraits concurrents selon le nombre de sous-comptes de frais'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Nombre de threads (un compte par thread)')
+        parser.add_argument('--withdrawals', type=int, default=100, help='Retraits par thread')
+        parser.add_argument('--amount', type=int, default=1000, help='Montant de chaque retrait')
+        parser.add_argument('--stripes', type=int, nargs='+', default=[1, 8], help='Nombres de sous-comptes comparés')
+        parser.add_argument('--prefix', type=str, default='stripes', help='Préfixe des comptes de test')
+
+    def handle(self, *args, **options):
+        users = create_benchmark_users(options['threads'], prefix=options['prefix'], balance=10 ** 12)
+        user_ids = [user.id for user in users]
+
+        self.stdout.write('\n' + '=' * 72)
+        self.stdout.write(f" {'Sous-comptes':<14}{'Retraits/s':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}{'Rejeux':>9}{'Erreurs':>9}")
+        self.stdout.write('=' * 72)
+
+        for stripes in options['stripes']:
+            with override_settings(PLATFORM_FEE_STRIPES=stripes):
+                # Sous-comptes créés avant la mesure
+                for stripe in range(stripes):
+                    AccountService.get_or_create_platform_account(stripe)
+                self.run(stripes, user_ids, options)
+
+        self.stdout.write('=' * 72)
+        self.stdout.write(f" Solde plateforme consolidé : {AccountService.get_platform_balance():,.0f} FCFA")
+
+    def run(self, stripes, user_ids, options):
+        AccountLockService.reset_stats()
+        latencies = LatencyRecorder()
+        errors = []
+
+        def worker(user_id):
+            try:
+                user = User.objects.select_related('virtual_account').get(id=user_id)
+                for _ in range(options['withdrawals']):
+                    started = time.perf_counter()
+                    success, message, txn = TransactionService.withdraw(user, options['amount'])
+                    latencies.add(time.perf_counter() - started)
+                    if not success:
+                        errors.append(message)
+            except Exception as e:
+                errors.append(str(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(user_id,)) for user_id in user_ids]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        summary = latencies.summary()
+        stats = AccountLockService.get_stats()
+        self.stdout.write(
+            f" {stripes:<14}{summary['count'] / elapsed:>12,.1f}{summary['p50_ms']:>11.2f}"
+            f"{summary['p99_ms']:>11.2f}{stats['retries']:>9}{len(errors):>9}"
+        )
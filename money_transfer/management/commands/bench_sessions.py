@@ -0,0 +1,66 @@
+"""
+Commande Django de benchmark des écritures de sessions
+Usage: python manage.py bench_sessions --requests 1000 --url /dashboard/
+
+Un utilisateur connecté rafraîchit une page en lecture seule ; compte les écritures
+(INSERT/UPDATE sur django_session) pour 1 000 requêtes avec le moteur de sessions
+standard et avec le moteur à écritures réduites.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from money_transfer.benchmarks import create_benchmark_users
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'low-write': 'money_transfer.session_backend',
+    'low-write+cache': 'money_transfer.session_backend',
+}
+
+
+class Command(BaseCommand):
+    help = 'Compte les écritures de sessions par 1 000 requêtes selon le moteur de sessions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000, help='Requêtes par moteur')
+        parser.add_argument('--url', type=str, default='/dashboard/', help='Page rafraîchie')
+
+    def handle(self, *args, **options):
+        user = create_benchmark_users(1, prefix='sessions')[0]
+
+        self.stdout.write('\n' + '=' * 72)
+        self.stdout.write(f" {'Moteur':<18}{'Écritures':>11}{'Écr./1000 req':>15}{'Lectures':>10}{'Req/s':>10}")
+        self.stdout.write('=' * 72)
+
+        for name, engine in ENGINES.items():
+            with override_settings(
+                SESSION_ENGINE=engine,
+                SESSION_WRITE_CACHE=name.endswith('+cache'),
+                ALLOWED_HOSTS=['*']
+            ):
+                self.run(name, user, options)
+
+        self.stdout.write('=' * 72)
+
+    def run(self, name, user, options):
+        client = Client()
+        client.force_login(user)
+        client.get(options['url'])  # préchauffage (caches applicatifs)
+
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            for _ in range(options['requests']):
+                client.get(options['url'])
+            elapsed = time.perf_counter() - started
+
+        session_queries = [query['sql'] for query in context.captured_queries if 'django_session' in query['sql']]
+        writes = sum(1 for sql in session_queries if sql.startswith(('INSERT', 'UPDATE')))
+        reads = len(session_queries) - writes
+        self.stdout.write(
+            f" {name:<18}{writes:>11}{writes * 1000 / options['requests']:>15,.1f}"
+            f"{reads:>10}{options['requests'] / elapsed:>10,.1f}"
+        )
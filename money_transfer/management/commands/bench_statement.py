@@ -0,0 +1,84 @@
+"""
+Commande Django de benchmark de l'export des relevés CSV
+Usage: python manage.py bench_statement --rows 1000000 [--chunk-sizes 500 2000 10000] [--compare-list]
+
+Remplit (si besoin) l'historique d'un compte de test, puis mesure pour chaque taille
+de paquet le délai avant la première ligne, la durée totale, le débit et le pic de
+mémoire Python (tracemalloc) de l'export en flux. --compare-list mesure aussi le pic
+quand toutes les lignes sont chargées d'un coup (ce que ferait un rendu de template).
+"""
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from money_transfer.benchmarks import create_benchmark_users, seed_transactions
+from money_transfer.models import Transaction
+from money_transfer.services import StatementService
+
+
+class Command(BaseCommand):
+    help = 'Mesure débit et mémoire de l\'export CSV en flux d\'un relevé volumineux'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Taille de l\'historique du compte')
+        parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[500, 2000, 10000], help='Tailles de paquet mesurées')
+        parser.add_argument('--compare-list', action='store_true', help='Mesurer aussi le chargement complet en mémoire')
+        parser.add_argument('--prefix', type=str, default='statement', help='Préfixe du compte de test')
+
+    def handle(self, *args, **options):
+        user, = create_benchmark_users(1, prefix=options['prefix'])
+        account = user.virtual_account
+
+        missing = options['rows'] - Transaction.objects.filter(sender_account=account).count()
+        if missing > 0:
+            self.stdout.write(self.style.HTTP_INFO(f' Insertion de {missing:,} transactions...'))
+            started = time.perf_counter()
+            seed_transactions([account], missing)
+            self.stdout.write(f' Insertion terminée en {time.perf_counter() - started:.1f} s')
+
+        total = Transaction.objects.filter(sender_account=account).count()
+        self.stdout.write('\n' + '=' * 78)
+        self.stdout.write(f" Relevé : {total:,} mouvements")
+        self.stdout.write('=' * 78)
+        self.stdout.write(
+            f" {'Mode':<18}{'1re ligne (ms)':>16}{'Durée (s)':>12}{'Lignes/s':>14}{'Pic mémoire (Mo)':>18}"
+        )
+        self.stdout.write('-' * 78)
+
+        for chunk_size in options['chunk_sizes']:
+            first, elapsed, count = self.stream(account, chunk_size)
+            peak = self.peak_memory(lambda: self.stream(account, chunk_size))
+            self.stdout.write(
+                f" {f'flux ({chunk_size})':<18}{first * 1000:>16.1f}{elapsed:>12.2f}{count / elapsed:>14,.0f}{peak:>18.1f}"
+            )
+
+        if options['compare_list']:
+            started = time.perf_counter()
+            count = len(list(StatementService.get_statement_rows(account)))
+            elapsed = time.perf_counter() - started
+            peak = self.peak_memory(lambda: list(StatementService.get_statement_rows(account)))
+            self.stdout.write(f" {'liste complète':<18}{'-':>16}{elapsed:>12.2f}{count / elapsed:>14,.0f}{peak:>18.1f}")
+
+        self.stdout.write('=' * 78)
+
+    def stream(self, account, chunk_size):
+        # Consomme le relevé comme le ferait la réponse HTTP ; retourne (1re ligne, durée, lignes).
+        # La 1re ligne est le premier mouvement (l'en-tête est émis avant la requête).
+        started = time.perf_counter()
+        first = 0.0
+        count = 0
+        for _ in StatementService.iter_csv(account, chunk_size=chunk_size):
+            count += 1
+            if count == 2:
+                first = time.perf_counter() - started
+        return first, time.perf_counter() - started, count - 1
+
+    def peak_memory(self, func):
+        # Pic d'allocation Python (Mo) pendant func() ; passe séparée, tracemalloc ralentit l'exécution
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        finally:
+            tracemalloc.stop()
@@ -0,0 +1,113 @@
+"""
+Commande Django de benchmark du débit du TransactionService
+Usage: python manage.py bench_throughput --datasets 10000 1000000 --threads 1 4 16 --output bench.json
+
+Pour chaque taille de jeu de données (transactions en base) et chaque niveau de
+concurrence, mesure le débit (op/s) et les latences p50/p95/p99 de deposit, withdraw,
+transfer et get_user_transactions (première page). La base mesurée est celle des
+settings : lancer la commande une fois sur SQLite et une fois sur PostgreSQL
+(DEBUG=True, variables DB_*) puis comparer les deux fichiers JSON.
+Les jeux de données ne font que grossir : enchaîner les tailles par ordre croissant.
+"""
+import json
+import platform
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from money_transfer.benchmarks import create_benchmark_users, measure_throughput, seed_transactions
+from money_transfer.models import Transaction, User
+from money_transfer.services import TransactionService
+
+OPERATIONS = ['deposit', 'withdraw', 'transfer', 'history']
+
+
+def make_operation(name, user_ids, amount):
+    # Fabrique d'opération par thread : chaque thread agit sur son propre compte
+    def factory(thread_index):
+        users = list(User.objects.filter(id__in=user_ids).select_related('virtual_account').order_by('id'))
+        user = users[thread_index % len(users)]
+        receiver = users[(thread_index + 1) % len(users)]
+
+        if name == 'deposit':
+            return lambda: TransactionService.deposit(user, amount)
+        if name == 'withdraw':
+            return lambda: TransactionService.withdraw(user, amount)
+        if name == 'transfer':
+            return lambda: TransactionService.transfer(user, receiver.email, amount)
+        return lambda: list(TransactionService.get_user_transactions(user, limit=50))
+    return factory
+
+
+class Command(BaseCommand):
+    help = 'Mesure débit et latences des opérations du TransactionService (résultats JSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--datasets', type=int, nargs='+', default=[10_000], help='Transactions en base avant mesure')
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16], help='Niveaux de concurrence')
+        parser.add_argument('--operations', type=int, default=200, help='Opérations par thread')
+        parser.add_argument('--only', choices=OPERATIONS, nargs='+', default=OPERATIONS, help='Opérations mesurées')
+        parser.add_argument('--amount', type=int, default=100, help='Montant de chaque opération')
+        parser.add_argument('--chunk-size', type=int, default=10_000, help='Taille des paquets d\'insertion')
+        parser.add_argument('--prefix', type=str, default='throughput', help='Préfixe des comptes de test')
+        parser.add_argument('--output', type=str, help='Fichier JSON (par défaut : bench_throughput_<base>.json)')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        output = options['output'] or f'bench_throughput_{vendor}.json'
+
+        # Un compte par thread au niveau de concurrence le plus élevé (transfert : thread i -> i+1)
+        users = create_benchmark_users(max(max(options['threads']), 2), prefix=options['prefix'], balance=10 ** 12)
+        user_ids = [user.id for user in users]
+        accounts = [user.virtual_account for user in users]
+
+        report = {
+            'meta': {
+                'vendor': vendor,
+                'database': str(connection.settings_dict['NAME']),
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'started_at': timezone.now().isoformat(),
+                'operations_per_thread': options['operations'],
+            },
+            'results': [],
+        }
+
+        for dataset in sorted(options['datasets']):
+            missing = dataset - Transaction.objects.count()
+            if missing > 0:
+                self.stdout.write(self.style.HTTP_INFO(f' Insertion de {missing:,} transactions...'))
+                started = time.perf_counter()
+                seed_transactions(accounts, missing, options['chunk_size'])
+                self.stdout.write(f' Insertion terminée en {time.perf_counter() - started:.1f} s')
+
+            rows = Transaction.objects.count()
+            self.stdout.write('\n' + '=' * 84)
+            self.stdout.write(f" {vendor} | {rows:,} transactions en base")
+            self.stdout.write('=' * 84)
+            self.stdout.write(
+                f" {'Opération':<12}{'Threads':>8}{'op/s':>12}{'p50 (ms)':>11}{'p95 (ms)':>11}"
+                f"{'p99 (ms)':>11}{'Refusées':>10}{'Erreurs':>9}"
+            )
+            self.stdout.write('-' * 84)
+
+            for name in options['only']:
+                for threads in options['threads']:
+                    summary = measure_throughput(
+                        make_operation(name, user_ids, options['amount']), threads, options['operations']
+                    )
+                    summary.update({'dataset': dataset, 'rows': rows, 'operation': name})
+                    report['results'].append(summary)
+                    self.stdout.write(
+                        f" {name:<12}{threads:>8}{summary['ops_per_sec']:>12,.1f}{summary['p50_ms']:>11.2f}"
+                        f"{summary['p95_ms']:>11.2f}{summary['p99_ms']:>11.2f}{summary['refused']:>10}{summary['error']:>9}"
+                    )
+
+            self.stdout.write('=' * 84)
+
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f' Résultats écrits dans {output}'))
@@ -0,0 +1,101 @@
+"""
+Commande Django de benchmark du chemin d'écriture des transactions
+Usage: python manage.py bench_write_path --operations 200
+
+Compte, par opération, les requêtes SQL émises (par type) et les lignes
+de Transaction écrites, puis compare les deux stratégies d'écriture :
+- "pending_then_success" : INSERT en PENDING puis UPDATE vers SUCCESS (ancien chemin)
+- "direct"               : INSERT directement dans l'état final (chemin actuel)
+"""
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from money_transfer.benchmarks import create_benchmark_users
+from money_transfer.models import Transaction
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from money_transfer.services import TransactionService
+
+
+def classify(sql):
+    # Catégorie d'une requête SQL capturée
+    verb = sql.lstrip().split(' ', 1)[0].upper()
+    if verb in ('SELECT', 'INSERT', 'UPDATE', 'DELETE'):
+        return verb
+    return 'OTHER'
+
+
+class Command(BaseCommand):
+    help = 'Mesure requêtes et lignes écrites par opération (dépôt, retrait, transfert)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--operations', type=int, default=200, help='Opérations par type')
+        parser.add_argument('--prefix', type=str, default='writepath', help='Préfixe des comptes de test')
+
+    def handle(self, *args, **options):
+        count = options['operations']
+        sender, receiver = create_benchmark_users(2, prefix=options['prefix'], balance=10 ** 12)
+
+        self.stdout.write(self.style.HTTP_INFO(f' {count} opérations par type...'))
+        self.stdout.write('\n' + '=' * 78)
+        self.stdout.write(f" {'Opération':<22}{'Requêtes/op':>12}{'INSERT':>9}{'UPDATE':>9}{'SELECT':>9}{'Lignes txn/op':>16}")
+        self.stdout.write('=' * 78)
+
+        operations = [
+            ('deposit', lambda: TransactionService.deposit(sender, 1000)),
+            ('withdraw', lambda: TransactionService.withdraw(sender, 1000)),
+            ('transfer', lambda: TransactionService.transfer(sender, receiver.email, 1000)),
+        ]
+        for name, operation in operations:
+            self.report(name, count, operation)
+
+        account = sender.virtual_account
+        self.stdout.write('-' * 78)
+        self.report('pending_then_success', count, lambda: self.pending_then_success(account))
+        self.report('direct', count, lambda: self.direct(account))
+        self.stdout.write('=' * 78)
+
+    def report(self, name, count, operation):
+        before = Transaction.objects.count()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(count):
+                operation()
+            elapsed = time.perf_counter() - started
+        written = Transaction.objects.count() - before
+
+        kinds = Counter(classify(query['sql']) for query in queries.captured_queries)
+        self.stdout.write(
+            f" {name:<22}{len(queries.captured_queries) / count:>12.2f}"
+            f"{kinds['INSERT'] / count:>9.2f}{kinds['UPDATE'] / count:>9.2f}{kinds['SELECT'] / count:>9.2f}"
+            f"{written / count:>16.2f}   ({count / elapsed:,.0f} op/s)"
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def pending_then_success(account):
+        # Ancien chemin : la ligne est insérée en PENDING puis mise à jour dans le même bloc
+        txn = Transaction.objects.create(
+            type=TypeTransaction.DEPOSIT,
+            status=TransactionStatus.PENDING,
+            amount=1,
+            net_amount=1,
+            sender_account=account,
+            receiver_account=account,
+        )
+        txn.transition(TransactionStatus.SUCCESS)
+
+    @staticmethod
+    @transaction.atomic
+    def direct(account):
+        Transaction.objects.create(
+            type=TypeTransaction.DEPOSIT,
+            status=TransactionStatus.SUCCESS,
+            amount=1,
+            net_amount=1,
+            sender_account=account,
+            receiver_account=account,
+        )
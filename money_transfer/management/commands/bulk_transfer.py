@@ -0,0 +1,96 @@
+"""
+Commande Django pour exécuter un transfert groupé depuis un fichier CSV
+Usage: python manage.py bulk_transfer paie.csv --sender rh@example.com
+
+Format du CSV : une ligne par destinataire, colonnes "email,montant"
+(une ligne d'en-tête éventuelle est ignorée).
+"""
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from money_transfer.models import User
+from money_transfer.services import TransactionService
+
+
+class Command(BaseCommand):
+    help = 'Exécute un transfert groupé (paie, décaissements) depuis un fichier CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_file',
+            type=str,
+            help='Chemin du fichier CSV (email,montant)'
+        )
+        parser.add_argument(
+            '--sender',
+            type=str,
+            required=True,
+            help='Email de l\'utilisateur émetteur'
+        )
+        parser.add_argument(
+            '--delimiter',
+            type=str,
+            help='Séparateur de colonnes',
+            default=','
+        )
+        parser.add_argument(
+            '--show-errors',
+            type=int,
+            help='Nombre maximum de lignes en échec à afficher',
+            default=20
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sender = User.objects.select_related('virtual_account').get(email=options['sender'])
+        except User.DoesNotExist:
+            raise CommandError(f"Aucun utilisateur trouvé avec l'email : {options['sender']}")
+
+        lines = self.read_lines(options['csv_file'], options['delimiter'])
+        self.stdout.write(self.style.HTTP_INFO(f' {len(lines)} ligne(s) lues depuis {options["csv_file"]}'))
+
+        started = time.perf_counter()
+        success, message, results = TransactionService.bulk_transfer(sender, lines)
+        elapsed = time.perf_counter() - started
+
+        succeeded = sum(1 for result in results if result['success'])
+        failed = [result for result in results if not result['success']]
+
+        style = self.style.SUCCESS if success else self.style.ERROR
+        self.stdout.write(style(message))
+
+        for result in failed[:options['show_errors']]:
+            self.stdout.write(self.style.WARNING(
+                f"  Ligne {result['line']} ({result['receiver_email']}, {result['amount']}) : {result['message']}"
+            ))
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(f' Lignes réussies : {succeeded}')
+        self.stdout.write(f' Lignes en échec : {len(failed)}')
+        self.stdout.write(f' Durée           : {elapsed:.3f} s')
+        if elapsed > 0:
+            self.stdout.write(f' Débit           : {len(results) / elapsed:,.0f} lignes/s')
+        self.stdout.write('=' * 60)
+
+    def read_lines(self, path, delimiter):
+        # Lit le CSV ; les montants non entiers sont conservés tels quels et rejetés par le service
+        lines = []
+        try:
+            with open(path, newline='', encoding='utf-8') as handle:
+                for row in csv.reader(handle, delimiter=delimiter):
+                    if not row or not row[0].strip():
+                        continue
+                    email = row[0].strip()
+                    raw_amount = row[1].strip() if len(row) > 1 else ''
+                    try:
+                        amount = int(raw_amount)
+                    except ValueError:
+                        # Ligne d'en-tête
+                        if not lines and '@' not in email:
+                            continue
+                        amount = raw_amount
+                    lines.append((email, amount))
+        except OSError as e:
+            raise CommandError(f"Impossible de lire le fichier {path} : {e}")
+        return lines
@@ -5,7 +5,7 @@ Usage: python manage.py create_admin
 
 from django.core.management.base import BaseCommand
 from money_transfer.models import User
-from money_transfer.services import AccountService, TransactionService
+from money_transfer.services import AccountService, TransactionService, StatsService
 from money_transfer.models.user import UserStatus
 from money_transfer.models import VirtualAccount
 
@@ -73,6 +73,7 @@ class Command(BaseCommand):
                 phone=phone,
                 gender='M'
             )
+            StatsService.record_user_created(user)
             self.stdout.write(self.style.SUCCESS(f' Superuser créé : {email}'))
 
         # 2. Créer le compte virtuel
@@ -0,0 +1,58 @@
+"""
+Commande Django d'export du relevé CSV d'un compte
+Usage: python manage.py export_statement --email user@example.com [--from 2026-01-01 --to 2026-03-31] [--output releve.csv]
+
+Même contenu que le téléchargement depuis l'historique : mouvements réussis dans l'ordre
+chronologique avec solde progressif, lus en flux (mémoire constante).
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from money_transfer.models import User
+from money_transfer.services import StatementService
+
+
+class Command(BaseCommand):
+    help = 'Exporte en CSV le relevé de compte d\'un utilisateur'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--email', type=str, required=True, help='Email du titulaire du compte')
+        parser.add_argument('--from', dest='date_from', type=str, help='Premier jour au format AAAA-MM-JJ')
+        parser.add_argument('--to', dest='date_to', type=str, help='Dernier jour (inclus) au format AAAA-MM-JJ')
+        parser.add_argument('--output', type=str, help='Fichier de sortie (sortie standard par défaut)')
+        parser.add_argument('--chunk-size', type=int, help='Lignes lues par aller-retour')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.select_related('virtual_account').get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f"Aucun utilisateur avec l'email {options['email']}")
+        if not hasattr(user, 'virtual_account'):
+            raise CommandError(f"{user.email} n'a pas de compte virtuel")
+
+        if bool(options['date_from']) != bool(options['date_to']):
+            raise CommandError("Spécifiez --from et --to ensemble")
+
+        date_from = date_to = None
+        if options['date_from']:
+            try:
+                date_from = datetime.strptime(options['date_from'], '%Y-%m-%d').date()
+                date_to = datetime.strptime(options['date_to'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("Date invalide, format attendu : AAAA-MM-JJ")
+            if date_from > date_to:
+                raise CommandError("La date de début doit être antérieure à la date de fin")
+
+        lines = StatementService.iter_csv(user.virtual_account, date_from, date_to, options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        count = 0
+        with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f' {count - 1:,} ligne(s) écrite(s) dans {options["output"]}'))
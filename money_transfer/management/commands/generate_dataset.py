@@ -0,0 +1,289 @@
+"""
+Commande Django de génération d'un jeu de données synthétique (profilage, benchmarks)
+Usage: python manage.py generate_dataset --users 100000 --transactions 10000000 [--seed 42]
+
+Crée des utilisateurs actifs avec leur compte virtuel, puis simule en mémoire un
+historique réaliste (dépôts, transferts, retraits et leurs frais, quelques échecs)
+réparti sur --days jours. Les transactions sont insérées par paquets : COPY sur
+PostgreSQL, bulk_create ailleurs. Les soldes finaux (comptes et sous-comptes de frais)
+sont exactement ceux du grand livre généré ; compteurs et cumuls sont recalculés à la fin.
+Tous les utilisateurs partagent le même mot de passe (--password), haché une seule fois.
+"""
+import io
+import math
+import random
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from money_transfer.models import User, VirtualAccount, Transaction
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from money_transfer.models.user import UserStatus
+from money_transfer.services import AccountService, StatsService
+
+FIRST_NAMES = ['Kofi', 'Ama', 'Yao', 'Akossiwa', 'Komla', 'Afi', 'Kossi', 'Abla', 'Mawuli', 'Essi', 'Sena', 'Edem']
+LAST_NAMES = ['Mensah', 'Agbeko', 'Lawson', 'Amegan', 'Kpodar', 'Adjovi', 'Dogbe', 'Akakpo', 'Gbadoe', 'Tchalla']
+
+# Répartition des opérations simulées (le reste : retraits)
+DEPOSIT_SHARE = 0.35
+TRANSFER_SHARE = 0.40
+
+# Colonnes insérées pour chaque transaction
+TRANSACTION_FIELDS = (
+    'reference', 'type', 'status', 'amount', 'fee', 'net_amount',
+    'sender_account_id', 'receiver_account_id', 'description', 'created_at', 'updated_at',
+)
+
+
+def draw_amount(rng, low, high):
+    # Montant log-uniforme arrondi à la centaine : beaucoup de petits montants, quelques gros
+    return max(100, int(math.exp(rng.uniform(math.log(low), math.log(high)))) // 100 * 100)
+
+
+@contextmanager
+def explicit_timestamps(model):
+    # bulk_create applique auto_now / auto_now_add : désactivés le temps d'insérer des dates passées
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Génère des utilisateurs, comptes et un historique de transactions cohérent'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Nombre d\'utilisateurs à créer')
+        parser.add_argument('--transactions', type=int, default=100_000, help='Nombre de transactions à créer')
+        parser.add_argument('--days', type=int, default=90, help='Période couverte par l\'historique (jours)')
+        parser.add_argument('--chunk-size', type=int, default=10_000, help='Taille des paquets d\'insertion')
+        parser.add_argument('--prefix', type=str, default='user', help='Préfixe des emails (user1@..., user2@...)')
+        parser.add_argument('--domain', type=str, default='dataset.local', help='Domaine des emails')
+        parser.add_argument('--password', type=str, default='password123', help='Mot de passe commun')
+        parser.add_argument('--failure-rate', type=float, default=0.005, help='Part des opérations en échec')
+        parser.add_argument('--seed', type=int, help='Graine aléatoire (jeu de données reproductible)')
+        parser.add_argument('--skip-stats', action='store_true', help='Ne pas recalculer compteurs et cumuls')
+
+    def handle(self, *args, **options):
+        if options['users'] < 2:
+            raise CommandError("Il faut au moins 2 utilisateurs (transferts)")
+        if options['transactions'] < 0 or options['chunk_size'] < 1:
+            raise CommandError("Nombre de transactions et taille des paquets invalides")
+
+        prefix, domain = options['prefix'], options['domain']
+        if User.objects.filter(email__startswith=prefix, email__endswith=f'@{domain}').exists():
+            raise CommandError(f"Des utilisateurs {prefix}…@{domain} existent déjà : changez --prefix ou --domain")
+
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            accounts = self.create_users(options, rng)
+            self.stdout.write(f' {len(accounts):,} utilisateurs et comptes créés ({time.perf_counter() - started:.1f} s)')
+
+            platform = AccountService.get_or_create_platform()
+            fee_accounts = [
+                AccountService.get_or_create_platform_account(stripe).id
+                for stripe in range(AccountService.get_platform_stripes())
+            ]
+
+            balances, fees, written = self.create_transactions(options, rng, accounts, platform, fee_accounts)
+            self.stdout.write(
+                f' {written:,} transactions créées via {self.insert_method()} ({time.perf_counter() - started:.1f} s)'
+            )
+
+            self.apply_balances(accounts, balances, fees, fee_accounts, options['chunk_size'])
+
+        AccountService.invalidate_account_caches(fee_accounts)
+
+        if not options['skip_stats']:
+            self.stdout.write(self.style.HTTP_INFO(' Recalcul des compteurs et des cumuls...'))
+            StatsService.reconcile_platform_counters()
+            StatsService.rebuild_transaction_rollups()
+            StatsService.rebuild_account_months(
+                timezone.localtime(timezone.now() - timedelta(days=options['days'])).date(),
+                timezone.localdate()
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f' Jeu de données prêt en {time.perf_counter() - started:.1f} s '
+            f'({prefix}1@{domain} … {prefix}{options["users"]}@{domain}, mot de passe commun)'
+        ))
+
+    def create_users(self, options, rng):
+        # Utilisateurs et comptes par paquets ; retourne [(account_id, email)] dans l'ordre de création
+        password = make_password(options['password'])
+        prefix, domain, chunk_size = options['prefix'], options['domain'], options['chunk_size']
+        # Téléphones uniques par couple (préfixe, domaine) : +<5 chiffres dérivés du couple><numéro>
+        phone_base = zlib.crc32(f'{prefix}@{domain}'.encode()) % 100_000
+        accounts = []
+
+        for first in range(1, options['users'] + 1, chunk_size):
+            indexes = range(first, min(first + chunk_size, options['users'] + 1))
+            emails = [f'{prefix}{i}@{domain}' for i in indexes]
+            User.objects.bulk_create([
+                User(
+                    email=email,
+                    phone=f'+{phone_base:05d}{i:08d}',
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    gender=rng.choice('MF'),
+                    password=password,
+                    status=UserStatus.ACTIVE,
+                    is_verified=True,
+                )
+                for i, email in zip(indexes, emails)
+            ])
+
+            user_ids = dict(User.objects.filter(email__in=emails).values_list('id', 'email'))
+            VirtualAccount.objects.bulk_create([
+                VirtualAccount(user_id=user_id, balance=0, is_active=True)
+                for user_id in sorted(user_ids)
+            ])
+            accounts.extend(
+                (account_id, user_ids[user_id])
+                for account_id, user_id in VirtualAccount.objects.filter(
+                    user_id__in=list(user_ids)
+                ).order_by('user_id').values_list('id', 'user_id')
+            )
+        return accounts
+
+    def simulate(self, options, rng, accounts, platform, fee_accounts, balances, fees):
+        # Grand livre simulé, dans l'ordre chronologique : un tuple TRANSACTION_FIELDS par ligne.
+        # Les soldes évoluent comme dans le TransactionService (frais inclus dans le montant retiré).
+        total = options['transactions']
+        end = timezone.now()
+        start = end - timedelta(days=options['days'])
+        step = (end - start) / max(total, 1)
+        failure_rate = options['failure_rate']
+        produced = 0
+
+        def row(txn_type, amount, sender, receiver, description, status=TransactionStatus.SUCCESS, fee=0):
+            created_at = start + step * produced
+            return (
+                uuid.UUID(int=rng.getrandbits(128), version=4), txn_type, status, amount, fee, amount - fee,
+                accounts[sender][0], receiver, description, created_at, created_at,
+            )
+
+        while produced < total:
+            i = rng.randrange(len(accounts))
+            account_id = accounts[i][0]
+            roll = rng.random()
+
+            if roll >= DEPOSIT_SHARE + TRANSFER_SHARE and total - produced >= 2:
+                amount = draw_amount(rng, 1_000, 150_000)
+                fee = platform.calculate_withdrawal_fee(amount)
+                description = f"Retrait de {amount} (Frais: {fee}, Net: {amount - fee})"
+                if rng.random() < failure_rate:
+                    yield row(TypeTransaction.WITHDRAWAL, amount, i, None, description, TransactionStatus.FAILED, fee)
+                    produced += 1
+                    continue
+                if balances[i] >= amount:
+                    balances[i] -= amount
+                    yield row(TypeTransaction.WITHDRAWAL, amount, i, None, description, fee=fee)
+                    produced += 1
+                    if fee > 0:
+                        fee_account = fee_accounts[account_id % len(fee_accounts)]
+                        fees[fee_account] = fees.get(fee_account, 0) + fee
+                        yield row(
+                            TypeTransaction.FEE, fee, i, fee_account,
+                            f"Frais de retrait ({platform.withdrawal_fee_rate}%)"
+                        )
+                        produced += 1
+                    continue
+
+            elif roll >= DEPOSIT_SHARE:
+                amount = draw_amount(rng, 500, 100_000)
+                j = (i + rng.randrange(1, len(accounts))) % len(accounts)
+                description = f"Transfert de {accounts[i][1]} vers {accounts[j][1]}"
+                if rng.random() < failure_rate:
+                    yield row(TypeTransaction.TRANSFER, amount, i, accounts[j][0], description, TransactionStatus.FAILED)
+                    produced += 1
+                    continue
+                if balances[i] >= amount:
+                    balances[i] -= amount
+                    balances[j] += amount
+                    yield row(TypeTransaction.TRANSFER, amount, i, accounts[j][0], description)
+                    produced += 1
+                    continue
+
+            # Dépôt (ou repli quand le solde ne couvre pas l'opération tirée)
+            amount = draw_amount(rng, 1_000, 200_000)
+            balances[i] += amount
+            yield row(TypeTransaction.DEPOSIT, amount, i, account_id, f"Dépôt de {amount} sur le compte")
+            produced += 1
+
+    def insert_method(self):
+        return 'COPY' if connection.vendor == 'postgresql' else 'bulk_create'
+
+    def create_transactions(self, options, rng, accounts, platform, fee_accounts):
+        balances = [0] * len(accounts)
+        fees = {}
+        insert = self.copy_rows if connection.vendor == 'postgresql' else self.bulk_create_rows
+        chunk_size = options['chunk_size']
+        rows = self.simulate(options, rng, accounts, platform, fee_accounts, balances, fees)
+        written = 0
+
+        with explicit_timestamps(Transaction):
+            while True:
+                chunk = [r for _, r in zip(range(chunk_size), rows)]
+                if not chunk:
+                    break
+                insert(chunk)
+                written += len(chunk)
+                if options['verbosity'] >= 2:
+                    self.stdout.write(f'  {written:,} / {options["transactions"]:,}')
+        return balances, fees, written
+
+    def bulk_create_rows(self, chunk):
+        Transaction.objects.bulk_create(
+            [Transaction(**dict(zip(TRANSACTION_FIELDS, values))) for values in chunk],
+            batch_size=len(chunk)
+        )
+
+    def copy_rows(self, chunk):
+        # COPY ... FROM STDIN (format texte) : plusieurs fois plus rapide que des INSERT multi-lignes
+        buffer = io.StringIO()
+        for values in chunk:
+            buffer.write('\t'.join(r'\N' if value is None else str(value) for value in values))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        opts = Transaction._meta
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(opts.get_field(name.removesuffix('_id')).column) for name in TRANSACTION_FIELDS)
+        sql = f'COPY {quote(opts.db_table)} ({columns}) FROM STDIN'
+
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, 'copy_expert'):  # psycopg2
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def apply_balances(self, accounts, balances, fees, fee_accounts, chunk_size):
+        # Soldes finaux = grand livre généré ; les sous-comptes de frais sont crédités en plus de leur solde
+        VirtualAccount.objects.bulk_update(
+            [VirtualAccount(id=account_id, balance=balance) for (account_id, _), balance in zip(accounts, balances)],
+            ['balance'],
+            batch_size=chunk_size
+        )
+        for fee_account, total in fees.items():
+            VirtualAccount.objects.filter(pk=fee_account).update(balance=F('balance') + total)
@@ -0,0 +1,64 @@
+"""
+Worker d'envoi des emails de la file (outbox)
+Usage: python manage.py process_email_outbox [--batch-size 50] [--interval 2] [--once]
+
+Garde une seule connexion au serveur d'email tant que la file n'est pas vide et envoie
+par lots ; les échecs sont reprogrammés avec une attente exponentielle.
+
+Essai en local sans Gmail :
+    python -m aiosmtpd -n -l localhost:1025
+    EMAIL_HOST=localhost EMAIL_PORT=1025 EMAIL_USE_TLS=False python manage.py process_email_outbox
+ou avec EMAIL_BACKEND=django.core.mail.backends.console.EmailBackend (ou filebased).
+"""
+import logging
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from money_transfer.services import EmailOutboxService
+
+logger = logging.getLogger('money_transfer')
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails en attente de la file d'envoi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails par lot (EMAIL_OUTBOX_BATCH_SIZE par défaut)')
+        parser.add_argument('--interval', type=float, default=2.0, help='Attente en secondes quand la file est vide')
+        parser.add_argument('--once', action='store_true', help="Vide la file puis s'arrête")
+
+    def handle(self, *args, **options):
+        connection = get_connection(fail_silently=False)
+        total_sent = total_failed = 0
+        self.stdout.write(self.style.HTTP_INFO(" Worker de la file d'envoi démarré"))
+
+        try:
+            while True:
+                try:
+                    sent, failed = EmailOutboxService.deliver_pending(connection, options['batch_size'])
+                except Exception as e:
+                    logger.error(f"Erreur du worker de la file d'envoi : {str(e)}")
+                    sent = failed = 0
+
+                total_sent += sent
+                total_failed += failed
+                if sent or failed:
+                    self.stdout.write(f' {sent} envoyé(s), {failed} en échec')
+                    continue
+
+                # File vide : on libère la connexion SMTP jusqu'au prochain lot
+                connection.close()
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+                # Worker de longue durée : connexions à la base expirées ou en erreur
+                close_old_connections()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+
+        self.stdout.write(self.style.SUCCESS(f' Total : {total_sent} envoyé(s), {total_failed} en échec'))
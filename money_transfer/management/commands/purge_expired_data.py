@@ -0,0 +1,36 @@
+"""
+Commande Django de rétention des données périmées
+Usage: python manage.py purge_expired_data [--only otps sessions] [--batch-size 1000] [--sleep 0.1]
+
+Supprime les OTP utilisés ou expirés, les sessions expirées, les clés d'idempotence
+expirées et les anciens emails de la file d'envoi, par plages de clés primaires
+bornées. La pause entre deux paquets permet de l'exécuter en journée sans verrou long.
+"""
+from django.core.management.base import BaseCommand
+
+from money_transfer.services import RetentionService
+from money_transfer.services.retention_service import RETENTION_TARGETS
+
+
+class Command(BaseCommand):
+    help = 'Supprime par paquets les données périmées (OTP, sessions, clés d\'idempotence, emails)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--only', nargs='+', choices=list(RETENTION_TARGETS), help='Cibles à purger (toutes par défaut)')
+        parser.add_argument('--batch-size', type=int, default=None, help='Lignes par DELETE (RETENTION_BATCH_SIZE par défaut)')
+        parser.add_argument('--sleep', type=float, default=None, help='Pause en secondes entre deux paquets (RETENTION_SLEEP_SECONDS par défaut)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(f" {'Cible':<20}{'Lignes':>12}{'Durée (s)':>12}{'Lignes/s':>14}")
+        self.stdout.write('=' * 60)
+
+        total = 0
+        for name in options['only'] or RETENTION_TARGETS:
+            deleted, elapsed = RetentionService.purge(name, options['batch_size'], options['sleep'])
+            total += deleted
+            rate = deleted / elapsed if elapsed else 0
+            self.stdout.write(f" {name:<20}{deleted:>12,}{elapsed:>12.2f}{rate:>14,.0f}")
+
+        self.stdout.write('=' * 60)
+        self.stdout.write(self.style.SUCCESS(f' {total} ligne(s) supprimée(s)'))
@@ -0,0 +1,31 @@
+"""
+Commande Django pour supprimer les clés d'idempotence expirées
+Usage: python manage.py purge_idempotency_keys --batch-size 1000
+"""
+from django.core.management.base import BaseCommand
+from money_transfer.services import IdempotencyService
+
+
+class Command(BaseCommand):
+    help = 'Supprime par paquets les clés d\'idempotence expirées'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Nombre de clés supprimées par requête',
+            default=1000
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            help='Pause (en secondes) entre deux paquets',
+            default=0
+        )
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyService.purge_expired(
+            batch_size=options['batch_size'],
+            sleep=options['sleep']
+        )
+        self.stdout.write(self.style.SUCCESS(f' {deleted} clé(s) d\'idempotence expirée(s) supprimée(s)'))
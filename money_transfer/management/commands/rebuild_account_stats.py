@@ -0,0 +1,42 @@
+"""
+Commande Django pour reconstruire les cumuls mensuels des comptes
+Usage: python manage.py rebuild_account_stats --month 2026-01 [--account 42]
+
+À lancer après une reprise de données ou pour initialiser les mois
+antérieurs à la mise en place de la table de cumul.
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from money_transfer.models import VirtualAccount
+from money_transfer.services import StatsService
+
+
+class Command(BaseCommand):
+    help = 'Recalcule depuis les transactions les statistiques mensuelles des comptes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=str, help='Mois au format AAAA-MM (mois courant par défaut)')
+        parser.add_argument('--account', type=int, help='Identifiant du compte (tous les comptes utilisateurs par défaut)')
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError("Mois invalide, format attendu : AAAA-MM")
+        else:
+            month = timezone.localdate().replace(day=1)
+
+        accounts = VirtualAccount.objects.filter(user__isnull=False)
+        if options['account']:
+            accounts = accounts.filter(id=options['account'])
+
+        count = 0
+        for account in accounts.iterator():
+            StatsService.rebuild_account_month(account, month)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f' {count} compte(s) recalculé(s) pour {month:%m/%Y}'))
@@ -0,0 +1,37 @@
+"""
+Commande Django pour reconstruire les cumuls horaires et journaliers des transactions
+Usage: python manage.py rebuild_transaction_rollups [--from 2026-01-01 --to 2026-01-31]
+
+À lancer une fois pour initialiser l'historique antérieur aux tables de cumul,
+ou après une reprise de données. Sans dates, tout l'historique est recalculé.
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from money_transfer.services import StatsService
+
+
+class Command(BaseCommand):
+    help = 'Recalcule depuis les transactions les statistiques horaires et journalières'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='date_from', type=str, help='Premier jour au format AAAA-MM-JJ')
+        parser.add_argument('--to', dest='date_to', type=str, help='Dernier jour (inclus) au format AAAA-MM-JJ')
+
+    def handle(self, *args, **options):
+        if bool(options['date_from']) != bool(options['date_to']):
+            raise CommandError("Spécifiez --from et --to ensemble")
+
+        date_from = date_to = None
+        if options['date_from']:
+            try:
+                date_from = datetime.strptime(options['date_from'], '%Y-%m-%d').date()
+                date_to = datetime.strptime(options['date_to'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError("Date invalide, format attendu : AAAA-MM-JJ")
+            if date_from > date_to:
+                raise CommandError("La date de début doit être antérieure à la date de fin")
+
+        created = StatsService.rebuild_transaction_rollups(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f' {created} ligne(s) de cumul reconstruite(s)'))
@@ -0,0 +1,27 @@
+"""
+Commande Django pour recalculer les compteurs globaux de la plateforme
+Usage: python manage.py reconcile_platform_stats
+
+Recalcule depuis zéro (utilisateurs, transactions, volume, frais, compteurs
+journaliers) et affiche les écarts avec les valeurs maintenues.
+"""
+from django.core.management.base import BaseCommand
+
+from money_transfer.services import StatsService
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les compteurs globaux de la plateforme et affiche les écarts'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.HTTP_INFO(' Recalcul des compteurs de la plateforme...'))
+        changes = StatsService.reconcile_platform_counters()
+
+        drifts = {name: values for name, values in changes.items() if values[0] != values[1]}
+        for name, (before, after) in drifts.items():
+            self.stdout.write(self.style.WARNING(f'  {name:<40} {before:>14,} -> {after:>14,}'))
+
+        if drifts:
+            self.stdout.write(self.style.WARNING(f' {len(drifts)} compteur(s) corrigé(s) sur {len(changes)}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f' {len(changes)} compteur(s) cohérent(s)'))
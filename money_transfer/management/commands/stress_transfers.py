@@ -0,0 +1,109 @@
+"""
+Commande Django de stress : transferts croisés concurrents (A→B et B→A)
+Usage: python manage.py stress_transfers --threads 8 --transfers 200
+
+Rapporte le débit, les latences p50/p99 et le nombre de rejeux
+(interblocages, conflits de sérialisation, délais de verrou).
+"""
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Sum
+
+from money_transfer.benchmarks import LatencyRecorder, create_benchmark_users
+from money_transfer.models import User, VirtualAccount
+from money_transfer.services import TransactionService, AccountLockService
+
+
+class Command(BaseCommand):
+    help = 'Lance des transferts croisés concurrents pour vérifier l\'absence d\'interblocage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Nombre de comptes impliqués')
+        parser.add_argument('--threads', type=int, default=8, help='Nombre de threads concurrents')
+        parser.add_argument('--transfers', type=int, default=200, help='Transferts par thread')
+        parser.add_argument('--amount', type=int, default=1, help='Montant de chaque transfert')
+        parser.add_argument('--balance', type=int, default=1_000_000, help='Solde initial de chaque compte')
+        parser.add_argument('--prefix', type=str, default='stress', help='Préfixe des comptes de test')
+
+    def handle(self, *args, **options):
+        users = create_benchmark_users(options['users'], prefix=options['prefix'], balance=options['balance'])
+        user_ids = [user.id for user in users]
+        initial_total = self.total_balance(user_ids)
+
+        AccountLockService.reset_stats()
+        latencies = LatencyRecorder()
+        outcomes = {'success': 0, 'refused': 0, 'error': 0}
+        outcomes_lock = threading.Lock()
+
+        def worker(thread_index):
+            try:
+                # Chaque thread charge ses propres objets (et sa propre connexion)
+                local_users = list(
+                    User.objects.filter(id__in=user_ids).select_related('virtual_account').order_by('id')
+                )
+                count = len(local_users)
+                for k in range(options['transfers']):
+                    a = local_users[k % count]
+                    b = local_users[(k + 1) % count]
+                    # Un thread sur deux transfère dans l'autre sens : paires croisées
+                    sender, receiver = (a, b) if (thread_index + k) % 2 == 0 else (b, a)
+
+                    started = time.perf_counter()
+                    try:
+                        success, message, txn = TransactionService.transfer(
+                            sender, receiver.email, options['amount']
+                        )
+                        key = 'success' if success else 'refused'
+                    except Exception as e:
+                        self.stderr.write(f"  Thread {thread_index} : {e}")
+                        key = 'error'
+                    latencies.add(time.perf_counter() - started)
+
+                    with outcomes_lock:
+                        outcomes[key] += 1
+            finally:
+                connection.close()
+
+        self.stdout.write(self.style.HTTP_INFO(
+            f" {options['threads']} threads x {options['transfers']} transferts sur {len(users)} comptes..."
+        ))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        summary = latencies.summary()
+        stats = AccountLockService.get_stats()
+        final_total = self.total_balance(user_ids)
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(self.style.HTTP_INFO(' RÉSULTATS'))
+        self.stdout.write('=' * 60)
+        self.stdout.write(f" Transferts réussis : {outcomes['success']}")
+        self.stdout.write(f" Refusés            : {outcomes['refused']}")
+        self.stdout.write(f" Erreurs            : {outcomes['error']}")
+        self.stdout.write(f" Durée              : {elapsed:.3f} s")
+        self.stdout.write(f" Débit              : {summary['count'] / elapsed:,.1f} transferts/s")
+        self.stdout.write(f" Latence p50        : {summary['p50_ms']:.2f} ms")
+        self.stdout.write(f" Latence p99        : {summary['p99_ms']:.2f} ms")
+        self.stdout.write(f" Conflits détectés  : {stats['conflicts']}")
+        self.stdout.write(f" Rejeux             : {stats['retries']}")
+        self.stdout.write(f" Abandons           : {stats['gave_up']}")
+        self.stdout.write('=' * 60)
+
+        if final_total != initial_total:
+            self.stdout.write(self.style.ERROR(
+                f" Incohérence : somme des soldes {initial_total} -> {final_total}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(' Somme des soldes conservée'))
+
+    def total_balance(self, user_ids):
+        return VirtualAccount.objects.filter(user_id__in=user_ids).aggregate(total=Sum('balance'))['total'] or 0
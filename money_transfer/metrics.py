@@ -0,0 +1,122 @@
+"""
+Métriques de performance par vue (histogrammes en mémoire, format texte Prometheus)
+
+Chaque processus cumule ses histogrammes en mémoire et, si METRICS_DIR est défini,
+les recopie périodiquement dans METRICS_DIR/<pid>.json : l'endpoint /metrics agrège
+les fichiers de tous les workers gunicorn. Le répertoire est à vider au démarrage.
+"""
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Bornes des histogrammes (secondes, nombre de requêtes SQL)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# Nom -> (aide, bornes)
+HISTOGRAMS = {
+    'money_transfer_request_duration_seconds': ("Durée totale de la requête", DURATION_BUCKETS),
+    'money_transfer_request_db_queries': ("Nombre de requêtes SQL par requête", QUERY_BUCKETS),
+    'money_transfer_request_db_duration_seconds': ("Temps passé en base par requête", DURATION_BUCKETS),
+    'money_transfer_request_template_duration_seconds': ("Temps de rendu des templates par requête", DURATION_BUCKETS),
+}
+
+# Mesures de la requête en cours (alimentées par le middleware et le moteur de templates)
+current_request = ContextVar('money_transfer_current_request', default=None)
+
+
+class MetricsRegistry:
+    # Histogrammes du processus, indexés par (vue, méthode HTTP)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._last_flush = 0.0
+
+    def observe(self, view, method, values):
+        # `values` : nom d'histogramme -> valeur observée
+        label = f'{view}|{method}'
+        with self._lock:
+            for name, value in values.items():
+                bounds = HISTOGRAMS[name][1]
+                series = self._series.setdefault(name, {}).setdefault(
+                    label, {'buckets': [0] * (len(bounds) + 1), 'sum': 0.0, 'count': 0}
+                )
+                index = next((i for i, bound in enumerate(bounds) if value <= bound), len(bounds))
+                series['buckets'][index] += 1
+                series['sum'] += value
+                series['count'] += 1
+        self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._series))
+
+    def flush(self, force=False):
+        # Recopie atomique de l'état du processus dans le répertoire partagé
+        directory = getattr(settings, 'METRICS_DIR', None)
+        now = time.monotonic()
+        if not directory or (not force and now - self._last_flush < settings.METRICS_FLUSH_INTERVAL):
+            return
+        self._last_flush = now
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        # Somme des histogrammes de tous les processus (ou du seul processus courant)
+        directory = getattr(settings, 'METRICS_DIR', None)
+        if not directory:
+            return self.snapshot()
+
+        self.flush(force=True)
+        merged = {}
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, series in data.items():
+                for label, state in series.items():
+                    target = merged.setdefault(name, {}).setdefault(
+                        label, {'buckets': [0] * len(state['buckets']), 'sum': 0.0, 'count': 0}
+                    )
+                    target['buckets'] = [a + b for a, b in zip(target['buckets'], state['buckets'])]
+                    target['sum'] += state['sum']
+                    target['count'] += state['count']
+        return merged
+
+    def render(self):
+        # Format texte d'exposition Prometheus (bornes cumulées)
+        data = self.collect()
+        lines = []
+        for name, (help_text, bounds) in HISTOGRAMS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for label, state in sorted(data.get(name, {}).items()):
+                view, method = label.split('|', 1)
+                labels = f'view="{view}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(list(bounds) + ['+Inf'], state['buckets']):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{labels}}} {state["sum"]}')
+                lines.append(f'{name}_count{{{labels}}} {state["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+
+registry = MetricsRegistry()
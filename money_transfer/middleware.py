@@ -0,0 +1,104 @@
+"""
+Middlewares de Money Transfer
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils.functional import SimpleLazyObject
+
+from money_transfer.metrics import registry, current_request
+
+logger = logging.getLogger('money_transfer')
+
+
+def get_account(request):
+    # Compte virtuel de l'utilisateur connecté tel que chargé avec lui (voir AccountModelBackend)
+    if not hasattr(request, '_cached_account'):
+        user = request.user
+        request._cached_account = getattr(user, 'virtual_account', None) if user.is_authenticated else None
+    return request._cached_account
+
+
+class AccountMiddleware:
+    """
+    Expose request.account : instantané du compte virtuel de l'utilisateur pour la durée
+    de la requête (évalué paresseusement, comme request.user ; faux si aucun compte).
+    À placer après AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.account = SimpleLazyObject(lambda: get_account(request))
+        return self.get_response(request)
+
+
+class MetricsMiddleware:
+    """
+    Mesure chaque vue de money_transfer.urls : durée totale, nombre et durée des requêtes SQL,
+    durée de rendu des templates (histogrammes exposés par /metrics). Les requêtes plus
+    lentes que SLOW_REQUEST_THRESHOLD_MS sont journalisées avec leur SQL.
+    À placer en tête de MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        measures = {'queries': [], 'db_time': 0.0, 'template_time': 0.0}
+        token = current_request.set(measures)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._record_query(measures)):
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        elapsed = time.perf_counter() - started
+
+        view = self._view_name(request)
+        if view:
+            registry.observe(view, request.method, {
+                'money_transfer_request_duration_seconds': elapsed,
+                'money_transfer_request_db_queries': len(measures['queries']),
+                'money_transfer_request_db_duration_seconds': measures['db_time'],
+                'money_transfer_request_template_duration_seconds': measures['template_time'],
+            })
+            if elapsed * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+                self._log_slow_request(request, view, elapsed, measures)
+        return response
+
+    @staticmethod
+    def _record_query(measures):
+        def wrapper(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                duration = time.perf_counter() - started
+                measures['db_time'] += duration
+                measures['queries'].append((sql, duration))
+        return wrapper
+
+    @staticmethod
+    def _view_name(request):
+        # Uniquement les vues de l'application (nom de l'URL)
+        match = getattr(request, 'resolver_match', None)
+        if match and getattr(match.func, '__module__', '').startswith('money_transfer.'):
+            return match.url_name or match.func.__name__
+        return None
+
+    @staticmethod
+    def _log_slow_request(request, view, elapsed, measures):
+        slowest = sorted(measures['queries'], key=lambda query: query[1], reverse=True)
+        sql = '\n'.join(
+            f"  {duration * 1000:.1f} ms : {statement}"
+            for statement, duration in slowest[:settings.SLOW_REQUEST_MAX_QUERIES]
+        )
+        logger.warning(
+            f"Requête lente - {request.method} {request.path} ({view}) - {elapsed * 1000:.0f} ms - "
+            f"SQL: {len(measures['queries'])} requêtes / {measures['db_time'] * 1000:.0f} ms - "
+            f"Templates: {measures['template_time'] * 1000:.0f} ms\n{sql}"
+        )
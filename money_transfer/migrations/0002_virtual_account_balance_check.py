@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='gender',
+            field=models.CharField(choices=[('M', 'Masculin'), ('F', 'Féminin')], max_length=10, verbose_name='Genre'),
+        ),
+        migrations.AddConstraint(
+            model_name='virtualaccount',
+            constraint=models.CheckConstraint(condition=models.Q(('balance__gte', 0)), name='virtual_account_balance_non_negative'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0003_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='virtualaccount',
+            name='stripe',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Numéro du sous-compte de frais (comptes plateforme uniquement)', verbose_name='Sous-compte'),
+        ),
+        migrations.AlterField(
+            model_name='virtualaccount',
+            name='platform',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='virtual_accounts', to='money_transfer.platform', verbose_name='Plateforme'),
+        ),
+        migrations.AddConstraint(
+            model_name='virtualaccount',
+            constraint=models.UniqueConstraint(condition=models.Q(('platform__isnull', False)), fields=('platform', 'stripe'), name='unique_platform_account_stripe'),
+        ),
+    ]
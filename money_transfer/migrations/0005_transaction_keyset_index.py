@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0004_platform_fee_stripes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='money_trans_created_75cec7_idx',
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['-created_at', '-id'], name='money_trans_created_9997ff_idx'),
+        ),
+    ]
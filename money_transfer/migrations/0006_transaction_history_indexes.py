@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0005_transaction_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['sender_account', '-created_at', '-id'], name='transaction_sent_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('type', 'DEPOSIT'), _negated=True), fields=['receiver_account', '-created_at', '-id'], name='transaction_recv_history_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0006_transaction_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountMonthlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='Premier jour du mois', verbose_name='Mois')),
+                ('deposits_total', models.PositiveBigIntegerField(default=0, verbose_name='Total des dépôts')),
+                ('deposits_count', models.PositiveIntegerField(default=0, verbose_name='Nombre de dépôts')),
+                ('withdrawals_total', models.PositiveBigIntegerField(default=0, verbose_name='Total des retraits')),
+                ('withdrawals_count', models.PositiveIntegerField(default=0, verbose_name='Nombre de retraits')),
+                ('transfers_sent_total', models.PositiveBigIntegerField(default=0, verbose_name='Total des transferts envoyés')),
+                ('transfers_sent_count', models.PositiveIntegerField(default=0, verbose_name='Nombre de transferts envoyés')),
+                ('transfers_received_total', models.PositiveBigIntegerField(default=0, verbose_name='Total des transferts reçus')),
+                ('transfers_received_count', models.PositiveIntegerField(default=0, verbose_name='Nombre de transferts reçus')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_stats', to='money_transfer.virtualaccount', verbose_name='Compte')),
+            ],
+            options={
+                'verbose_name': 'Statistiques mensuelles de compte',
+                'verbose_name_plural': 'Statistiques mensuelles de comptes',
+                'constraints': [models.UniqueConstraint(fields=('account', 'month'), name='unique_account_month_stats')],
+            },
+        ),
+    ]
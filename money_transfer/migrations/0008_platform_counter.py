@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0007_account_monthly_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, verbose_name='Compteur')),
+                ('shard', models.PositiveSmallIntegerField(default=0, verbose_name='Fragment')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Valeur')),
+            ],
+            options={
+                'verbose_name': 'Compteur de la plateforme',
+                'verbose_name_plural': 'Compteurs de la plateforme',
+                'constraints': [models.UniqueConstraint(fields=('name', 'shard'), name='unique_platform_counter_shard')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0008_platform_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTransactionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(max_length=20, verbose_name='Type')),
+                ('status', models.CharField(max_length=10, verbose_name='Statut')),
+                ('shard', models.PositiveSmallIntegerField(default=0, verbose_name='Fragment')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Nombre')),
+                ('volume', models.PositiveBigIntegerField(default=0, verbose_name='Volume')),
+                ('fees', models.PositiveBigIntegerField(default=0, verbose_name='Frais')),
+                ('day', models.DateField(verbose_name='Jour')),
+            ],
+            options={
+                'verbose_name': 'Statistiques journalières des transactions',
+                'verbose_name_plural': 'Statistiques journalières des transactions',
+                'constraints': [models.UniqueConstraint(fields=('day', 'type', 'status', 'shard'), name='unique_daily_transaction_stats')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HourlyTransactionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(max_length=20, verbose_name='Type')),
+                ('status', models.CharField(max_length=10, verbose_name='Statut')),
+                ('shard', models.PositiveSmallIntegerField(default=0, verbose_name='Fragment')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Nombre')),
+                ('volume', models.PositiveBigIntegerField(default=0, verbose_name='Volume')),
+                ('fees', models.PositiveBigIntegerField(default=0, verbose_name='Frais')),
+                ('hour', models.DateTimeField(help_text="Début de l'heure", verbose_name='Heure')),
+            ],
+            options={
+                'verbose_name': 'Statistiques horaires des transactions',
+                'verbose_name_plural': 'Statistiques horaires des transactions',
+                'constraints': [models.UniqueConstraint(fields=('hour', 'type', 'status', 'shard'), name='unique_hourly_transaction_stats')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:41
+
+from django.db import migrations
+
+
+def reconcile_platform_counters(apps, schema_editor):
+    # Compteurs de la plateforme (0008) initialisés depuis les tables existantes :
+    # sans cela, le tableau de bord admin lit des zéros jusqu'au premier reconcile_platform_stats.
+    # Le service utilise les modèles courants : migration placée après les changements de schéma qu'il lit.
+    from money_transfer.services import StatsService
+    StatsService.reconcile_platform_counters()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0010_email_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(reconcile_platform_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:42
+
+from django.db import migrations
+
+
+def rebuild_transaction_rollups(apps, schema_editor):
+    # Cumuls horaires et journaliers (0009) calculés pour l'historique existant :
+    # sans cela, les statistiques admin ne couvrent que les transactions postérieures au déploiement.
+    # Le service utilise les modèles courants : migration placée après les changements de schéma qu'il lit.
+    from money_transfer.services import StatsService
+    StatsService.rebuild_transaction_rollups()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('money_transfer', '0011_reconcile_platform_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_transaction_rollups, migrations.RunPython.noop),
+    ]
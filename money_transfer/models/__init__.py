@@ -4,6 +4,9 @@ Consolidation de tous les models dans une seule app
 from .user import User, OTP
 from .account import Platform, VirtualAccount
 from .transaction import Transaction
+from .idempotency import IdempotencyKey
+from .stats import AccountMonthlyStats, PlatformCounter, HourlyTransactionStats, DailyTransactionStats
+from .outbox import OutgoingEmail
 
 __all__ = [
     'User',
@@ -11,4 +14,10 @@ __all__ = [
     'Platform',
     'VirtualAccount',
     'Transaction',
+    'IdempotencyKey',
+    'AccountMonthlyStats',
+    'PlatformCounter',
+    'HourlyTransactionStats',
+    'DailyTransactionStats',
+    'OutgoingEmail',
 ]
\ No newline at end of file
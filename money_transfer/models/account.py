@@ -63,15 +63,23 @@ class VirtualAccount(TimeStampMixin):
         verbose_name="Utilisateur"
     )
     
-    platform = models.OneToOneField(
+    # La plateforme possède plusieurs sous-comptes de frais (stripes) pour éviter
+    # qu'un seul compte ne sérialise tous les retraits ; le solde plateforme est leur somme
+    platform = models.ForeignKey(
         'Platform',
         on_delete=models.PROTECT,
         null=True,
         blank=True,
-        related_name='virtual_account',
+        related_name='virtual_accounts',
         verbose_name="Plateforme"
     )
     
+    stripe = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Sous-compte",
+        help_text="Numéro du sous-compte de frais (comptes plateforme uniquement)"
+    )
+    
     balance = models.BigIntegerField(default=0, verbose_name="Solde")
     is_active = models.BooleanField(default=True, verbose_name="Actif")
     
@@ -81,6 +89,18 @@ class VirtualAccount(TimeStampMixin):
         indexes = [
             models.Index(fields=['owner_type', 'is_active']),
         ]
+        constraints = [
+            # Garde-fou en base : aucun chemin (même concurrent) ne peut rendre un solde négatif
+            models.CheckConstraint(
+                condition=models.Q(balance__gte=0),
+                name='virtual_account_balance_non_negative',
+            ),
+            models.UniqueConstraint(
+                fields=['platform', 'stripe'],
+                condition=models.Q(platform__isnull=False),
+                name='unique_platform_account_stripe',
+            ),
+        ]
     
     def clean(self):
         """Validation : un compte doit avoir exactement un propriétaire"""
@@ -107,7 +127,7 @@ class VirtualAccount(TimeStampMixin):
         if self.user:
             return f"Compte de {self.user.email} (Solde: {self.balance})"
         elif self.platform:
-            return f"Compte plateforme {self.platform.name} (Solde: {self.balance})"
+            return f"Compte plateforme {self.platform.name} #{self.stripe} (Solde: {self.balance})"
         return f"Compte #{self.id}"
     
     @property
@@ -0,0 +1,52 @@
+# Models liés à l'idempotence des opérations financières
+
+from django.conf import settings
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Clé d'idempotence fournie par le client (formulaire ou en-tête Idempotency-Key).
+    Un rejeu avec la même clé renvoie la transaction d'origine au lieu de la réexécuter.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys',
+        verbose_name="Utilisateur"
+    )
+
+    key = models.CharField(max_length=255, verbose_name="Clé")
+
+    operation = models.CharField(max_length=20, verbose_name="Opération")
+
+    fingerprint = models.CharField(
+        max_length=64,
+        verbose_name="Empreinte",
+        help_text="SHA-256 des arguments de l'opération (montant, destinataire)"
+    )
+
+    transaction = models.ForeignKey(
+        'Transaction',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Transaction"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créée le")
+    expires_at = models.DateTimeField(verbose_name="Expire le")
+
+    class Meta:
+        verbose_name = "Clé d'idempotence"
+        verbose_name_plural = "Clés d'idempotence"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.operation} | {self.key}"
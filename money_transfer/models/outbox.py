@@ -0,0 +1,50 @@
+# Models de la file d'envoi des emails (outbox)
+
+from django.db import models
+from django.utils import timezone
+
+
+class EmailStatus(models.TextChoices):
+    """Statuts d'un email de la file d'envoi"""
+    PENDING = "PENDING", "En attente"
+    SENT = "SENT", "Envoyé"
+    FAILED = "FAILED", "Abandonné"
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email en attente d'envoi, écrit dans la même transaction que l'opération qui le déclenche.
+    Envoyé après validation par le worker `process_email_outbox` (une connexion SMTP réutilisée).
+    """
+    to = models.EmailField(verbose_name="Destinataire")
+    subject = models.CharField(max_length=255, verbose_name="Sujet")
+    body = models.TextField(verbose_name="Message (texte)")
+    html_body = models.TextField(blank=True, verbose_name="Message (HTML)")
+
+    status = models.CharField(
+        max_length=10,
+        choices=EmailStatus.choices,
+        default=EmailStatus.PENDING,
+        verbose_name="Statut"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="Prochaine tentative")
+    last_error = models.TextField(blank=True, verbose_name="Dernière erreur")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Créé le")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Envoyé le")
+
+    class Meta:
+        verbose_name = "Email en file d'envoi"
+        verbose_name_plural = "Emails en file d'envoi"
+        indexes = [
+            # File du worker : emails en attente dont la tentative est due
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                condition=models.Q(status='PENDING'),
+                name='outgoing_email_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.to} | {self.subject} ({self.status})"
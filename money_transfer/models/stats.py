@@ -0,0 +1,124 @@
+# Models de statistiques agrégées (tables de cumul)
+
+from django.db import models
+
+
+class AccountMonthlyStats(models.Model):
+    """
+    Cumul mensuel des opérations réussies d'un compte.
+    Tenu à jour par le TransactionService à chaque mouvement ; reconstructible
+    à tout moment à partir des transactions.
+    """
+    account = models.ForeignKey(
+        'VirtualAccount',
+        on_delete=models.CASCADE,
+        related_name='monthly_stats',
+        verbose_name="Compte"
+    )
+
+    month = models.DateField(verbose_name="Mois", help_text="Premier jour du mois")
+
+    deposits_total = models.PositiveBigIntegerField(default=0, verbose_name="Total des dépôts")
+    deposits_count = models.PositiveIntegerField(default=0, verbose_name="Nombre de dépôts")
+    withdrawals_total = models.PositiveBigIntegerField(default=0, verbose_name="Total des retraits")
+    withdrawals_count = models.PositiveIntegerField(default=0, verbose_name="Nombre de retraits")
+    transfers_sent_total = models.PositiveBigIntegerField(default=0, verbose_name="Total des transferts envoyés")
+    transfers_sent_count = models.PositiveIntegerField(default=0, verbose_name="Nombre de transferts envoyés")
+    transfers_received_total = models.PositiveBigIntegerField(default=0, verbose_name="Total des transferts reçus")
+    transfers_received_count = models.PositiveIntegerField(default=0, verbose_name="Nombre de transferts reçus")
+
+    class Meta:
+        verbose_name = "Statistiques mensuelles de compte"
+        verbose_name_plural = "Statistiques mensuelles de comptes"
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'month'], name='unique_account_month_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.account} | {self.month:%m/%Y}"
+
+    def as_dashboard(self):
+        # Format attendu par le template du dashboard ({'total', 'count'} par rubrique)
+        return {
+            'deposits_this_month': {'total': self.deposits_total, 'count': self.deposits_count},
+            'withdrawals_this_month': {'total': self.withdrawals_total, 'count': self.withdrawals_count},
+            'transfers_sent_this_month': {'total': self.transfers_sent_total, 'count': self.transfers_sent_count},
+            'transfers_received_this_month': {
+                'total': self.transfers_received_total,
+                'count': self.transfers_received_count,
+            },
+        }
+
+
+class PlatformCounter(models.Model):
+    """
+    Compteur global de la plateforme (utilisateurs par statut, transactions, volume, frais...).
+    Chaque compteur est réparti sur plusieurs lignes (`shard`) pour éviter qu'une ligne
+    unique ne sérialise toutes les écritures ; sa valeur est la somme de ses lignes.
+    """
+    name = models.CharField(max_length=64, verbose_name="Compteur")
+    shard = models.PositiveSmallIntegerField(default=0, verbose_name="Fragment")
+    value = models.BigIntegerField(default=0, verbose_name="Valeur")
+
+    class Meta:
+        verbose_name = "Compteur de la plateforme"
+        verbose_name_plural = "Compteurs de la plateforme"
+        constraints = [
+            models.UniqueConstraint(fields=['name', 'shard'], name='unique_platform_counter_shard'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.shard} = {self.value}"
+
+
+class TransactionRollup(models.Model):
+    """
+    Base des cumuls temporels de transactions par type et statut.
+    Fragmentés comme les compteurs globaux : la tranche courante est écrite par toutes les opérations.
+    """
+    type = models.CharField(max_length=20, verbose_name="Type")
+    status = models.CharField(max_length=10, verbose_name="Statut")
+    shard = models.PositiveSmallIntegerField(default=0, verbose_name="Fragment")
+
+    count = models.PositiveIntegerField(default=0, verbose_name="Nombre")
+    volume = models.PositiveBigIntegerField(default=0, verbose_name="Volume")
+    fees = models.PositiveBigIntegerField(default=0, verbose_name="Frais")
+
+    class Meta:
+        abstract = True
+
+
+class HourlyTransactionStats(TransactionRollup):
+    """Cumul horaire des transactions"""
+    hour = models.DateTimeField(verbose_name="Heure", help_text="Début de l'heure")
+
+    class Meta:
+        verbose_name = "Statistiques horaires des transactions"
+        verbose_name_plural = "Statistiques horaires des transactions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hour', 'type', 'status', 'shard'],
+                name='unique_hourly_transaction_stats'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.hour:%d/%m/%Y %Hh} | {self.type} {self.status} #{self.shard}"
+
+
+class DailyTransactionStats(TransactionRollup):
+    """Cumul journalier des transactions"""
+    day = models.DateField(verbose_name="Jour")
+
+    class Meta:
+        verbose_name = "Statistiques journalières des transactions"
+        verbose_name_plural = "Statistiques journalières des transactions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'type', 'status', 'shard'],
+                name='unique_daily_transaction_stats'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day:%d/%m/%Y} | {self.type} {self.status} #{self.shard}"
@@ -2,6 +2,7 @@
 
 import uuid
 from django.db import models
+from django.utils import timezone
 from .account import TimeStampMixin
 
 
@@ -20,10 +21,22 @@ class TransactionStatus(models.TextChoices):
     FAILED = "FAILED", "Échouée"
 
 
+# Transitions de statut autorisées : état de départ -> états d'arrivée
+ALLOWED_TRANSITIONS = {
+    TransactionStatus.PENDING: {TransactionStatus.SUCCESS, TransactionStatus.FAILED},
+}
+
+
 class Transaction(TimeStampMixin):
     """
     Transaction financière immuable et traçable
     """
+    # Champs figés après création (noms de colonnes, sans chargement des comptes liés)
+    IMMUTABLE_FIELDS = (
+        'reference', 'type', 'amount', 'fee', 'net_amount',
+        'sender_account_id', 'receiver_account_id',
+    )
+    
     reference = models.UUIDField(
         default=uuid.uuid4,
         editable=False,
@@ -90,35 +103,74 @@ class Transaction(TimeStampMixin):
             models.Index(fields=['reference']),
             models.Index(fields=['sender_account', 'status']),
             models.Index(fields=['receiver_account', 'status']),
-            models.Index(fields=['-created_at']),
+            # Historique : une moitié de l'UNION ALL par index, déjà triée.
+            # Les dépôts (émetteur = récepteur) ne sont lus que côté émetteur.
+            models.Index(fields=['sender_account', '-created_at', '-id'], name='transaction_sent_history_idx'),
+            models.Index(
+                fields=['receiver_account', '-created_at', '-id'],
+                condition=~models.Q(type='DEPOSIT'),
+                name='transaction_recv_history_idx'
+            ),
+            models.Index(fields=['-created_at', '-id']),  # pagination par curseur
         ]
     
     def delete(self, *args, **kwargs):
         #--- Les transactions ne peuvent pas être supprimées (immuabilité)
         raise Exception(" Une transaction ne peut pas être supprimée.")
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        #--- Mémorise les valeurs immuables telles que lues en base (aucune requête supplémentaire)
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_immutable_fields()
+        return instance
+    
+    def _snapshot_immutable_fields(self):
+        self._immutable_values = {
+            name: self.__dict__[name]
+            for name in self.IMMUTABLE_FIELDS
+            if name in self.__dict__
+        }
+    
     def save(self, *args, **kwargs):
         #--- Les transactions ne peuvent pas être modifiées après création
-        # Permettre la première sauvegarde (création)
-        is_new = self.pk is None
-        
-        # Si c'est une modification (pas une création), interdire
-        if not is_new and self._state.adding is False:
-            # Vérifier si c'est juste un changement de statut (autorisé)
-            if self.pk:
-                old_instance = Transaction.objects.get(pk=self.pk)
-                # Autoriser uniquement le changement de statut
-                if (self.amount != old_instance.amount or 
-                    self.fee != old_instance.fee or 
-                    self.sender_account != old_instance.sender_account or
-                    self.receiver_account != old_instance.receiver_account):
-                    raise Exception(" Une transaction ne peut pas être modifiée.")
+        if not self._state.adding:
+            # Comparaison avec l'instantané pris au chargement / à la création
+            snapshot = getattr(self, '_immutable_values', None)
+            if snapshot is None:
+                # Instance construite hors ORM (ex: bulk_create) : relecture exceptionnelle
+                snapshot = Transaction.objects.filter(pk=self.pk).values(*self.IMMUTABLE_FIELDS).get()
+            
+            if any(getattr(self, name) != value for name, value in snapshot.items()):
+                raise Exception(" Une transaction ne peut pas être modifiée.")
         
         # Calcul automatique du net_amount si non fourni
         if not self.net_amount:
             self.net_amount = self.amount - self.fee
         
         super().save(*args, **kwargs)
+        self._snapshot_immutable_fields()
+    
+    def transition(self, to_status):
+        #--- Changement de statut en un seul UPDATE conditionnel, gardé par les états de départ autorisés
+        allowed_from = [
+            from_status
+            for from_status, targets in ALLOWED_TRANSITIONS.items()
+            if to_status in targets
+        ]
+        now = timezone.now()
+        updated = Transaction.objects.filter(
+            pk=self.pk,
+            status__in=allowed_from
+        ).update(status=to_status, updated_at=now)
+        
+        if not updated:
+            raise ValueError(
+                f"Transition de statut interdite vers {to_status} pour la transaction {self.reference}."
+            )
+        
+        self.status = to_status
+        self.updated_at = now
     
     def __str__(self):
         return f"{self.get_type_display()} | {self.amount} | {self.reference}"
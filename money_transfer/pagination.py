@@ -0,0 +1,54 @@
+# Pagination par curseur (keyset) sur (created_at, id)
+# La page N coûte autant que la page 1 : aucun OFFSET, seulement un parcours d'index
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode_cursor(obj):
+    # Curseur opaque pointant juste après `obj` dans l'ordre (-created_at, -id)
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    # (created_at, id) ou None si le curseur est absent ou invalide
+    if not value:
+        return None
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_filter(cursor, prefix=''):
+    # Condition « strictement avant le curseur » ; `prefix` pour filtrer via une relation
+    # La borne `created_at <= curseur` en facteur permet un parcours d'index par plage
+    created_at, pk = cursor
+    return Q(**{f'{prefix}created_at__lte': created_at}) & (
+        Q(**{f'{prefix}created_at__lt': created_at})
+        | Q(**{f'{prefix}id__lt': pk})
+    )
+
+
+def paginate_keyset(queryset, cursor=None, page_size=50):
+    # Retourne (objets de la page, curseur de la page suivante ou None)
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor is not None:
+        queryset = queryset.filter(keyset_filter(cursor))
+
+    # Une ligne de plus pour savoir s'il existe une page suivante
+    return split_page(queryset[:page_size + 1], page_size)
+
+
+def split_page(items, page_size):
+    # Découpe `page_size + 1` objets déjà triés en (page, curseur suivant ou None)
+    items = list(items)
+    if len(items) > page_size:
+        items = items[:page_size]
+        return items, encode_cursor(items[-1])
+    return items, None
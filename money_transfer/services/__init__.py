@@ -5,9 +5,24 @@ Centralise toute la logique métier
 from .otp_service import OTPService
 from .account_service import AccountService
 from .transaction_service import TransactionService
+from .lock_service import AccountLockService, retry_on_conflict
+from .idempotency_service import IdempotencyService
+from .platform_service import PlatformConfigService
+from .stats_service import StatsService
+from .email_service import EmailOutboxService
+from .retention_service import RetentionService
+from .statement_service import StatementService
 
 __all__ = [
     'OTPService',
     'AccountService',
     'TransactionService',
+    'AccountLockService',
+    'retry_on_conflict',
+    'IdempotencyService',
+    'PlatformConfigService',
+    'StatsService',
+    'EmailOutboxService',
+    'RetentionService',
+    'StatementService',
 ]
\ No newline at end of file
@@ -2,13 +2,31 @@
 # Création, activation, suspension, vérification de solde
 
 import logging
-from django.db import transaction
-from money_transfer.models import VirtualAccount, Platform, User
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction, connection, IntegrityError
+from django.db.models import F, Q, Sum, Count, Case, When, Value
+from money_transfer.models import VirtualAccount, Platform, User, Transaction
 from money_transfer.models.user import UserStatus
+from money_transfer.models.transaction import TransactionStatus
+from .stats_service import StatsService, ACCOUNT_COLUMNS
 
 logger = logging.getLogger('money_transfer')
 
 
+def account_stats_cache_key(account_id):
+    return f'money_transfer:account_stats:{account_id}'
+
+
+def balance_version_cache_key(account_id):
+    return f'money_transfer:balance_version:{account_id}'
+
+
+def user_account_cache_key(user_id):
+    return f'money_transfer:user_account:{user_id}'
+
+
 class AccountService:
     # Service centralisé pour la gestion des comptes virtuels
     
@@ -27,51 +45,82 @@ class AccountService:
             balance=0,
             is_active=False  # Reste inactif jusqu'à la validation de l'OTP
         )
+        StatsService.record_user_created(user)
         
         logger.info(f"Compte virtuel créé pour {user.email} - ID: {account.id}")
         return account
     
     @staticmethod
     @transaction.atomic
-    def create_platform_account(platform):
+    def create_platform_account(platform, stripe=0):
     
-        if hasattr(platform, 'virtual_account') and platform.virtual_account:
-            logger.warning(f"Tentative de création de compte plateforme existant pour {platform.name}")
-            raise ValueError(f"La plateforme {platform.name} a déjà un compte virtuel.")
+        if VirtualAccount.objects.filter(platform=platform, stripe=stripe).exists():
+            logger.warning(f"Tentative de création de compte plateforme existant pour {platform.name} #{stripe}")
+            raise ValueError(f"La plateforme {platform.name} a déjà un sous-compte #{stripe}.")
         
         account = VirtualAccount.objects.create(
             platform=platform,
+            stripe=stripe,
             balance=0,
             is_active=True  # La plateform reste tjr actif
         )
         
-        logger.info(f"Compte plateforme créé pour {platform.name} - ID: {account.id}")
+        logger.info(f"Compte plateforme créé pour {platform.name} #{stripe} - ID: {account.id}")
         return account
     
     @staticmethod
-    def get_or_create_platform_account():
+    def get_or_create_platform():
+        
+        platform = Platform.objects.first()
+        
+        if not platform:
+            # Créer la plateforme par défaut si elle n'existe pas
+            platform = Platform.objects.create(
+                name="Money Transfer Platform",
+                withdrawal_fee_rate=2  # 2% par défaut
+            )
+            logger.info("Plateforme par défaut créée")
+        
+        return platform
+    
+    @staticmethod
+    def get_or_create_platform_account(stripe=0):
        
         try:
-            platform = Platform.objects.first()
-            
-            if not platform:
-                # Créer la plateforme par défaut si elle n'existe pas
-                platform = Platform.objects.create(
-                    name="Money Transfer Platform",
-                    withdrawal_fee_rate=2  # 2% par défaut
-                )
-                logger.info("Plateforme par défaut créée")
-            
-            # Récupérer ou créer le compte
-            if hasattr(platform, 'virtual_account') and platform.virtual_account:
-                return platform.virtual_account
-            else:
-                return AccountService.create_platform_account(platform)
+            platform = AccountService.get_or_create_platform()
+            
+            # Récupérer ou créer le sous-compte
+            account = VirtualAccount.objects.select_related('platform').filter(
+                platform=platform,
+                stripe=stripe
+            ).first()
+            if account:
+                return account
+            
+            try:
+                with transaction.atomic():
+                    return AccountService.create_platform_account(platform, stripe)
+            except IntegrityError:
+                # Créé entre-temps par une requête concurrente
+                return VirtualAccount.objects.select_related('platform').get(platform=platform, stripe=stripe)
                 
         except Exception as e:
             logger.error(f"Erreur lors de la récupération du compte plateforme: {str(e)}")
             raise
     
+    @staticmethod
+    def get_platform_stripes():
+        # Nombre de sous-comptes de frais entre lesquels les retraits sont répartis
+        return max(1, getattr(settings, 'PLATFORM_FEE_STRIPES', 1))
+    
+    @staticmethod
+    def get_platform_balance(platform=None):
+        # Solde de la plateforme = somme de tous ses sous-comptes de frais
+        accounts = VirtualAccount.objects.filter(platform__isnull=False)
+        if platform is not None:
+            accounts = accounts.filter(platform=platform)
+        return accounts.aggregate(total=Sum('balance'))['total'] or 0
+    
     @staticmethod
     @transaction.atomic
     def activate_account(user):
@@ -88,9 +137,11 @@ class AccountService:
             account.save(update_fields=['is_active'])
             
             # Mettre à jour le statut de l'utilisateur
+            old_status = user.status
             user.status = UserStatus.ACTIVE
             user.is_verified = True
             user.save(update_fields=['status', 'is_verified'])
+            StatsService.record_user_status_change(user, old_status)
             
             logger.info(f"Compte activé pour {user.email}")
             return True, " Votre compte a été activé avec succès !"
@@ -112,8 +163,10 @@ class AccountService:
             account.save(update_fields=['is_active'])
             
             # Mettre à jour le statut utilisateur
+            old_status = user.status
             user.status = UserStatus.SUSPENDED
             user.save(update_fields=['status'])
+            StatsService.record_user_status_change(user, old_status)
             
             logger.warning(f"Compte suspendu pour {user.email} - Raison: {reason}")
             return True, "⚠️ Le compte a été suspendu."
@@ -134,8 +187,10 @@ class AccountService:
             account.is_active = True
             account.save(update_fields=['is_active'])
             
+            old_status = user.status
             user.status = UserStatus.ACTIVE
             user.save(update_fields=['status'])
+            StatsService.record_user_status_change(user, old_status)
             
             logger.info(f"Compte réactivé pour {user.email}")
             return True, " Le compte a été réactivé."
@@ -146,15 +201,108 @@ class AccountService:
     
     @staticmethod
     def get_balance(user):
-   
+        # Solde lu dans le cache partagé (par compte, versionné) ; la base n'est lue qu'après un mouvement
         try:
-            if hasattr(user, 'virtual_account') and user.virtual_account:
-                return user.virtual_account.balance
-            return 0
+            account_id = AccountService._get_account_id(user)
+            if account_id is None:
+                return 0
+            return AccountService.get_account_balance(account_id)
         except Exception as e:
             logger.error(f"Erreur lors de la récupération du solde pour {user.email}: {str(e)}")
             return 0
     
+    @staticmethod
+    def get_account_balance(account_id):
+        # La valeur est rangée sous le numéro de version lu AVANT la base : un mouvement validé
+        # entre-temps incrémente la version, la valeur éventuellement périmée n'est plus jamais lue.
+        # Sans cache partagé, la version incrémentée par un autre processus serait invisible : lecture en base.
+        if not settings.ACCOUNT_CACHE_ENABLED:
+            return VirtualAccount.objects.filter(id=account_id).values_list('balance', flat=True).first() or 0
+        
+        version_key = balance_version_cache_key(account_id)
+        version = cache.get(version_key)
+        if version is None:
+            # Départ horodaté : une version recréée après éviction ne retombe pas sur d'anciennes valeurs
+            cache.add(version_key, time.time_ns(), None)
+            version = cache.get(version_key)
+        
+        value_key = f'money_transfer:balance:{account_id}:{version}'
+        balance = cache.get(value_key)
+        if balance is None:
+            balance = VirtualAccount.objects.filter(id=account_id).values_list('balance', flat=True).first() or 0
+            cache.set(value_key, balance, settings.BALANCE_CACHE_TIMEOUT)
+        return balance
+    
+    @staticmethod
+    def _get_account_id(user):
+        # Identifiant du compte sans la requête de la relation inverse user.virtual_account
+        # (l'association utilisateur -> compte ne change jamais)
+        if User.virtual_account.is_cached(user):
+            account = getattr(user, 'virtual_account', None)
+            return account.id if account else None
+        
+        key = user_account_cache_key(user.pk)
+        account_id = cache.get(key)
+        if account_id is None:
+            account_id = VirtualAccount.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+            if account_id is not None:
+                cache.set(key, account_id, None)
+        return account_id
+    
+    @staticmethod
+    def get_account_stats(account):
+        # Totaux des opérations réussies du compte depuis l'ouverture ({'total', 'count'}
+        # par rubrique). Mis en cache jusqu'au prochain mouvement du compte ; sans cache partagé,
+        # l'invalidation ne toucherait que le processus du mouvement : calcul direct.
+        if not settings.ACCOUNT_CACHE_ENABLED:
+            return AccountService._compute_account_stats(account)
+        
+        key = account_stats_cache_key(account.id)
+        stats = cache.get(key)
+        if stats is None:
+            stats = AccountService._compute_account_stats(account)
+            cache.set(key, stats, settings.ACCOUNT_STATS_CACHE_TIMEOUT)
+        return stats
+    
+    @staticmethod
+    def _compute_account_stats(account):
+        # Une seule requête GROUP BY (type, côté du compte) au lieu d'un agrégat par rubrique
+        rows = Transaction.objects.filter(
+            Q(sender_account=account) | Q(receiver_account=account),
+            status=TransactionStatus.SUCCESS
+        ).annotate(
+            side=Case(When(sender_account=account, then=Value('sender')), default=Value('receiver'))
+        ).values('type', 'side').annotate(
+            total=Sum('amount'),
+            count=Count('id')
+        ).order_by()
+        
+        stats = {prefix: {'total': 0, 'count': 0} for prefix in ACCOUNT_COLUMNS.values()}
+        for row in rows:
+            prefix = ACCOUNT_COLUMNS.get((row['type'], row['side']))
+            if prefix:
+                stats[prefix] = {'total': row['total'], 'count': row['count']}
+        return stats
+    
+    @staticmethod
+    def invalidate_account_caches(account_ids):
+        # Soldes et statistiques des comptes modifiés ; après validation seulement, pour
+        # qu'une lecture concurrente ne puisse pas remettre en cache un état antérieur
+        account_ids = [account_id for account_id in account_ids if account_id]
+        if account_ids:
+            transaction.on_commit(lambda: AccountService._expire_account_caches(account_ids))
+    
+    @staticmethod
+    def _expire_account_caches(account_ids):
+        cache.delete_many([account_stats_cache_key(account_id) for account_id in account_ids])
+        for account_id in account_ids:
+            version_key = balance_version_cache_key(account_id)
+            try:
+                cache.incr(version_key)
+            except ValueError:
+                # Version absente (jamais lue ou évincée) : la prochaine lecture en crée une
+                cache.add(version_key, time.time_ns(), None)
+    
     @staticmethod
     def can_perform_transaction(user):
     
@@ -182,4 +330,51 @@ class AccountService:
    
         if account.balance < amount:
             return False, f" Solde insuffisant. Solde actuel : {account.balance}"
-        return True, ""
\ No newline at end of file
+        return True, ""
+    
+    @staticmethod
+    def debit(account, amount):
+        # Débit conditionnel en un seul aller-retour :
+        # UPDATE ... SET balance = balance - x WHERE id = ? AND balance >= x RETURNING balance
+        # Retourne le nouveau solde (et met à jour l'objet), ou None si le solde est insuffisant
+        new_balance = AccountService._apply_balance_delta(account.id, -amount, guard=amount)
+        if new_balance is not None:
+            account.balance = new_balance
+        return new_balance
+    
+    @staticmethod
+    def credit(account, amount):
+        # Crédit en un seul aller-retour, retourne le nouveau solde (et met à jour l'objet)
+        new_balance = AccountService._apply_balance_delta(account.id, amount)
+        account.balance = new_balance
+        return new_balance
+    
+    @staticmethod
+    def _apply_balance_delta(account_id, delta, guard=None):
+        # Applique delta au solde ; si guard est fourni, n'agit que si balance >= guard
+        if connection.features.can_return_columns_from_insert:
+            # PostgreSQL et SQLite >= 3.35 supportent UPDATE ... RETURNING
+            qn = connection.ops.quote_name
+            sql = (
+                f"UPDATE {qn(VirtualAccount._meta.db_table)} "
+                f"SET {qn('balance')} = {qn('balance')} + %s "
+                f"WHERE {qn('id')} = %s"
+            )
+            params = [delta, account_id]
+            if guard is not None:
+                sql += f" AND {qn('balance')} >= %s"
+                params.append(guard)
+            sql += f" RETURNING {qn('balance')}"
+            
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            return row[0] if row else None
+        
+        # Repli pour les bases sans RETURNING : UPDATE conditionnel puis lecture
+        accounts = VirtualAccount.objects.filter(id=account_id)
+        if guard is not None:
+            accounts = accounts.filter(balance__gte=guard)
+        if not accounts.update(balance=F('balance') + delta):
+            return None
+        return VirtualAccount.objects.filter(id=account_id).values_list('balance', flat=True).get()
\ No newline at end of file
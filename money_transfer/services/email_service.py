@@ -0,0 +1,115 @@
+# Service de la file d'envoi des emails (outbox)
+# Les emails sont écrits dans la transaction de l'opération puis envoyés après validation
+# par le worker `process_email_outbox` : aucune requête n'attend plus le serveur SMTP
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.utils import timezone
+
+from money_transfer.models import OutgoingEmail
+from money_transfer.models.outbox import EmailStatus
+
+logger = logging.getLogger('money_transfer')
+
+
+class EmailOutboxService:
+    # Service centralisé pour la file d'envoi des emails
+
+    @staticmethod
+    def enqueue(to, subject, body, html_body=''):
+        # Écrit l'email dans la transaction courante : annulé avec elle, visible du worker après validation
+        email = OutgoingEmail.objects.create(to=to, subject=subject, body=body, html_body=html_body)
+        logger.info(f"Email mis en file pour {to} - Sujet: {subject.strip()}")
+        return email
+
+    @staticmethod
+    def deliver_pending(connection, batch_size=None):
+        # Envoie un lot d'emails dus sur `connection`, ouverte au besoin et laissée ouverte
+        # pour le lot suivant. Retourne (envoyés, en échec).
+        # Les envois SMTP ont lieu hors de toute transaction : aucun verrou n'est tenu pendant
+        # les appels réseau, et chaque résultat est enregistré dès qu'il est connu.
+        emails = EmailOutboxService._claim(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+        if not emails:
+            return 0, 0
+
+        sent = failed = 0
+        EmailOutboxService._open(connection)
+        for email in emails:
+            try:
+                connection.send_messages([EmailOutboxService._build_message(email, connection)])
+            except Exception as e:
+                EmailOutboxService._schedule_retry(email, e)
+                failed += 1
+                # La connexion est peut-être rompue : on la rouvre pour la suite du lot
+                connection.close()
+                EmailOutboxService._open(connection)
+            else:
+                email.status = EmailStatus.SENT
+                email.attempts += 1
+                email.sent_at = timezone.now()
+                email.last_error = ''
+                sent += 1
+            email.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+
+        logger.info(f"File d'envoi : {sent} email(s) envoyé(s), {failed} en échec")
+        return sent, failed
+
+    @staticmethod
+    @transaction.atomic
+    def _claim(batch_size):
+        # Réserve un lot d'emails dus dans une transaction courte : leur prochaine tentative est
+        # repoussée de EMAIL_OUTBOX_LEASE_SECONDS, les autres workers ne les voient plus.
+        # Si le worker s'arrête avant d'enregistrer le résultat, l'email redevient dû à l'expiration.
+        now = timezone.now()
+        # skip_locked : plusieurs workers se partagent la file sans s'attendre
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                status=EmailStatus.PENDING,
+                next_attempt_at__lte=now
+            ).order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if emails:
+            lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(next_attempt_at=lease_until)
+            for email in emails:
+                email.next_attempt_at = lease_until
+        return emails
+
+    @staticmethod
+    def _open(connection):
+        # Sans effet si la connexion est déjà ouverte ; en cas d'échec, les envois du lot échouent
+        # et sont reprogrammés
+        try:
+            connection.open()
+        except Exception as e:
+            logger.error(f"Connexion au serveur d'email impossible : {str(e)}")
+
+    @staticmethod
+    def _build_message(email, connection):
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email.to],
+            connection=connection
+        )
+        if email.html_body:
+            message.attach_alternative(email.html_body, 'text/html')
+        return message
+
+    @staticmethod
+    def _schedule_retry(email, error):
+        # Attente exponentielle entre les tentatives, abandon après EMAIL_OUTBOX_MAX_ATTEMPTS
+        email.attempts += 1
+        email.last_error = str(error)
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = EmailStatus.FAILED
+            logger.error(f"Envoi abandonné pour {email.to} après {email.attempts} tentatives : {error}")
+        else:
+            delay = settings.EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS * 2 ** (email.attempts - 1)
+            email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+            logger.warning(f"Échec d'envoi à {email.to} (tentative {email.attempts}), nouvel essai dans {delay}s : {error}")
@@ -0,0 +1,192 @@
+# Service d'idempotence des opérations financières
+# Clés uniques en base + cache LRU en mémoire : un rejeu renvoie la transaction d'origine
+
+import copy
+import hashlib
+import inspect
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+
+from money_transfer.models import IdempotencyKey
+from .retention_service import RetentionService
+
+logger = logging.getLogger('money_transfer')
+
+
+class IdempotencyKeyReused(Exception):
+    # La clé a déjà servi à une autre opération ou à d'autres arguments
+    pass
+
+
+def request_fingerprint(arguments):
+    # Empreinte stable des arguments de l'opération (hors utilisateur)
+    payload = json.dumps(arguments, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LRUCache:
+    # Cache LRU borné et thread-safe (propre au processus)
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class IdempotencyService:
+    # Service centralisé pour les clés d'idempotence
+
+    _cache = LRUCache(getattr(settings, 'IDEMPOTENCY_CACHE_SIZE', 10_000))
+
+    @staticmethod
+    def get_transaction(user, key, operation=None, fingerprint=None):
+        # Transaction déjà associée à la clé : cache LRU, sinon une lecture indexée (user, key).
+        # Lève IdempotencyKeyReused si la clé a servi à une autre opération ou d'autres arguments.
+        cached = IdempotencyService._cache.get((user.id, key))
+        if cached is not None:
+            cached_operation, cached_fingerprint, txn, expires_at = cached
+            if expires_at > timezone.now():
+                IdempotencyService._check_request(cached_operation, cached_fingerprint, operation, fingerprint)
+                return copy.copy(txn)
+
+        record = IdempotencyKey.objects.select_related('transaction').filter(
+            user=user,
+            key=key,
+            expires_at__gt=timezone.now(),
+            transaction__isnull=False
+        ).first()
+        if record is None:
+            return None
+
+        IdempotencyService._check_request(record.operation, record.fingerprint, operation, fingerprint)
+        if not transaction.get_connection().in_atomic_block:
+            # Hors transaction, la ligne lue est forcément validée : on peut la mettre en cache
+            IdempotencyService._cache.set(
+                (user.id, key),
+                (record.operation, record.fingerprint, record.transaction, record.expires_at)
+            )
+        return copy.copy(record.transaction)
+
+    @staticmethod
+    def claim(user, key, operation, fingerprint):
+        # Réserve la clé (INSERT sur l'index unique) ; retourne None si elle est déjà prise.
+        # Sur PostgreSQL, un INSERT concurrent attend le COMMIT du détenteur avant d'échouer.
+        expires_at = timezone.now() + timedelta(hours=getattr(settings, 'IDEMPOTENCY_KEY_TTL_HOURS', 24))
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    return IdempotencyKey.objects.create(
+                        user=user,
+                        key=key,
+                        operation=operation,
+                        fingerprint=fingerprint,
+                        expires_at=expires_at
+                    )
+            except IntegrityError:
+                # Une clé expirée mais pas encore purgée peut être réutilisée
+                purged, _ = IdempotencyKey.objects.filter(
+                    user=user,
+                    key=key,
+                    expires_at__lte=timezone.now()
+                ).delete()
+                if not purged:
+                    return None
+        return None
+
+    @staticmethod
+    def complete(record, txn):
+        # Associe la transaction à la clé ; le cache n'est alimenté qu'après COMMIT
+        record.transaction = txn
+        record.save(update_fields=['transaction'])
+
+        cache_key = (record.user_id, record.key)
+        cached = (record.operation, record.fingerprint, txn, record.expires_at)
+        transaction.on_commit(lambda: IdempotencyService._cache.set(cache_key, cached))
+
+    @staticmethod
+    def purge_expired(batch_size=1000, sleep=0):
+        # Supprime les clés expirées par plages de clés primaires (verrous courts)
+        deleted, _ = RetentionService.purge('idempotency_keys', batch_size=batch_size, sleep=sleep)
+        return deleted
+
+    @staticmethod
+    def _check_request(recorded_operation, recorded_fingerprint, operation, fingerprint):
+        if operation is not None and recorded_operation != operation:
+            raise IdempotencyKeyReused(f"Clé d'idempotence déjà utilisée pour une opération {recorded_operation}.")
+        if fingerprint is not None and recorded_fingerprint != fingerprint:
+            raise IdempotencyKeyReused("Clé d'idempotence déjà utilisée avec un autre montant ou destinataire.")
+
+
+def idempotent(operation):
+    # Rend une opération du TransactionService rejouable via un argument idempotency_key.
+    # À placer entre @retry_on_conflict et @transaction.atomic.
+    def decorator(func):
+        signature = inspect.signature(func)
+        user_param = next(iter(signature.parameters))
+
+        @wraps(func)
+        def wrapper(*args, idempotency_key=None, **kwargs):
+            if not idempotency_key:
+                return func(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            user = arguments.pop(user_param)
+            fingerprint = request_fingerprint(arguments)
+
+            try:
+                txn = IdempotencyService.get_transaction(user, idempotency_key, operation, fingerprint)
+                if txn is not None:
+                    return True, " Opération déjà traitée.", txn
+
+                with transaction.atomic():
+                    record = IdempotencyService.claim(user, idempotency_key, operation, fingerprint)
+                    if record is None:
+                        # Une requête concurrente avec la même clé a abouti (ou est en cours)
+                        txn = IdempotencyService.get_transaction(user, idempotency_key, operation, fingerprint)
+                        if txn is not None:
+                            return True, " Opération déjà traitée.", txn
+                        return False, " Une opération identique est déjà en cours.", None
+
+                    success, message, txn = func(*args, **kwargs)
+
+                    if success:
+                        IdempotencyService.complete(record, txn)
+                    else:
+                        # Échec métier : la clé est libérée pour permettre une nouvelle tentative
+                        record.delete()
+                    return success, message, txn
+
+            except IdempotencyKeyReused as e:
+                logger.warning(f"Clé d'idempotence refusée pour {user.email}: {str(e)}")
+                return False, f" {e}", None
+
+        return wrapper
+    return decorator
@@ -0,0 +1,115 @@
+# Service de verrouillage des comptes virtuels
+# Verrous de lignes pris dans un ordre déterministe (id croissant), délai borné,
+# et rejeu automatique des transactions en cas d'interblocage / conflit de sérialisation
+
+import logging
+import random
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection, DatabaseError
+from django.db.models import F
+from money_transfer.models import VirtualAccount
+
+logger = logging.getLogger('money_transfer')
+
+# Codes SQLSTATE PostgreSQL justifiant un rejeu de la transaction
+RETRYABLE_PGCODES = {
+    '40001',  # serialization_failure
+    '40P01',  # deadlock_detected
+    '55P03',  # lock_not_available (lock_timeout dépassé)
+}
+
+
+class AccountLockService:
+    # Verrouillage ordonné des comptes et compteurs de rejeu
+
+    _stats_lock = threading.Lock()
+    _stats = {'retries': 0, 'conflicts': 0, 'gave_up': 0}
+
+    @staticmethod
+    def lock_accounts(*accounts):
+        # Verrouille (SELECT ... FOR UPDATE) les comptes par id croissant.
+        # Accepte des comptes ou des ids ; doit être appelé dans un bloc atomique.
+        # Retourne {id: compte verrouillé, solde à jour}
+        ids = sorted({
+            account if isinstance(account, int) else account.id
+            for account in accounts
+            if account is not None
+        })
+        if not ids:
+            return {}
+
+        AccountLockService._set_lock_timeout()
+
+        if not connection.features.has_select_for_update:
+            # SQLite ignore FOR UPDATE : une écriture neutre prend le verrou d'écriture
+            # dès maintenant, pour que les conflits surviennent ici (et soient rejoués)
+            VirtualAccount.objects.filter(id__in=ids).update(balance=F('balance'))
+
+        locked = VirtualAccount.objects.select_for_update().filter(id__in=ids).order_by('id')
+        return {account.id: account for account in locked}
+
+    @staticmethod
+    def _set_lock_timeout():
+        # Attente de verrou bornée, limitée à la transaction courante
+        timeout_ms = getattr(settings, 'ACCOUNT_LOCK_TIMEOUT_MS', 2000)
+        if connection.vendor == 'postgresql' and timeout_ms:
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL lock_timeout = %s", [f"{int(timeout_ms)}ms"])
+
+    @staticmethod
+    def is_retryable(error):
+        # Interblocage, conflit de sérialisation, délai de verrou ou base SQLite verrouillée
+        cause = error.__cause__ or error
+        if getattr(cause, 'pgcode', None) in RETRYABLE_PGCODES:
+            return True
+        return 'database is locked' in str(error)
+
+    @staticmethod
+    def record(key):
+        with AccountLockService._stats_lock:
+            AccountLockService._stats[key] += 1
+
+    @staticmethod
+    def get_stats():
+        with AccountLockService._stats_lock:
+            return dict(AccountLockService._stats)
+
+    @staticmethod
+    def reset_stats():
+        with AccountLockService._stats_lock:
+            for key in AccountLockService._stats:
+                AccountLockService._stats[key] = 0
+
+
+def retry_on_conflict(func):
+    # Rejoue la transaction décorée (à placer AU-DESSUS de @transaction.atomic)
+    # Sans effet si l'appel a lieu dans un bloc atomique englobant : c'est alors
+    # à l'appelant, propriétaire de la transaction, de rejouer.
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if connection.in_atomic_block:
+            return func(*args, **kwargs)
+
+        max_attempts = getattr(settings, 'TRANSACTION_MAX_ATTEMPTS', 3)
+        backoff = getattr(settings, 'TRANSACTION_RETRY_BACKOFF_MS', 20) / 1000
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except DatabaseError as e:
+                if not AccountLockService.is_retryable(e):
+                    raise
+                AccountLockService.record('conflicts')
+                if attempt == max_attempts:
+                    AccountLockService.record('gave_up')
+                    logger.error(f"Conflit de verrous persistant sur {func.__name__} après {attempt} tentatives: {e}")
+                    raise
+                AccountLockService.record('retries')
+                logger.warning(f"Conflit de verrous sur {func.__name__} (tentative {attempt}), rejeu: {e}")
+                # Attente exponentielle avec gigue pour désynchroniser les transactions en conflit
+                time.sleep(backoff * (2 ** (attempt - 1)) * (1 + random.random()))
+    return wrapper
@@ -5,12 +5,12 @@ import random
 import logging
 from datetime import timedelta
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
-from money_transfer.models.user import OTP, User, OTPType
+from money_transfer.models.user import OTPType
+from .email_service import EmailOutboxService
+from .otp_store import get_otp_store, OTP_EXPIRED, OTP_INVALID
 
 logger = logging.getLogger('money_transfer')
 
@@ -29,25 +29,16 @@ class OTPService:
         if otp_type not in [OTPType.ACCOUNT_VALIDATION, OTPType.WITHDRAWAL]:
             raise ValueError(f"Type d'OTP invalide : {otp_type}")
         
-        # Invalider tous les anciens OTP non utilisés du même type
-        OTP.objects.filter(
-            user=user,
-            otp_type=otp_type,
-            is_used=False
-        ).update(is_used=True)
-        
-        # Générer le code
+        # Générer le code et l'enregistrer (les anciens codes du même type deviennent invalides)
         code = OTPService.generate_code()
-        
-        # Créer le nouvel OTP
-        otp = OTP.objects.create(
-            user=user,
-            code=code,
-            otp_type=otp_type,
+        otp = get_otp_store().issue(
+            user,
+            otp_type,
+            code,
             expires_at=timezone.now() + timedelta(minutes=expiry_minutes)
         )
         
-        logger.info(f"OTP créé pour {user.email} - Type: {otp_type} - Code: {code}")
+        logger.info(f"OTP créé pour {user.email} - Type: {otp_type}")
         
         return otp
     
@@ -77,49 +68,38 @@ class OTPService:
             html_message = render_to_string(template_name, context)
             plain_message = strip_tags(html_message)
             
-            # Envoi de l'email
-            send_mail(
+            # Mise en file : envoyé après validation de la transaction par le worker
+            # process_email_outbox (la requête n'attend pas le serveur SMTP)
+            EmailOutboxService.enqueue(
+                to=user.email,
                 subject=subject,
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                html_message=html_message,
-                fail_silently=False,
+                body=plain_message,
+                html_body=html_message,
             )
             
-            logger.info(f"Email OTP envoyé à {user.email}")
             return True
             
         except Exception as e:
-            logger.error(f"Erreur lors de l'envoi de l'email OTP à {user.email}: {str(e)}")
+            logger.error(f"Erreur lors de la mise en file de l'email OTP pour {user.email}: {str(e)}")
             return False
     
     @staticmethod
     def validate_otp(user, code, otp_type):
        
         try:
-            # Rechercher l'OTP
-            otp = OTP.objects.get(
-                user=user,
-                code=code,
-                otp_type=otp_type,
-                is_used=False
-            )
+            # Vérification et consommation en une seule opération atomique
+            result = get_otp_store().consume(user, otp_type, code)
             
-            # Vérifier la validité
-            if not otp.is_valid():
-                logger.warning(f"OTP expiré pour {user.email} - Code: {code}")
+            if result == OTP_EXPIRED:
+                logger.warning(f"OTP expiré pour {user.email} - Type: {otp_type}")
                 return False, " Ce code a expiré. Demandez un nouveau code."
             
-            # Marquer comme utilisé
-            otp.mark_as_used()
+            if result == OTP_INVALID:
+                logger.warning(f"OTP invalide pour {user.email} - Type: {otp_type}")
+                return False, " Code invalide. Vérifiez et réessayez."
             
             logger.info(f"OTP validé avec succès pour {user.email} - Type: {otp_type}")
             return True, " Code validé avec succès !"
-            
-        except OTP.DoesNotExist:
-            logger.warning(f"OTP invalide pour {user.email} - Code: {code}")
-            return False, " Code invalide. Vérifiez et réessayez."
         
         except Exception as e:
             logger.error(f"Erreur lors de la validation OTP pour {user.email}: {str(e)}")
@@ -146,14 +126,7 @@ class OTPService:
     
     @staticmethod
     def cleanup_expired_otps():
-      
-        expired_otps = OTP.objects.filter(
-            expires_at__lt=timezone.now(),
-            is_used=False
-        )
-        
-        count = expired_otps.count()
-        expired_otps.update(is_used=True)  # Marquer comme utilisés plutôt que supprimer
-        
-        logger.info(f"Nettoyage OTP : {count} OTP expirés marqués comme utilisés")
-        return count
\ No newline at end of file
+        # Supprime les OTP expirés ou utilisés (sans effet pour le cache, qui les expire seul)
+        count = get_otp_store().cleanup()
+        logger.info(f"Nettoyage OTP : {count} OTP expirés ou utilisés supprimés")
+        return count
@@ -0,0 +1,107 @@
+# Stockage des OTP (One-Time Password)
+# Backend choisi par le réglage OTP_STORE : cache partagé (TTL natif, codes hachés,
+# consommation atomique) ou table OTP (repli sans cache partagé)
+
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from money_transfer.models.user import OTP
+from .retention_service import RetentionService
+
+# Résultats de OTPStore.consume
+OTP_VALID = 'valid'
+OTP_EXPIRED = 'expired'
+OTP_INVALID = 'invalid'
+
+
+class OTPStore(ABC):
+    # Interface commune des backends de stockage des OTP
+
+    @abstractmethod
+    def issue(self, user, otp_type, code, expires_at):
+        # Enregistre le code (les codes précédents du même type deviennent invalides) et
+        # retourne un OTP (non nécessairement sauvegardé) pour l'email
+        ...
+
+    @abstractmethod
+    def consume(self, user, otp_type, code):
+        # Valide et consomme le code en une opération : OTP_VALID, OTP_EXPIRED ou OTP_INVALID
+        ...
+
+    def cleanup(self):
+        # Supprime les codes expirés ou utilisés, retourne leur nombre
+        return 0
+
+
+class DatabaseOTPStore(OTPStore):
+    # Table OTP : comportement historique
+
+    def issue(self, user, otp_type, code, expires_at):
+        # Invalider tous les anciens OTP non utilisés du même type
+        OTP.objects.filter(user=user, otp_type=otp_type, is_used=False).update(is_used=True)
+        return OTP.objects.create(user=user, code=code, otp_type=otp_type, expires_at=expires_at)
+
+    def consume(self, user, otp_type, code):
+        # UPDATE conditionnel : deux validations simultanées du même code ne peuvent pas réussir toutes les deux
+        otps = OTP.objects.filter(user=user, code=code, otp_type=otp_type, is_used=False)
+        if otps.filter(expires_at__gte=timezone.now()).update(is_used=True):
+            return OTP_VALID
+        return OTP_EXPIRED if otps.exists() else OTP_INVALID
+
+    def cleanup(self):
+        deleted, _ = RetentionService.purge('otps')
+        return deleted
+
+
+class CacheOTPStore(OTPStore):
+    # Cache partagé (Redis) : une clé par (utilisateur, type), expirée par le cache lui-même.
+    # Seul un condensat HMAC du code est stocké.
+
+    # Conservation après expiration pour distinguer « expiré » de « invalide »
+    EXPIRED_GRACE_SECONDS = 300
+
+    def issue(self, user, otp_type, code, expires_at):
+        # Écraser la clé invalide le code précédent
+        timeout = (expires_at - timezone.now()).total_seconds() + self.EXPIRED_GRACE_SECONDS
+        cache.set(
+            self._key(user, otp_type),
+            {'hash': self._hash(user, otp_type, code), 'expires_at': expires_at.timestamp()},
+            timeout=max(1, int(timeout))
+        )
+        return OTP(user=user, code=code, otp_type=otp_type, expires_at=expires_at)
+
+    def consume(self, user, otp_type, code):
+        key = self._key(user, otp_type)
+        entry = cache.get(key)
+        if not entry or not hmac.compare_digest(entry['hash'], self._hash(user, otp_type, code)):
+            return OTP_INVALID
+        if timezone.now().timestamp() > entry['expires_at']:
+            return OTP_EXPIRED
+        # delete() est atomique et indique si la clé existait : une seule validation gagne
+        return OTP_VALID if cache.delete(key) else OTP_INVALID
+
+    @staticmethod
+    def _key(user, otp_type):
+        return f'money_transfer:otp:{user.pk}:{otp_type}'
+
+    @staticmethod
+    def _hash(user, otp_type, code):
+        message = f'{user.pk}:{otp_type}:{code}'.encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _load_store(path):
+    return import_string(path)()
+
+
+def get_otp_store():
+    # Backend configuré par OTP_STORE (instance unique par chemin)
+    return _load_store(settings.OTP_STORE)
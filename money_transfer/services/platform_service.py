@@ -0,0 +1,98 @@
+# Service de configuration de la plateforme
+# Cache propre au processus + numéro de version dans le cache partagé :
+# en régime établi, le parcours de retrait n'interroge plus la table Platform.
+# Sans cache partagé (cache mémoire local), la version n'est pas vue des autres
+# processus : la copie locale est alors rechargée au plus tard après PLATFORM_CONFIG_LOCAL_TTL.
+
+import copy
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .account_service import AccountService
+
+logger = logging.getLogger('money_transfer')
+
+VERSION_CACHE_KEY = 'money_transfer:platform_config:version'
+
+
+class PlatformConfigService:
+    # Service centralisé pour la configuration de la plateforme (taux de frais, sous-comptes)
+
+    _lock = threading.Lock()
+    _version = None
+    _loaded_at = None
+    _platform = None
+    _fee_accounts = {}
+
+    @staticmethod
+    def get_platform():
+        # Plateforme courante ; rechargée seulement si la version partagée a changé
+        PlatformConfigService._sync()
+        with PlatformConfigService._lock:
+            platform = PlatformConfigService._platform
+        if platform is None:
+            platform = AccountService.get_or_create_platform()
+            with PlatformConfigService._lock:
+                PlatformConfigService._platform = platform
+        return copy.copy(platform)
+
+    @staticmethod
+    def get_fee_rate():
+        return PlatformConfigService.get_platform().withdrawal_fee_rate
+
+    @staticmethod
+    def get_fee_account(account):
+        # Sous-compte de frais associé au compte émetteur (réparti par id de compte) :
+        # des retraits concurrents de comptes différents ne verrouillent pas la même ligne.
+        # Le solde de la copie renvoyée n'est pas à jour : il est relu sous verrou.
+        stripe = account.id % AccountService.get_platform_stripes()
+        PlatformConfigService._sync()
+        with PlatformConfigService._lock:
+            fee_account = PlatformConfigService._fee_accounts.get(stripe)
+        if fee_account is None:
+            fee_account = AccountService.get_or_create_platform_account(stripe)
+            with PlatformConfigService._lock:
+                PlatformConfigService._fee_accounts[stripe] = fee_account
+        return copy.copy(fee_account)
+
+    @staticmethod
+    def invalidate():
+        # Nouvelle version partagée : tous les processus rechargeront la configuration
+        cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        PlatformConfigService._clear()
+        logger.info("Cache de configuration de la plateforme invalidé")
+
+    @staticmethod
+    def _sync():
+        # Vide le cache local si la version partagée ne correspond plus
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            # Première utilisation (ou cache partagé vidé) : on publie une version
+            cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get(VERSION_CACHE_KEY)
+
+        ttl = settings.PLATFORM_CONFIG_LOCAL_TTL
+        now = time.monotonic()
+        with PlatformConfigService._lock:
+            expired = (
+                ttl is not None and PlatformConfigService._loaded_at is not None
+                and now - PlatformConfigService._loaded_at >= ttl
+            )
+            if PlatformConfigService._version != version or expired:
+                PlatformConfigService._version = version
+                PlatformConfigService._loaded_at = now
+                PlatformConfigService._platform = None
+                PlatformConfigService._fee_accounts = {}
+
+    @staticmethod
+    def _clear():
+        with PlatformConfigService._lock:
+            PlatformConfigService._version = None
+            PlatformConfigService._loaded_at = None
+            PlatformConfigService._platform = None
+            PlatformConfigService._fee_accounts = {}
@@ -0,0 +1,92 @@
+# Service de rétention des données périmées
+# Suppression par plages de clés primaires bornées : chaque DELETE ne verrouille qu'une
+# plage courte de l'index, avec une pause possible entre deux paquets
+
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db.models import Q
+from django.utils import timezone
+
+from money_transfer.models import OTP, IdempotencyKey, OutgoingEmail
+from money_transfer.models.outbox import EmailStatus
+
+logger = logging.getLogger('money_transfer')
+
+
+def expired_otps():
+    return OTP.objects.filter(Q(is_used=True) | Q(expires_at__lt=timezone.now()))
+
+
+def expired_sessions():
+    return Session.objects.filter(expire_date__lt=timezone.now())
+
+
+def expired_idempotency_keys():
+    return IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+
+
+def delivered_emails():
+    # Emails envoyés ou abandonnés depuis plus de EMAIL_OUTBOX_RETENTION_DAYS
+    return OutgoingEmail.objects.filter(
+        status__in=[EmailStatus.SENT, EmailStatus.FAILED],
+        created_at__lt=timezone.now() - timedelta(days=settings.EMAIL_OUTBOX_RETENTION_DAYS)
+    )
+
+
+# Nom -> lignes à supprimer (évaluées au moment de la purge)
+RETENTION_TARGETS = {
+    'otps': expired_otps,
+    'sessions': expired_sessions,
+    'idempotency_keys': expired_idempotency_keys,
+    'emails': delivered_emails,
+}
+
+
+class RetentionService:
+    # Service centralisé pour la purge des données périmées
+
+    @staticmethod
+    def purge(name, batch_size=None, sleep=None):
+        # Purge une cible de RETENTION_TARGETS, retourne (lignes supprimées, durée en secondes)
+        deleted, elapsed = RetentionService.purge_queryset(RETENTION_TARGETS[name](), batch_size, sleep)
+        logger.info(
+            f"Rétention {name} : {deleted} ligne(s) supprimée(s) en {elapsed:.2f}s "
+            f"({deleted / elapsed if elapsed else 0:,.0f} lignes/s)"
+        )
+        return deleted, elapsed
+
+    @staticmethod
+    def purge_queryset(queryset, batch_size=None, sleep=None):
+        # Parcourt les clés primaires dans l'ordre (clés entières ou chaînes) par paquets de
+        # `batch_size`, puis supprime la plage [première, dernière] du paquet avec le même filtre
+        batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        sleep = settings.RETENTION_SLEEP_SECONDS if sleep is None else sleep
+        started = time.perf_counter()
+        paused = 0.0
+        total = 0
+        last_pk = None
+
+        while True:
+            candidates = queryset.order_by('pk')
+            if last_pk is not None:
+                candidates = candidates.filter(pk__gt=last_pk)
+            pks = list(candidates.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+
+            deleted, _ = queryset.filter(pk__gte=pks[0], pk__lte=pks[-1]).delete()
+            total += deleted
+            last_pk = pks[-1]
+
+            if len(pks) < batch_size:
+                break
+            if sleep:
+                time.sleep(sleep)
+                paused += sleep
+
+        # Débit mesuré hors pauses
+        return total, time.perf_counter() - started - paused
@@ -0,0 +1,113 @@
+"""
+Service des relevés de compte
+Relevé chronologique des mouvements réussis avec solde progressif (fonction de fenêtre),
+lu en flux par paquets : mémoire constante quelle que soit la taille de l'historique.
+Sur PostgreSQL, iterator() ouvre un curseur côté serveur (sauf DISABLE_SERVER_SIDE_CURSORS).
+"""
+import csv
+import logging
+
+from django.conf import settings
+from django.db.models import F, Q, Sum, Case, When, Value, BigIntegerField, Window
+from django.db.models.expressions import RowRange
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from money_transfer.models import Transaction
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from .stats_service import day_bounds
+
+logger = logging.getLogger('money_transfer')
+
+STATEMENT_HEADER = [
+    'Date', 'Référence', 'Type', 'Description', 'Contrepartie', 'Débit', 'Crédit', 'Frais', 'Solde',
+]
+
+TYPE_LABELS = dict(TypeTransaction.choices)
+
+
+class Echo:
+    # Pseudo-fichier pour csv.writer : write() renvoie la ligne formatée au lieu de l'écrire
+    def write(self, value):
+        return value
+
+
+class StatementService:
+    # Service des relevés de compte (export CSV en flux)
+
+    @staticmethod
+    def _movements(account):
+        # Mouvements réussis du compte et leur effet signé sur son solde.
+        # Les frais envoyés sont exclus : ils sont déjà compris dans le montant du retrait.
+        delta = Case(
+            When(receiver_account=account, then=F('amount')),
+            When(sender_account=account, then=-F('amount')),
+            default=Value(0),
+            output_field=BigIntegerField()
+        )
+        return Transaction.objects.filter(
+            Q(sender_account=account) | Q(receiver_account=account),
+            status=TransactionStatus.SUCCESS
+        ).exclude(
+            type=TypeTransaction.FEE,
+            sender_account=account
+        ).annotate(delta=delta)
+
+    @staticmethod
+    def get_opening_balance(account, date_from):
+        # Solde à l'ouverture de date_from : somme des mouvements antérieurs (une agrégation)
+        start, _ = day_bounds(date_from, date_from)
+        return StatementService._movements(account).filter(created_at__lt=start).aggregate(
+            total=Coalesce(Sum('delta'), 0)
+        )['total']
+
+    @staticmethod
+    def get_statement_rows(account, date_from=None, date_to=None):
+        # Lignes du relevé dans l'ordre chronologique, solde progressif calculé par la base
+        movements = StatementService._movements(account)
+        if date_from and date_to:
+            start, end = day_bounds(date_from, date_to)
+            movements = movements.filter(created_at__gte=start, created_at__lt=end)
+
+        ordering = (F('created_at').asc(), F('id').asc())
+        return movements.annotate(
+            running_balance=Window(Sum('delta'), order_by=ordering, frame=RowRange(start=None, end=0))
+        ).order_by(*ordering).values_list(
+            'created_at', 'reference', 'type', 'description',
+            'sender_account_id', 'sender_account__user__email',
+            'receiver_account_id', 'receiver_account__user__email',
+            'delta', 'fee', 'running_balance',
+        )
+
+    @staticmethod
+    def iter_csv(account, date_from=None, date_to=None, chunk_size=None):
+        # Relevé CSV ligne par ligne (générateur) : l'historique n'est jamais chargé en entier
+        chunk_size = chunk_size or settings.STATEMENT_CHUNK_SIZE
+        writer = csv.writer(Echo())
+        yield writer.writerow(STATEMENT_HEADER)
+
+        opening = 0
+        if date_from and date_to:
+            opening = StatementService.get_opening_balance(account, date_from)
+            yield writer.writerow([date_from.isoformat(), '', '', "Solde d'ouverture", '', '', '', '', opening])
+
+        rows = StatementService.get_statement_rows(account, date_from, date_to).iterator(chunk_size=chunk_size)
+        for (created_at, reference, txn_type, description, sender_id, sender_email,
+             receiver_id, receiver_email, delta, fee, running_balance) in rows:
+            if delta < 0:
+                counterparty = receiver_email if receiver_id != account.id else ''
+            else:
+                counterparty = sender_email if sender_id != account.id else ''
+            yield writer.writerow([
+                timezone.localtime(created_at).strftime('%Y-%m-%d %H:%M:%S'),
+                reference,
+                TYPE_LABELS.get(txn_type, txn_type),
+                description,
+                counterparty or '',
+                -delta if delta < 0 else '',
+                delta if delta > 0 else '',
+                fee or '',
+                opening + running_balance,
+            ])
+
+        logger.info(f"Relevé exporté - Compte: {account.id}")
@@ -0,0 +1,472 @@
+# Service des statistiques agrégées
+# Les cumuls sont mis à jour dans le bloc atomique de chaque opération réussie :
+# les pages de statistiques lisent quelques lignes au lieu de parcourir les transactions
+
+import logging
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.db.models import F, Q, Sum, Count, Case, When, Value, BigIntegerField
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from money_transfer.models import (
+    User, Transaction, AccountMonthlyStats, PlatformCounter, HourlyTransactionStats, DailyTransactionStats
+)
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from .lock_service import AccountLockService, retry_on_conflict
+
+logger = logging.getLogger('money_transfer')
+
+# Taille des paquets pour les mises à jour ensemblistes des cumuls
+STATS_BATCH_SIZE = 500
+
+# (type, côté du compte) -> préfixe des colonnes de AccountMonthlyStats.
+# Un dépôt (émetteur = récepteur) n'est compté qu'une fois, côté émetteur.
+ACCOUNT_COLUMNS = {
+    (TypeTransaction.DEPOSIT, 'sender'): 'deposits',
+    (TypeTransaction.WITHDRAWAL, 'sender'): 'withdrawals',
+    (TypeTransaction.TRANSFER, 'sender'): 'transfers_sent',
+    (TypeTransaction.TRANSFER, 'receiver'): 'transfers_received',
+}
+
+
+# Granularité -> (table de cumul, champ de la tranche)
+ROLLUP_MODELS = {
+    'hour': (HourlyTransactionStats, 'hour'),
+    'day': (DailyTransactionStats, 'day'),
+}
+
+# Noms des compteurs globaux de la plateforme
+USERS_COUNTER = 'users'
+TRANSACTIONS_COUNTER = 'transactions'
+VOLUME_COUNTER = 'volume'
+FEES_COUNTER = 'fees'
+DAY_COUNTER_PREFIX = 'transactions.day.'
+
+
+def counter_shard(key):
+    # Un seul fragment par opération : toutes les lignes qu'elle touche (compteurs, cumuls
+    # horaires et journaliers) sont dans le même fragment, verrouillées dans l'ordre de l'index
+    return (key or 0) % max(1, getattr(settings, 'PLATFORM_COUNTER_SHARDS', 1))
+
+
+def user_status_counter(status):
+    return f'{USERS_COUNTER}.status.{status}'
+
+
+def day_counter(day):
+    return f'{DAY_COUNTER_PREFIX}{day.isoformat()}'
+
+
+def transaction_counters(txn):
+    # Incréments des compteurs globaux pour une transaction
+    values = Counter({
+        TRANSACTIONS_COUNTER: 1,
+        f'{TRANSACTIONS_COUNTER}.status.{txn.status}': 1,
+        f'{TRANSACTIONS_COUNTER}.type.{txn.type}': 1,
+        day_counter(timezone.localtime(txn.created_at).date()): 1,
+    })
+    if txn.status == TransactionStatus.SUCCESS:
+        values[VOLUME_COUNTER] += txn.amount
+        if txn.type == TypeTransaction.FEE:
+            values[FEES_COUNTER] += txn.amount
+    return values
+
+
+def day_bounds(date_from, date_to):
+    # [début de date_from, début du lendemain de date_to[ en datetimes conscients du fuseau
+    return (
+        timezone.make_aware(datetime.combine(date_from, time.min)),
+        timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min)),
+    )
+
+
+def month_start(value):
+    # Premier jour du mois (heure locale) d'une date ou d'un datetime
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date()
+    return value.replace(day=1)
+
+
+def month_bounds(month):
+    # [début, fin[ du mois en datetimes conscients du fuseau
+    start = month_start(month)
+    end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return (
+        timezone.make_aware(datetime.combine(start, time.min)),
+        timezone.make_aware(datetime.combine(end, time.min)),
+    )
+
+
+class StatsService:
+    # Service centralisé pour les tables de cumul
+
+    @staticmethod
+    def record_transactions(transactions):
+        # Ajoute des transactions aux cumuls mensuels des comptes et aux compteurs de la plateforme
+        StatsService.record_account_transactions(transactions)
+        StatsService.record_platform_transactions(transactions)
+
+    @staticmethod
+    def record_account_transactions(transactions):
+        # Ajoute des transactions réussies aux cumuls mensuels des comptes concernés.
+        # Appelé sous le verrou des comptes : pas de course entre deux écritures d'un même compte.
+        deltas = defaultdict(Counter)
+        for txn in transactions:
+            if txn.status != TransactionStatus.SUCCESS:
+                continue
+            month = month_start(txn.created_at)
+            for side in ('sender', 'receiver'):
+                prefix = ACCOUNT_COLUMNS.get((txn.type, side))
+                account_id = getattr(txn, f'{side}_account_id')
+                if prefix and account_id:
+                    delta = deltas[(account_id, month)]
+                    delta[f'{prefix}_total'] += txn.amount
+                    delta[f'{prefix}_count'] += 1
+
+        # Mois sans ligne (historique antérieur aux cumuls, ligne purgée) : la ligne est créée
+        # depuis l'agrégat des transactions, qui comprend déjà celles de l'opération en cours
+        StatsService._increment_many(
+            AccountMonthlyStats, ('account_id', 'month'), deltas, seed=StatsService._seed_account_months
+        )
+
+    @staticmethod
+    def record_platform_transactions(transactions):
+        # Compteurs globaux (tous statuts confondus, comme les requêtes qu'ils remplacent)
+        if not transactions:
+            return
+        shard = counter_shard(transactions[0].sender_account_id)
+        values = Counter()
+        hourly = defaultdict(Counter)
+        daily = defaultdict(Counter)
+        for txn in transactions:
+            values.update(transaction_counters(txn))
+
+            # Cumuls horaires et journaliers (heure locale) par type et statut
+            created_at = timezone.localtime(txn.created_at)
+            rollup = {'count': 1, 'volume': txn.amount, 'fees': txn.fee}
+            hourly[(created_at.replace(minute=0, second=0, microsecond=0), txn.type, txn.status, shard)].update(rollup)
+            daily[(created_at.date(), txn.type, txn.status, shard)].update(rollup)
+
+        StatsService._add_to_counters(values, shard)
+        StatsService._increment_many(HourlyTransactionStats, ('hour', 'type', 'status', 'shard'), hourly)
+        StatsService._increment_many(DailyTransactionStats, ('day', 'type', 'status', 'shard'), daily)
+
+    @staticmethod
+    def record_user_created(user):
+        StatsService._add_to_counters(
+            Counter({USERS_COUNTER: 1, user_status_counter(user.status): 1}),
+            counter_shard(user.id)
+        )
+
+    @staticmethod
+    def record_user_status_change(user, old_status):
+        if old_status == user.status:
+            return
+        StatsService._add_to_counters(
+            Counter({user_status_counter(old_status): -1, user_status_counter(user.status): 1}),
+            counter_shard(user.id)
+        )
+
+    @staticmethod
+    def get_platform_counters(day=None):
+        # Valeur de chaque compteur (somme de ses fragments) en une requête ;
+        # parmi les compteurs journaliers, seul celui de `day` (aujourd'hui par défaut) est lu
+        today_counter = day_counter(day or timezone.localdate())
+        rows = PlatformCounter.objects.filter(
+            ~Q(name__startswith=DAY_COUNTER_PREFIX) | Q(name=today_counter)
+        ).values('name').annotate(total=Sum('value'))
+
+        counters = defaultdict(int)
+        for row in rows:
+            counters[row['name']] = row['total']
+        counters['transactions_today'] = counters.pop(today_counter, 0)
+        return counters
+
+    @staticmethod
+    @transaction.atomic
+    def reconcile_platform_counters():
+        # Recalcule tous les compteurs depuis les tables sources et retourne {nom: (avant, après)}.
+        # Les lignes existantes sont verrouillées d'abord : les écritures concurrentes attendent
+        # la fin de la reconstruction et s'ajoutent ensuite aux valeurs recalculées.
+        list(PlatformCounter.objects.select_for_update().values_list('pk', flat=True))
+        before = dict(
+            PlatformCounter.objects.values_list('name').annotate(total=Sum('value')).values_list('name', 'total')
+        )
+
+        after = Counter()
+        for row in User.objects.values('status').annotate(count=Count('id')):
+            after[USERS_COUNTER] += row['count']
+            after[user_status_counter(row['status'])] += row['count']
+
+        transactions = Transaction.objects.all()
+        for row in transactions.values('type', 'status').annotate(count=Count('id'), total=Sum('amount')):
+            after[TRANSACTIONS_COUNTER] += row['count']
+            after[f'{TRANSACTIONS_COUNTER}.status.{row["status"]}'] += row['count']
+            after[f'{TRANSACTIONS_COUNTER}.type.{row["type"]}'] += row['count']
+            if row['status'] == TransactionStatus.SUCCESS:
+                after[VOLUME_COUNTER] += row['total']
+                if row['type'] == TypeTransaction.FEE:
+                    after[FEES_COUNTER] += row['total']
+        for row in transactions.annotate(day=TruncDate('created_at')).values('day').annotate(count=Count('id')):
+            after[day_counter(row['day'])] += row['count']
+
+        PlatformCounter.objects.all().delete()
+        PlatformCounter.objects.bulk_create(
+            [PlatformCounter(name=name, shard=0, value=value) for name, value in after.items()],
+            batch_size=STATS_BATCH_SIZE
+        )
+
+        logger.info(f"Compteurs de la plateforme recalculés : {len(after)} compteurs")
+        return {
+            name: (before.get(name, 0), after.get(name, 0))
+            for name in sorted(set(before) | set(after))
+        }
+
+    @staticmethod
+    def _add_to_counters(values, shard):
+        deltas = {
+            (name, shard): Counter({'value': value})
+            for name, value in values.items()
+            if value
+        }
+        StatsService._increment_many(PlatformCounter, ('name', 'shard'), deltas)
+
+    @staticmethod
+    def get_transaction_series(date_from, date_to, granularity='day', status=TransactionStatus.SUCCESS):
+        # Série temporelle [date_from, date_to] (jours inclus) par tranche et par type,
+        # lue uniquement dans les cumuls : une requête sur l'index (tranche, type, statut, fragment)
+        model, field = ROLLUP_MODELS[granularity]
+        start, end = day_bounds(date_from, date_to)
+        if granularity == 'day':
+            start, end = start.date(), end.date()
+
+        rows = model.objects.filter(
+            **{f'{field}__gte': start, f'{field}__lt': end},
+            status=status
+        ).values(field, 'type').annotate(
+            count_total=Sum('count'),
+            volume_total=Sum('volume'),
+            fees_total=Sum('fees')
+        ).order_by(field, 'type')
+
+        return [
+            {
+                'bucket': row[field],
+                'type': row['type'],
+                'count': row['count_total'],
+                'volume': row['volume_total'],
+                'fees': row['fees_total'],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_transaction_rollups(date_from=None, date_to=None):
+        # Recalcule les cumuls horaires et journaliers (tout l'historique par défaut).
+        # Mêmes précautions que reconcile_platform_counters : lignes verrouillées d'abord.
+        transactions = Transaction.objects.all()
+        if date_from and date_to:
+            start, end = day_bounds(date_from, date_to)
+            transactions = transactions.filter(created_at__gte=start, created_at__lt=end)
+            ranges = {'hour': (start, end), 'day': (start.date(), end.date())}
+        else:
+            ranges = {}
+
+        created = 0
+        for granularity, (model, field) in ROLLUP_MODELS.items():
+            rollups = model.objects.all()
+            if ranges:
+                rollups = rollups.filter(**{f'{field}__gte': ranges[granularity][0], f'{field}__lt': ranges[granularity][1]})
+            list(rollups.select_for_update().values_list('pk', flat=True))
+            rollups.delete()
+
+            trunc = TruncHour('created_at') if granularity == 'hour' else TruncDate('created_at')
+            rows = transactions.annotate(bucket=trunc).values('bucket', 'type', 'status').annotate(
+                count_total=Count('id'),
+                volume_total=Sum('amount'),
+                fees_total=Sum('fee')
+            ).order_by()
+            objs = model.objects.bulk_create(
+                [
+                    model(**{
+                        field: row['bucket'],
+                        'type': row['type'],
+                        'status': row['status'],
+                        'shard': 0,
+                        'count': row['count_total'],
+                        'volume': row['volume_total'],
+                        'fees': row['fees_total'],
+                    })
+                    for row in rows
+                ],
+                batch_size=STATS_BATCH_SIZE
+            )
+            created += len(objs)
+
+        logger.info(f"Cumuls horaires et journaliers reconstruits : {created} lignes")
+        return created
+
+    @staticmethod
+    def get_account_month(account, month=None):
+        # Cumul du mois (mois courant par défaut). Sans ligne en base : agrégat calculé
+        # à la volée, sans écriture (lecture seule) ; le prochain mouvement créera la ligne.
+        month = month_start(month or timezone.localdate())
+        stats = AccountMonthlyStats.objects.filter(account=account, month=month).first()
+        if stats is None:
+            values = StatsService.compute_account_months(month, [account.id])[account.id]
+            stats = AccountMonthlyStats(account=account, month=month, **values)
+        return stats
+
+    @staticmethod
+    def compute_account_months(month, account_ids=None):
+        # {account_id: colonnes du cumul} d'un mois, calculé depuis les transactions réussies
+        # en deux requêtes groupées (côté émetteur, côté récepteur), quel que soit le nombre
+        # de comptes. Sans `account_ids` : tous les comptes ayant des mouvements dans le mois.
+        start, end = month_bounds(month)
+        columns = [f'{prefix}_{suffix}' for prefix in ACCOUNT_COLUMNS.values() for suffix in ('total', 'count')]
+        values = {account_id: dict.fromkeys(columns, 0) for account_id in account_ids or ()}
+
+        for side in ('sender', 'receiver'):
+            field = f'{side}_account_id'
+            rows = Transaction.objects.filter(
+                status=TransactionStatus.SUCCESS,
+                type__in=[txn_type for (txn_type, column_side) in ACCOUNT_COLUMNS if column_side == side],
+                created_at__gte=start,
+                created_at__lt=end
+            )
+            if account_ids is not None:
+                rows = rows.filter(**{f'{field}__in': account_ids})
+            rows = rows.values(field, 'type').annotate(total=Sum('amount'), count=Count('id')).order_by()
+            for row in rows:
+                prefix = ACCOUNT_COLUMNS[(row['type'], side)]
+                account_values = values.setdefault(row[field], dict.fromkeys(columns, 0))
+                account_values[f'{prefix}_total'] = row['total']
+                account_values[f'{prefix}_count'] = row['count']
+        return values
+
+    @staticmethod
+    @retry_on_conflict
+    @transaction.atomic
+    def rebuild_account_month(account, month):
+        # Recalcule un mois depuis les transactions.
+        # Le verrou du compte sérialise la reconstruction avec les mouvements en cours.
+        month = month_start(month)
+        AccountLockService.lock_accounts(account)
+
+        values = StatsService.compute_account_months(month, [account.id])[account.id]
+        stats, _ = AccountMonthlyStats.objects.update_or_create(
+            account=account,
+            month=month,
+            defaults=values
+        )
+        logger.info(f"Statistiques mensuelles reconstruites - Compte: {account.id} - Mois: {month:%m/%Y}")
+        return stats
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild_account_months(date_from, date_to):
+        # Recalcule les cumuls mensuels de tous les comptes pour les mois couvrant [date_from, date_to] :
+        # deux requêtes groupées et un bulk_create par mois, quel que soit le nombre de comptes.
+        # Mêmes précautions que rebuild_transaction_rollups : lignes verrouillées d'abord.
+        month, last = month_start(date_from), month_start(date_to)
+        created = 0
+        while month <= last:
+            rows = AccountMonthlyStats.objects.filter(month=month)
+            list(rows.select_for_update().values_list('pk', flat=True))
+            rows.delete()
+
+            objs = AccountMonthlyStats.objects.bulk_create(
+                [
+                    AccountMonthlyStats(account_id=account_id, month=month, **values)
+                    for account_id, values in StatsService.compute_account_months(month).items()
+                ],
+                batch_size=STATS_BATCH_SIZE
+            )
+            created += len(objs)
+            month = (month + timedelta(days=32)).replace(day=1)
+
+        logger.info(f"Cumuls mensuels des comptes reconstruits : {created} lignes")
+        return created
+
+    @staticmethod
+    def _seed_account_months(keys):
+        # Valeurs initiales des lignes (account_id, month) manquantes : agrégat complet du mois
+        by_month = defaultdict(list)
+        for account_id, month in keys:
+            by_month[month].append(account_id)
+
+        seeded = {}
+        for month, account_ids in by_month.items():
+            for account_id, values in StatsService.compute_account_months(month, account_ids).items():
+                seeded[(account_id, month)] = values
+        return seeded
+
+    @staticmethod
+    def _increment_many(model, key_fields, deltas, seed=None):
+        # Applique {clé: delta} en un nombre de requêtes indépendant du nombre de clés.
+        # En régime établi (lignes existantes) : un seul UPDATE ... CASE par paquet.
+        # Sinon : lecture des clés existantes puis bulk_create des lignes manquantes,
+        # initialisées avec le delta ou avec seed(clés manquantes) -> {clé: valeurs}.
+        if not deltas:
+            return
+
+        conditions = {key: Q(**dict(zip(key_fields, key))) for key in deltas}
+        keys = list(deltas)
+        columns = {column for delta in deltas.values() for column in delta}
+
+        updated = 0
+        for start in range(0, len(keys), STATS_BATCH_SIZE):
+            chunk = keys[start:start + STATS_BATCH_SIZE]
+            updated += model.objects.filter(reduce(or_, (conditions[key] for key in chunk))).update(**{
+                column: F(column) + Case(
+                    *[When(conditions[key], then=Value(deltas[key][column])) for key in chunk if deltas[key][column]],
+                    default=Value(0),
+                    output_field=BigIntegerField(),
+                )
+                for column in columns
+            })
+        if updated == len(keys):
+            return
+
+        existing = set()
+        for start in range(0, len(keys), STATS_BATCH_SIZE):
+            chunk = keys[start:start + STATS_BATCH_SIZE]
+            existing.update(
+                model.objects.filter(reduce(or_, (conditions[key] for key in chunk))).values_list(*key_fields)
+            )
+
+        missing = [key for key in keys if key not in existing]
+        initial = seed(missing) if seed else deltas
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    [model(**dict(zip(key_fields, key)), **initial[key]) for key in missing],
+                    batch_size=STATS_BATCH_SIZE
+                )
+        except IntegrityError:
+            # Ligne(s) créée(s) entre-temps par une écriture concurrente : repli ligne à ligne.
+            # Le delta ne s'ajoute qu'aux lignes créées par l'autre écriture ; les autres
+            # sont insérées avec leurs valeurs initiales.
+            for key in missing:
+                StatsService._increment(model, dict(zip(key_fields, key)), deltas[key], initial[key])
+
+    @staticmethod
+    def _increment(model, key, delta, initial=None):
+        # UPDATE colonne = colonne + delta ; INSERT (valeurs initiales, le delta par défaut)
+        # si la ligne n'existe pas encore
+        updates = {column: F(column) + value for column, value in delta.items()}
+        if model.objects.filter(**key).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**key, **(initial or delta))
+        except IntegrityError:
+            # Ligne créée entre-temps par une écriture concurrente
+            model.objects.filter(**key).update(**updates)
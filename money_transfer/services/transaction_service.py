@@ -2,21 +2,34 @@
 Service de gestion des transactions
 Dépôt, Retrait, Transfert - Logique atomique et sécurisée
 """
+import heapq
 import logging
+from collections import defaultdict
+from itertools import islice
 from decimal import Decimal
-from django.db import transaction
-from django.db.models import F
+from django.db import transaction, connection, DatabaseError
+from django.db.models import F, Q, Case, When, Value, BigIntegerField
 from money_transfer.models import Transaction, VirtualAccount, User, Platform
 from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from money_transfer.pagination import keyset_filter
 from .account_service import AccountService
+from .lock_service import AccountLockService, retry_on_conflict
+from .idempotency_service import idempotent
+from .platform_service import PlatformConfigService
+from .stats_service import StatsService
 
 logger = logging.getLogger('money_transfer')
 
+# Taille des paquets pour les écritures en masse (bulk_create, UPDATE ... CASE)
+BULK_BATCH_SIZE = 500
+
 
 class TransactionService:
     # Service centralisé pour toutes les opérations financières
     
     @staticmethod
+    @retry_on_conflict
+    @idempotent(TypeTransaction.DEPOSIT)
     @transaction.atomic
     def deposit(user, amount):
    
@@ -28,32 +41,27 @@ class TransactionService:
         if not can_transact:
             return False, error_msg, None
         
+        account = user.virtual_account
+        AccountLockService.lock_accounts(account)
+        
+        txn_fields = dict(
+            type=TypeTransaction.DEPOSIT,
+            amount=amount,
+            fee=0,  # Pas de frais sur dépôt
+            net_amount=amount,
+            sender_account=account,
+            receiver_account=account,
+            description=f"Dépôt de {amount} sur le compte"
+        )
+        
         try:
-            account = user.virtual_account
-            
-            # Créer la transaction
-            txn = Transaction.objects.create(
-                type=TypeTransaction.DEPOSIT,
-                status=TransactionStatus.PENDING,
-                amount=amount,
-                fee=0,  # Pas de frais sur dépôt
-                net_amount=amount,
-                sender_account=account,
-                receiver_account=account,
-                description=f"Dépôt de {amount} sur le compte"
-            )
-            
-            # Mettre à jour le solde
-            VirtualAccount.objects.filter(id=account.id).update(
-                balance=F('balance') + amount
-            )
-            
-            # Marquer la transaction comme réussie
-            txn.status = TransactionStatus.SUCCESS
-            txn.save(update_fields=['status'])
-            
-            # Recharger le compte pour avoir le solde à jour
-            account.refresh_from_db()
+            with transaction.atomic():
+                # Mettre à jour le solde (le nouveau solde est renvoyé, pas de relecture)
+                AccountService.credit(account, amount)
+                
+                # Opération synchrone : la transaction est insérée directement réussie
+                txn = Transaction.objects.create(status=TransactionStatus.SUCCESS, **txn_fields)
+                TransactionService._after_success([txn])
             
             logger.info(
                 f"Dépôt réussi - User: {user.email} - Montant: {amount} - "
@@ -63,13 +71,14 @@ class TransactionService:
             return True, f" Dépôt de {amount} effectué avec succès !", txn
             
         except Exception as e:
+            TransactionService._raise_if_retryable(e)
             logger.error(f"Erreur lors du dépôt pour {user.email}: {str(e)}")
-            if 'txn' in locals():
-                txn.status = TransactionStatus.FAILED
-                txn.save(update_fields=['status'])
+            TransactionService._record_failure(txn_fields)
             return False, " Une erreur est survenue lors du dépôt.", None
     
     @staticmethod
+    @retry_on_conflict
+    @idempotent(TypeTransaction.WITHDRAWAL)
     @transaction.atomic
     def withdraw(user, amount):
        
@@ -81,65 +90,55 @@ class TransactionService:
         if not can_transact:
             return False, error_msg, None
         
+        account = user.virtual_account
+        # Configuration en cache : aucune lecture de Platform en régime établi
+        platform = PlatformConfigService.get_platform()
+        platform_account = PlatformConfigService.get_fee_account(account)
+        
+        # Verrous par id croissant, sous-compte de frais de la plateforme compris
+        locked = AccountLockService.lock_accounts(account, platform_account)
+        
+        # Calculer les frais
+        fee = platform.calculate_withdrawal_fee(amount)
+        net_amount = amount - fee
+        total_to_deduct = amount  
+        
+        txn_fields = dict(
+            type=TypeTransaction.WITHDRAWAL,
+            amount=amount,
+            fee=fee,
+            net_amount=net_amount,
+            sender_account=account,
+            receiver_account=None,  # Retrait = sortie du système
+            description=f"Retrait de {amount} (Frais: {fee}, Net: {net_amount})"
+        )
+        
         try:
-            account = user.virtual_account
-            platform_account = AccountService.get_or_create_platform_account()
-            platform = platform_account.platform
-            
-            # Calculer les frais
-            fee = platform.calculate_withdrawal_fee(amount)
-            net_amount = amount - fee
-            total_to_deduct = amount  
-            
-            # Vérifier le solde
-            has_balance, balance_msg = AccountService.check_sufficient_balance(
-                account, total_to_deduct
-            )
-            if not has_balance:
-                return False, balance_msg, None
-            
-            # Créer la transaction de retrait
-            withdrawal_txn = Transaction.objects.create(
-                type=TypeTransaction.WITHDRAWAL,
-                status=TransactionStatus.PENDING,
-                amount=amount,
-                fee=fee,
-                net_amount=net_amount,
-                sender_account=account,
-                receiver_account=None,  # Retrait = sortie du système
-                description=f"Retrait de {amount} (Frais: {fee}, Net: {net_amount})"
-            )
-            
-            # Déduire le montant du compte utilisateur
-            VirtualAccount.objects.filter(id=account.id).update(
-                balance=F('balance') - total_to_deduct
-            )
-            
-            # Créer une transaction de frais vers la plateforme
-            if fee > 0:
-                fee_txn = Transaction.objects.create(
-                    type=TypeTransaction.FEE,
-                    status=TransactionStatus.SUCCESS,
-                    amount=fee,
-                    fee=0,
-                    net_amount=fee,
-                    sender_account=account,
-                    receiver_account=platform_account,
-                    description=f"Frais de retrait ({platform.withdrawal_fee_rate}%)"
-                )
+            with transaction.atomic():
+                # Débit conditionnel : échoue sans rien écrire si le solde est insuffisant
+                if AccountService.debit(account, total_to_deduct) is None:
+                    return False, f" Solde insuffisant. Solde actuel : {locked[account.id].balance}", None
                 
-                # Créditer le compte plateforme
-                VirtualAccount.objects.filter(id=platform_account.id).update(
-                    balance=F('balance') + fee
-                )
-            
-            # Marquer la transaction comme réussie
-            withdrawal_txn.status = TransactionStatus.SUCCESS
-            withdrawal_txn.save(update_fields=['status'])
-            
-            # Recharger les comptes
-            account.refresh_from_db()
-            platform_account.refresh_from_db()
+                # Opération synchrone : la transaction est insérée directement réussie
+                withdrawal_txn = Transaction.objects.create(status=TransactionStatus.SUCCESS, **txn_fields)
+                
+                # Créer une transaction de frais vers la plateforme
+                if fee > 0:
+                    fee_txn = Transaction.objects.create(
+                        type=TypeTransaction.FEE,
+                        status=TransactionStatus.SUCCESS,
+                        amount=fee,
+                        fee=0,
+                        net_amount=fee,
+                        sender_account=account,
+                        receiver_account=platform_account,
+                        description=f"Frais de retrait ({platform.withdrawal_fee_rate}%)"
+                    )
+                    
+                    # Créditer le compte plateforme
+                    AccountService.credit(platform_account, fee)
+                
+                TransactionService._after_success([withdrawal_txn] + ([fee_txn] if fee > 0 else []))
             
             logger.info(
                 f"Retrait réussi - User: {user.email} - Montant: {amount} - "
@@ -154,13 +153,14 @@ class TransactionService:
             ), withdrawal_txn
             
         except Exception as e:
+            TransactionService._raise_if_retryable(e)
             logger.error(f"Erreur lors du retrait pour {user.email}: {str(e)}")
-            if 'withdrawal_txn' in locals():
-                withdrawal_txn.status = TransactionStatus.FAILED
-                withdrawal_txn.save(update_fields=['status'])
+            TransactionService._record_failure(txn_fields)
             return False, " Une erreur est survenue lors du retrait.", None
     
     @staticmethod
+    @retry_on_conflict
+    @idempotent(TypeTransaction.TRANSFER)
     @transaction.atomic
     def transfer(sender_user, receiver_email, amount):
       
@@ -188,46 +188,34 @@ class TransactionService:
         if not can_receive:
             return False, f" Le destinataire ne peut pas recevoir : {receive_error}", None
         
+        sender_account = sender_user.virtual_account
+        receiver_account = receiver_user.virtual_account
+        
+        # Verrous par id croissant : A→B et B→A simultanés ne peuvent pas s'interbloquer
+        locked = AccountLockService.lock_accounts(sender_account, receiver_account)
+        
+        txn_fields = dict(
+            type=TypeTransaction.TRANSFER,
+            amount=amount,
+            fee=0,  # Pas de frais sur transfert
+            net_amount=amount,
+            sender_account=sender_account,
+            receiver_account=receiver_account,
+            description=f"Transfert de {sender_user.email} vers {receiver_user.email}"
+        )
+        
         try:
-            sender_account = sender_user.virtual_account
-            receiver_account = receiver_user.virtual_account
-            
-            # Vérifier le solde
-            has_balance, balance_msg = AccountService.check_sufficient_balance(
-                sender_account, amount
-            )
-            if not has_balance:
-                return False, balance_msg, None
-            
-            # Créer la transaction
-            transfer_txn = Transaction.objects.create(
-                type=TypeTransaction.TRANSFER,
-                status=TransactionStatus.PENDING,
-                amount=amount,
-                fee=0,  # Pas de frais sur transfert
-                net_amount=amount,
-                sender_account=sender_account,
-                receiver_account=receiver_account,
-                description=f"Transfert de {sender_user.email} vers {receiver_user.email}"
-            )
-            
-            # Déduire du compte envoyeur
-            VirtualAccount.objects.filter(id=sender_account.id).update(
-                balance=F('balance') - amount
-            )
-            
-            # Créditer le compte destinataire
-            VirtualAccount.objects.filter(id=receiver_account.id).update(
-                balance=F('balance') + amount
-            )
-            
-            # Marquer la transaction comme réussie
-            transfer_txn.status = TransactionStatus.SUCCESS
-            transfer_txn.save(update_fields=['status'])
-            
-            # Recharger les comptes
-            sender_account.refresh_from_db()
-            receiver_account.refresh_from_db()
+            with transaction.atomic():
+                # Débit conditionnel : échoue sans rien écrire si le solde est insuffisant
+                if AccountService.debit(sender_account, amount) is None:
+                    return False, f" Solde insuffisant. Solde actuel : {locked[sender_account.id].balance}", None
+                
+                # Créditer le compte destinataire
+                AccountService.credit(receiver_account, amount)
+                
+                # Opération synchrone : la transaction est insérée directement réussie
+                transfer_txn = Transaction.objects.create(status=TransactionStatus.SUCCESS, **txn_fields)
+                TransactionService._after_success([transfer_txn])
             
             logger.info(
                 f"Transfert réussi - De: {sender_user.email} - Vers: {receiver_user.email} - "
@@ -240,41 +228,242 @@ class TransactionService:
             ), transfer_txn
             
         except Exception as e:
+            TransactionService._raise_if_retryable(e)
             logger.error(
                 f"Erreur lors du transfert de {sender_user.email} vers {receiver_email}: {str(e)}"
             )
-            if 'transfer_txn' in locals():
-                transfer_txn.status = TransactionStatus.FAILED
-                transfer_txn.save(update_fields=['status'])
+            TransactionService._record_failure(txn_fields)
             return False, " Une erreur est survenue lors du transfert.", None
+
+    @staticmethod
+    @retry_on_conflict
+    @transaction.atomic
+    def bulk_transfer(sender_user, lines, batch_size=BULK_BATCH_SIZE):
+        # Transfert groupé (paie, décaissements) : lines = [(receiver_email, amount), ...]
+        # Un seul débit de l'envoyeur, crédits ensemblistes, transactions en bulk_create.
+        # Retourne (success, message, results) avec un résultat par ligne, dans l'ordre.
+
+        can_transact, error_msg = AccountService.can_perform_transaction(sender_user)
+        if not can_transact:
+            return False, error_msg, []
+
+        sender_account = sender_user.virtual_account
+
+        results = [
+            {
+                'line': index,
+                'receiver_email': (email or '').strip(),
+                'amount': amount,
+                'success': False,
+                'message': '',
+                'transaction': None,
+            }
+            for index, (email, amount) in enumerate(lines, start=1)
+        ]
+
+        if not results:
+            return False, " Aucune ligne à traiter.", results
+
+        # Résoudre tous les destinataires en une seule requête
+        emails = {result['receiver_email'] for result in results}
+        receivers = {
+            receiver.email: receiver
+            for receiver in User.objects.filter(email__in=emails).select_related('virtual_account')
+        }
+
+        # Verrous par id croissant sur l'envoyeur et tous les destinataires connus ;
+        # le solde verrouillé est à jour (pas l'objet en mémoire, potentiellement périmé)
+        locked = AccountLockService.lock_accounts(sender_account, *[
+            receiver.virtual_account
+            for receiver in receivers.values()
+            if hasattr(receiver, 'virtual_account')
+        ])
+        available = locked[sender_account.id].balance
+
+        accepted = []
+        total = 0
+        eligibility = {}
+
+        for result in results:
+            amount = result['amount']
+            receiver_user = receivers.get(result['receiver_email'])
+
+            if not isinstance(amount, int) or amount <= 0:
+                result['message'] = "Le montant doit être positif."
+                continue
+
+            if receiver_user is None:
+                result['message'] = f"Aucun utilisateur trouvé avec l'email : {result['receiver_email']}"
+                continue
+
+            if receiver_user.id == sender_user.id:
+                result['message'] = "Vous ne pouvez pas transférer à vous-même."
+                continue
+
+            if receiver_user.id not in eligibility:
+                eligibility[receiver_user.id] = AccountService.can_perform_transaction(receiver_user)
+            can_receive, receive_error = eligibility[receiver_user.id]
+            if not can_receive:
+                result['message'] = f"Le destinataire ne peut pas recevoir : {receive_error.strip()}"
+                continue
+
+            if total + amount > available:
+                result['message'] = f"Solde insuffisant. Solde restant : {available - total}"
+                continue
+
+            total += amount
+            result['receiver'] = receiver_user
+            accepted.append(result)
+
+        if not accepted:
+            return False, " Aucune ligne n'a pu être traitée.", results
+
+        # Débit unique de l'envoyeur, conditionné au solde
+        if AccountService.debit(sender_account, total) is None:
+            for result in accepted:
+                result.pop('receiver')
+                result['message'] = "Solde insuffisant."
+            return False, " Solde insuffisant pour le lot.", results
+
+        # Crédits ensemblistes : un UPDATE ... CASE par paquet de comptes
+        credits = defaultdict(int)
+        for result in accepted:
+            credits[result['receiver'].virtual_account.id] += result['amount']
+
+        account_ids = list(credits)
+        for start in range(0, len(account_ids), batch_size):
+            chunk = account_ids[start:start + batch_size]
+            VirtualAccount.objects.filter(id__in=chunk).update(
+                balance=F('balance') + Case(
+                    *[When(id=account_id, then=Value(credits[account_id])) for account_id in chunk],
+                    default=Value(0),
+                    output_field=BigIntegerField(),
+                )
+            )
+
+        # Écriture des transactions en masse (déjà réussies : tout est dans le même bloc atomique)
+        transactions = Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    type=TypeTransaction.TRANSFER,
+                    status=TransactionStatus.SUCCESS,
+                    amount=result['amount'],
+                    fee=0,
+                    net_amount=result['amount'],
+                    sender_account=sender_account,
+                    receiver_account=result['receiver'].virtual_account,
+                    description=f"Transfert de {sender_user.email} vers {result['receiver'].email}"
+                )
+                for result in accepted
+            ],
+            batch_size=batch_size,
+        )
+        TransactionService._after_success(transactions)
+
+        for result, txn in zip(accepted, transactions):
+            result.pop('receiver')
+            result['success'] = True
+            result['message'] = "Transfert effectué."
+            result['transaction'] = txn
+
+        logger.info(
+            f"Transfert groupé réussi - De: {sender_user.email} - Lignes: {len(accepted)}/{len(results)} - "
+            f"Montant total: {total} - Nouveau solde envoyeur: {sender_account.balance}"
+        )
+
+        return True, (
+            f" {len(accepted)} transfert(s) sur {len(results)} effectué(s) pour un total de {total}."
+        ), results
+
+    @staticmethod
+    def _after_success(transactions):
+        # Point unique de mise à jour des données dérivées (cumuls, caches) après des
+        # mouvements réussis ; exécuté dans le bloc atomique de l'opération
+        StatsService.record_transactions(transactions)
+        AccountService.invalidate_account_caches({
+            account_id
+            for txn in transactions
+            for account_id in (txn.sender_account_id, txn.receiver_account_id)
+        })
+
+    @staticmethod
+    def _raise_if_retryable(error):
+        # Interblocage, conflit de sérialisation, délai de verrou : la transaction entière
+        # doit être rejouée par retry_on_conflict, pas enregistrée comme un échec
+        if isinstance(error, DatabaseError) and AccountLockService.is_retryable(error):
+            raise error
     
     @staticmethod
-    def get_user_transactions(user, limit=50):
+    def _record_failure(txn_fields):
+        # Trace d'une opération en échec, insérée directement dans son état final.
+        # Les mouvements de solde ont été annulés par le point de sauvegarde.
+        # PENDING reste réservé aux flux réellement asynchrones (voir Transaction.transition).
+        txn = Transaction.objects.create(status=TransactionStatus.FAILED, **txn_fields)
+        StatsService.record_platform_transactions([txn])
+        return txn
+
+    @staticmethod
+    def get_user_transactions(user, limit=50, cursor=None, transaction_type=None, status=None):
+        # Historique du compte, du plus récent au plus ancien.
+        # `cursor` : (created_at, id) de la dernière transaction de la page précédente.
+        # Avec `limit` : liste (même type quelle que soit la base) ; sans : QuerySet paresseux.
        
         if not hasattr(user, 'virtual_account') or not user.virtual_account:
-            return Transaction.objects.none()
-        
-        account = user.virtual_account
+            return Transaction.objects.none() if limit is None else []
         
-        # Récupérer toutes les transactions où l'utilisateur est impliqué
-        transactions = Transaction.objects.filter(
-            sender_account=account
-        ) | Transaction.objects.filter(
-            receiver_account=account
+        sent, received = TransactionService._history_sides(
+            user.virtual_account, cursor, transaction_type, status
         )
+        ordering = ('-created_at', '-id')
+        
+        if limit is None:
+            return sent.order_by().union(received.order_by(), all=True).order_by(*ordering)
         
-        transactions = transactions.distinct().order_by('-created_at')
+        if connection.features.supports_slicing_ordering_in_compound:
+            # Une seule requête : chaque moitié est limitée sur son index avant la fusion
+            return list(sent[:limit].union(received[:limit], all=True).order_by(*ordering)[:limit])
         
-        # Appliquer la limite si spécifiée
-        if limit is not None:
-            transactions = transactions[:limit]
+        # Sans LIMIT dans un UNION (SQLite) : deux petites listes triées fusionnées en mémoire
+        merged = heapq.merge(
+            sent[:limit],
+            received[:limit],
+            key=lambda txn: (txn.created_at, txn.id),
+            reverse=True
+        )
+        return list(islice(merged, limit))
+    
+    @staticmethod
+    def _history_sides(account, cursor=None, transaction_type=None, status=None):
+        # Les deux moitiés de l'historique, chacune servie par son index (compte, created_at, id).
+        # Un dépôt est la seule opération où émetteur = récepteur : exclu côté récepteur
+        # (index partiel), il n'apparaît qu'une fois sans DISTINCT.
+        filters = Q()
+        if transaction_type:
+            filters &= Q(type=transaction_type)
+        if status:
+            filters &= Q(status=status)
+        if cursor is not None:
+            filters &= keyset_filter(cursor)
         
-        return transactions
+        sides = (
+            Transaction.objects.filter(sender_account=account),
+            Transaction.objects.filter(receiver_account=account).exclude(type=TypeTransaction.DEPOSIT),
+        )
+        return [
+            side.filter(filters).select_related(
+                'sender_account__user',
+                'receiver_account__user'
+            ).order_by('-created_at', '-id')
+            for side in sides
+        ]
     
     @staticmethod
     def get_transaction_by_reference(reference):
       
         try:
-            return Transaction.objects.get(reference=reference)
+            return Transaction.objects.select_related(
+                'sender_account__user',
+                'receiver_account__user'
+            ).get(reference=reference)
         except Transaction.DoesNotExist:
             return None
\ No newline at end of file
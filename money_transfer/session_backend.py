@@ -0,0 +1,65 @@
+"""
+Moteur de sessions à écritures réduites (SESSION_ENGINE = 'money_transfer.session_backend')
+
+Expiration glissante conservée, mais une session seulement lue n'est réécrite en base que
+lorsque sa durée restante passe sous SESSION_REFRESH_THRESHOLD. Les lectures passent par
+le cache partagé (SESSION_WRITE_CACHE), qui garde aussi la date d'expiration enregistrée.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.utils import timezone
+
+logger = logging.getLogger('money_transfer')
+
+KEY_PREFIX = 'money_transfer.session.'
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        # Horodatage de l'expiration enregistrée en base (None : inconnue ou session nouvelle)
+        self._stored_expiry = None
+
+    def load(self):
+        entry = None
+        if settings.SESSION_WRITE_CACHE:
+            try:
+                entry = self._cache.get(self.cache_key)
+            except Exception:
+                entry = None
+
+        if entry is None:
+            s = self._get_session_from_db()
+            if not s:
+                return {}
+            entry = {'data': self.decode(s.session_data), 'expires_at': s.expire_date.timestamp()}
+            self._cache_entry(entry)
+
+        self._stored_expiry = entry['expires_at']
+        return entry['data']
+
+    def save(self, must_create=False):
+        if not must_create and not self.modified and self.session_key:
+            # Session seulement lue : chargée (depuis le cache) pour connaître son expiration
+            self._get_session()
+            remaining = (self._stored_expiry or 0) - timezone.now().timestamp()
+            if remaining > settings.SESSION_REFRESH_THRESHOLD:
+                return
+
+        DBStore.save(self, must_create)
+        self._stored_expiry = self.get_expiry_date().timestamp()
+        self._cache_entry({'data': self._session, 'expires_at': self._stored_expiry})
+
+    def _cache_entry(self, entry):
+        if not settings.SESSION_WRITE_CACHE:
+            return
+        try:
+            timeout = max(1, int(entry['expires_at'] - timezone.now().timestamp()))
+            self._cache.set(self.cache_key, entry, timeout)
+        except Exception:
+            logger.exception("Erreur d'écriture de la session dans le cache")
@@ -0,0 +1,16 @@
+# Récepteurs de signaux de l'application
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from money_transfer.models import Platform
+from money_transfer.services import PlatformConfigService
+
+
+@receiver(post_save, sender=Platform)
+@receiver(post_delete, sender=Platform)
+def invalidate_platform_config(sender, **kwargs):
+    # Toute écriture de la configuration (formulaire, admin Django, shell) invalide
+    # le cache, une fois la transaction validée
+    transaction.on_commit(PlatformConfigService.invalidate)
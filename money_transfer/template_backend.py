@@ -0,0 +1,36 @@
+"""
+Moteur de templates Django chronométré (voir money_transfer.metrics)
+"""
+import time
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from money_transfer.metrics import current_request
+
+
+class TimedTemplate(Template):
+    # Le rendu de premier niveau englobe extends/include : pas de double comptage
+
+    def render(self, context=None, request=None):
+        measures = current_request.get()
+        if measures is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            measures['template_time'] += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates dont les rendus sont ajoutés aux mesures de la requête en cours"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -15,6 +15,7 @@ from money_transfer.views import (
     dashboard_view,
     transactions_history_view,
     transaction_detail_view,
+    transactions_statement_view,
     
     # Transactions
     deposit_view,
@@ -28,8 +29,14 @@ from money_transfer.views import (
     admin_user_detail_view,
     admin_suspend_user_view,
     admin_reactivate_user_view,
+    admin_user_statement_view,
     admin_platform_config_view,
     admin_transactions_view,
+    admin_statistics_view,
+    admin_statistics_json_view,
+    
+    # Monitoring
+    metrics_view,
 )
 
 urlpatterns = [
@@ -44,6 +51,7 @@ urlpatterns = [
     # === DASHBOARD ===
     path('dashboard/', dashboard_view, name='dashboard'),
     path('transactions/', transactions_history_view, name='transactions_history'),
+    path('transactions/statement.csv', transactions_statement_view, name='transactions_statement'),
     path('transaction/<uuid:reference>/', transaction_detail_view, name='transaction_detail'),
     
     # === OPÉRATIONS FINANCIÈRES ===
@@ -58,6 +66,12 @@ urlpatterns = [
     path('admin/user/<int:user_id>/', admin_user_detail_view, name='admin_user_detail'),
     path('admin/user/<int:user_id>/suspend/', admin_suspend_user_view, name='admin_suspend_user'),
     path('admin/user/<int:user_id>/reactivate/', admin_reactivate_user_view, name='admin_reactivate_user'),
+    path('admin/user/<int:user_id>/statement.csv', admin_user_statement_view, name='admin_user_statement'),
     path('admin/platform-config/', admin_platform_config_view, name='admin_platform_config'),
     path('admin/transactions/', admin_transactions_view, name='admin_transactions'),
+    path('admin/statistics/', admin_statistics_view, name='admin_statistics'),
+    path('admin/statistics.json', admin_statistics_json_view, name='admin_statistics_json'),
+    
+    # === SUPERVISION ===
+    path('metrics', metrics_view, name='metrics'),
 ]
\ No newline at end of file
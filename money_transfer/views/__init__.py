@@ -16,6 +16,7 @@ from .dashboard import (
     dashboard_view,
     transactions_history_view,
     transaction_detail_view,
+    transactions_statement_view,
 )
 
 # Transaction views
@@ -33,10 +34,16 @@ from .admin import (
     admin_user_detail_view,
     admin_suspend_user_view,
     admin_reactivate_user_view,
+    admin_user_statement_view,
     admin_platform_config_view,
     admin_transactions_view,
+    admin_statistics_view,
+    admin_statistics_json_view,
 )
 
+# Monitoring views
+from .monitoring import metrics_view
+
 __all__ = [
     # Auth
     'register_view',
@@ -50,6 +57,7 @@ __all__ = [
     'dashboard_view',
     'transactions_history_view',
     'transaction_detail_view',
+    'transactions_statement_view',
     
     # Transactions
     'deposit_view',
@@ -63,6 +71,12 @@ __all__ = [
     'admin_user_detail_view',
     'admin_suspend_user_view',
     'admin_reactivate_user_view',
+    'admin_user_statement_view',
     'admin_platform_config_view',
     'admin_transactions_view',
+    'admin_statistics_view',
+    'admin_statistics_json_view',
+    
+    # Monitoring
+    'metrics_view',
 ]
\ No newline at end of file
@@ -1,10 +1,11 @@
 """
 Vues administrateur
 """
+from django.conf import settings
+from django.http import JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Sum, Count, Q, Avg
-from datetime import datetime, timedelta
+from django.db.models import Q
 
 from money_transfer.models import User, Transaction, VirtualAccount, Platform
 from money_transfer.models.transaction import TypeTransaction, TransactionStatus
@@ -13,42 +14,37 @@ from money_transfer.forms import (
     UserSuspendForm,
     UserReactivateForm,
     PlatformConfigForm,
-    UserSearchForm
+    UserSearchForm,
+    StatisticsFilterForm
 )
-from money_transfer.services import AccountService
+from money_transfer.services import AccountService, StatsService
 from money_transfer.decorators.decorators import admin_required
+from money_transfer.pagination import paginate_keyset, decode_cursor
+from .dashboard import statement_response
 
 
 @admin_required
 def admin_dashboard_view(request):
     """Dashboard administrateur avec statistiques"""
     
-    # Statistiques globales
-    total_users = User.objects.count()
-    active_users = User.objects.filter(status=UserStatus.ACTIVE).count()
-    pending_users = User.objects.filter(status=UserStatus.PENDING).count()
-    suspended_users = User.objects.filter(status=UserStatus.SUSPENDED).count()
+    # Statistiques globales : compteurs maintenus par la couche service (une requête)
+    counters = StatsService.get_platform_counters()
     
-    # Statistiques des transactions
-    total_transactions = Transaction.objects.count()
-    successful_transactions = Transaction.objects.filter(status=TransactionStatus.SUCCESS).count()
+    total_users = counters['users']
+    active_users = counters[f'users.status.{UserStatus.ACTIVE}']
+    pending_users = counters[f'users.status.{UserStatus.PENDING}']
+    suspended_users = counters[f'users.status.{UserStatus.SUSPENDED}']
     
-    # Volume total des transactions
-    total_volume = Transaction.objects.filter(
-        status=TransactionStatus.SUCCESS
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    # Statistiques des transactions
+    total_transactions = counters['transactions']
+    successful_transactions = counters[f'transactions.status.{TransactionStatus.SUCCESS}']
     
-    # Frais collectés
-    total_fees = Transaction.objects.filter(
-        type=TypeTransaction.FEE,
-        status=TransactionStatus.SUCCESS
-    ).aggregate(total=Sum('amount'))['total'] or 0
+    # Volume total des transactions et frais collectés
+    total_volume = counters['volume']
+    total_fees = counters['fees']
     
     # Transactions du jour
-    today = datetime.now().date()
-    transactions_today = Transaction.objects.filter(
-        created_at__date=today
-    ).count()
+    transactions_today = counters['transactions_today']
     
     # Dernières transactions
     recent_transactions = Transaction.objects.select_related(
@@ -62,8 +58,12 @@ def admin_dashboard_view(request):
     # Plateforme
     platform = Platform.objects.first()
     platform_account = None
-    if platform and hasattr(platform, 'virtual_account'):
-        platform_account = platform.virtual_account
+    if platform:
+        # Solde consolidé de tous les sous-comptes de frais
+        platform_account = {
+            'balance': AccountService.get_platform_balance(platform),
+            'stripes': platform.virtual_accounts.count(),
+        }
     
     context = {
         'total_users': total_users,
@@ -135,47 +135,25 @@ def admin_user_detail_view(request, user_id):
     from money_transfer.services import TransactionService
     transactions = TransactionService.get_user_transactions(user, limit=20)
     
-    # Statistiques
+    # Statistiques : une requête groupée, en cache jusqu'au prochain mouvement du compte
     account = user.virtual_account if hasattr(user, 'virtual_account') else None
     
     if account:
-        deposits = Transaction.objects.filter(
-            sender_account=account,
-            type=TypeTransaction.DEPOSIT,
-            status=TransactionStatus.SUCCESS
-        ).aggregate(total=Sum('amount'), count=Count('id'))
-        
-        withdrawals = Transaction.objects.filter(
-            sender_account=account,
-            type=TypeTransaction.WITHDRAWAL,
-            status=TransactionStatus.SUCCESS
-        ).aggregate(total=Sum('amount'), count=Count('id'))
-        
-        transfers_sent = Transaction.objects.filter(
-            sender_account=account,
-            type=TypeTransaction.TRANSFER,
-            status=TransactionStatus.SUCCESS
-        ).aggregate(total=Sum('amount'), count=Count('id'))
-        
-        transfers_received = Transaction.objects.filter(
-            receiver_account=account,
-            type=TypeTransaction.TRANSFER,
-            status=TransactionStatus.SUCCESS
-        ).aggregate(total=Sum('amount'), count=Count('id'))
+        stats = AccountService.get_account_stats(account)
     else:
-        deposits = {'total': 0, 'count': 0}
-        withdrawals = {'total': 0, 'count': 0}
-        transfers_sent = {'total': 0, 'count': 0}
-        transfers_received = {'total': 0, 'count': 0}
+        empty = {'total': 0, 'count': 0}
+        stats = {
+            'deposits': empty,
+            'withdrawals': empty,
+            'transfers_sent': empty,
+            'transfers_received': empty,
+        }
     
     context = {
         'user_detail': user,
         'balance': balance,
         'transactions': transactions,
-        'deposits': deposits,
-        'withdrawals': withdrawals,
-        'transfers_sent': transfers_sent,
-        'transfers_received': transfers_received,
+        **stats,
     }
     
     return render(request, 'money_transfer/admin/user_detail.html', context)
@@ -232,16 +210,23 @@ def admin_reactivate_user_view(request, user_id):
     })
 
 
+@admin_required
+def admin_user_statement_view(request, user_id):
+    """Relevé CSV d'un utilisateur (audit), généré en flux"""
+    user = get_object_or_404(User.objects.select_related('virtual_account'), id=user_id)
+    account = user.virtual_account if hasattr(user, 'virtual_account') else None
+    
+    if not account:
+        messages.error(request, f" {user.email} n'a pas de compte virtuel.")
+        return redirect('admin_user_detail', user_id=user_id)
+    
+    return statement_response(account, request)
+
+
 @admin_required
 def admin_platform_config_view(request):
     """Configuration de la plateforme"""
-    platform = Platform.objects.first()
-    
-    if not platform:
-        platform = Platform.objects.create(
-            name="Money Transfer Platform",
-            withdrawal_fee_rate=2
-        )
+    platform = AccountService.get_or_create_platform()
     
     if request.method == 'POST':
         form = PlatformConfigForm(request.POST, instance=platform)
@@ -270,7 +255,7 @@ def admin_transactions_view(request):
     transactions = Transaction.objects.select_related(
         'sender_account__user',
         'receiver_account__user'
-    ).order_by('-created_at')[:100]
+    )
     
     # Filtrage par type
     transaction_type = request.GET.get('type')
@@ -282,10 +267,90 @@ def admin_transactions_view(request):
     if status:
         transactions = transactions.filter(status=status)
     
+    # Pagination par curseur sur (created_at, id), après les filtres
+    cursor = request.GET.get('cursor')
+    transactions, next_cursor = paginate_keyset(
+        transactions,
+        decode_cursor(cursor),
+        settings.TRANSACTIONS_PAGE_SIZE
+    )
+    
     context = {
         'transactions': transactions,
         'selected_type': transaction_type,
         'selected_status': status,
+        'next_cursor': next_cursor,
+        'is_first_page': not cursor,
     }
     
-    return render(request, 'money_transfer/admin/transactions.html', context)
\ No newline at end of file
+    return render(request, 'money_transfer/admin/transactions.html', context)
+
+
+def _statistics_context(request):
+    # Période, granularité et série lues dans les cumuls horaires/journaliers
+    # Retourne (formulaire, données) ; données = None si le formulaire est invalide
+    form = StatisticsFilterForm(request.GET or None)
+    if form.is_bound and not form.is_valid():
+        return form, None
+    
+    date_from, date_to = form.get_date_range()
+    granularity = form.get_granularity(date_from, date_to)
+    
+    series = StatsService.get_transaction_series(date_from, date_to, granularity)
+    
+    # Totaux par type sur la période
+    totals = {choice: {'count': 0, 'volume': 0, 'fees': 0} for choice in TypeTransaction.values}
+    for point in series:
+        for key in ('count', 'volume', 'fees'):
+            totals[point['type']][key] += point[key]
+    
+    return form, {
+        'date_from': date_from,
+        'date_to': date_to,
+        'granularity': granularity,
+        'series': series,
+        'totals': totals,
+    }
+
+
+@admin_required
+def admin_statistics_view(request):
+    """Statistiques des transactions par période (volume, nombre, frais par type)"""
+    
+    form, data = _statistics_context(request)
+    context = {'form': form}
+    
+    if data:
+        # Une ligne par tranche, une colonne par type
+        buckets = {}
+        for point in data['series']:
+            bucket = buckets.setdefault(point['bucket'], {'bucket': point['bucket'], 'volume': 0, 'types': {}})
+            bucket['types'][point['type']] = point
+            bucket['volume'] += point['volume']
+        
+        context.update(data)
+        context['buckets'] = list(buckets.values())
+        context['max_volume'] = max((bucket['volume'] for bucket in buckets.values()), default=0)
+        context['type_totals'] = [(label, data['totals'][value]) for value, label in TypeTransaction.choices]
+    
+    return render(request, 'money_transfer/admin/statistics.html', context)
+
+
+@admin_required
+def admin_statistics_json_view(request):
+    """Mêmes statistiques au format JSON (graphiques)"""
+    
+    form, data = _statistics_context(request)
+    if data is None:
+        return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+    
+    return JsonResponse({
+        'date_from': data['date_from'].isoformat(),
+        'date_to': data['date_to'].isoformat(),
+        'granularity': data['granularity'],
+        'series': [
+            {**point, 'bucket': point['bucket'].isoformat()}
+            for point in data['series']
+        ],
+        'totals': data['totals'],
+    })
@@ -1,13 +1,15 @@
 # Vues du dashboard utilisateur
-from django.shortcuts import render
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.shortcuts import render, redirect
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum, Count, Q
-from datetime import datetime, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from money_transfer.services import AccountService, TransactionService
-from money_transfer.models import Transaction
-from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from money_transfer.services import AccountService, TransactionService, StatsService, StatementService
 from money_transfer.decorators.decorators import active_user_required
+from money_transfer.pagination import split_page, decode_cursor
 
 
 @login_required
@@ -27,61 +29,19 @@ def dashboard_view(request):
     # Récupérer les dernières transactions
     recent_transactions = TransactionService.get_user_transactions(user, limit=5)
     
-    # Statistiques du mois en cours
-    now = datetime.now()
-    first_day_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    account = user.virtual_account if hasattr(user, 'virtual_account') else None
+    # Statistiques du mois en cours : une ligne de la table de cumul
+    account = request.account
     
     if account:
-        # Dépôts du mois
-        deposits_this_month = Transaction.objects.filter(
-            sender_account=account,
-            type=TypeTransaction.DEPOSIT,
-            status=TransactionStatus.SUCCESS,
-            created_at__gte=first_day_of_month
-        ).aggregate(
-            total=Sum('amount'),
-            count=Count('id')
-        )
-        
-        # Retraits du mois
-        withdrawals_this_month = Transaction.objects.filter(
-            sender_account=account,
-            type=TypeTransaction.WITHDRAWAL,
-            status=TransactionStatus.SUCCESS,
-            created_at__gte=first_day_of_month
-        ).aggregate(
-            total=Sum('amount'),
-            count=Count('id')
-        )
-        
-        # Transferts envoyés du mois
-        transfers_sent_this_month = Transaction.objects.filter(
-            sender_account=account,
-            type=TypeTransaction.TRANSFER,
-            status=TransactionStatus.SUCCESS,
-            created_at__gte=first_day_of_month
-        ).aggregate(
-            total=Sum('amount'),
-            count=Count('id')
-        )
-        
-        # Transferts reçus du mois
-        transfers_received_this_month = Transaction.objects.filter(
-            receiver_account=account,
-            type=TypeTransaction.TRANSFER,
-            status=TransactionStatus.SUCCESS,
-            created_at__gte=first_day_of_month
-        ).aggregate(
-            total=Sum('amount'),
-            count=Count('id')
-        )
+        monthly_stats = StatsService.get_account_month(account).as_dashboard()
     else:
-        deposits_this_month = {'total': 0, 'count': 0}
-        withdrawals_this_month = {'total': 0, 'count': 0}
-        transfers_sent_this_month = {'total': 0, 'count': 0}
-        transfers_received_this_month = {'total': 0, 'count': 0}
+        empty = {'total': 0, 'count': 0}
+        monthly_stats = {
+            'deposits_this_month': empty,
+            'withdrawals_this_month': empty,
+            'transfers_sent_this_month': empty,
+            'transfers_received_this_month': empty,
+        }
     
     context = {
         'user': user,
@@ -89,10 +49,7 @@ def dashboard_view(request):
         'can_transact': can_transact,
         'error_message': error_message,
         'recent_transactions': recent_transactions,
-        'deposits_this_month': deposits_this_month,
-        'withdrawals_this_month': withdrawals_this_month,
-        'transfers_sent_this_month': transfers_sent_this_month,
-        'transfers_received_this_month': transfers_received_this_month,
+        **monthly_stats,
     }
     
     return render(request, 'money_transfer/dashboard/home.html', context)
@@ -103,27 +60,28 @@ def transactions_history_view(request):
     """Vue de l'historique complet des transactions"""
     user = request.user
     
-    # Récupérer toutes les transactions (SANS limite d'abord)
-    transactions = TransactionService.get_user_transactions(user, limit=None)
-    
-    # Filtrage par type si demandé
     transaction_type = request.GET.get('type')
-    if transaction_type:
-        transactions = transactions.filter(type=transaction_type)
-    
-    # Filtrage par statut si demandé
     status = request.GET.get('status')
-    if status:
-        transactions = transactions.filter(status=status)
-    
-    # Appliquer la limite APRÈS les filtres
-    transactions = transactions[:100]
+    cursor = request.GET.get('cursor')
+    page_size = settings.TRANSACTIONS_PAGE_SIZE
+    
+    # Filtres et curseur appliqués dans la requête ; une ligne de plus pour la page suivante
+    transactions = TransactionService.get_user_transactions(
+        user,
+        limit=page_size + 1,
+        cursor=decode_cursor(cursor),
+        transaction_type=transaction_type,
+        status=status
+    )
+    transactions, next_cursor = split_page(transactions, page_size)
     
     context = {
         'user': user,
         'transactions': transactions,
         'selected_type': transaction_type,
         'selected_status': status,
+        'next_cursor': next_cursor,
+        'is_first_page': not cursor,
     }
     
     return render(request, 'money_transfer/dashboard/transactions_history.html', context)
@@ -142,13 +100,10 @@ def transaction_detail_view(request, reference):
         return redirect('transactions_history')
     
     # Vérifier que l'utilisateur est impliqué dans cette transaction
-    account = user.virtual_account if hasattr(user, 'virtual_account') else None
+    account = request.account
     
     if account:
-        is_involved = (
-            transaction.sender_account == account or 
-            transaction.receiver_account == account
-        )
+        is_involved = account.id in (transaction.sender_account_id, transaction.receiver_account_id)
     else:
         is_involved = False
     
@@ -159,9 +114,9 @@ def transaction_detail_view(request, reference):
     # Déterminer le rôle de l'utilisateur dans la transaction
     user_role = None
     if account:
-        if transaction.sender_account == account:
+        if transaction.sender_account_id == account.id:
             user_role = 'sender'
-        elif transaction.receiver_account == account:
+        elif transaction.receiver_account_id == account.id:
             user_role = 'receiver'
     
     context = {
@@ -170,4 +125,36 @@ def transaction_detail_view(request, reference):
         'user_role': user_role,
     }
     
-    return render(request, 'money_transfer/dashboard/transaction_detail.html', context)
\ No newline at end of file
+    return render(request, 'money_transfer/dashboard/transaction_detail.html', context)
+
+
+def statement_response(account, request):
+    # Relevé CSV en flux ; période optionnelle ?from=AAAA-MM-JJ&to=AAAA-MM-JJ (ignorée si invalide)
+    try:
+        date_from = parse_date(request.GET.get('from') or '')
+        date_to = parse_date(request.GET.get('to') or '')
+    except ValueError:
+        date_from = date_to = None
+    if not (date_from and date_to and date_from <= date_to):
+        date_from = date_to = None
+
+    response = StreamingHttpResponse(
+        StatementService.iter_csv(account, date_from, date_to),
+        content_type='text/csv; charset=utf-8'
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="releve-{account.id}-{timezone.localdate():%Y%m%d}.csv"'
+    )
+    return response
+
+
+@active_user_required
+def transactions_statement_view(request):
+    """Relevé de compte complet au format CSV, généré en flux"""
+    account = request.account
+    
+    if not account:
+        messages.error(request, " Aucun compte associé.")
+        return redirect('transactions_history')
+    
+    return statement_response(account, request)
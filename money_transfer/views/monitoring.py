@@ -0,0 +1,26 @@
+# Vues de supervision
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from money_transfer.decorators.decorators import admin_required
+from money_transfer.metrics import registry
+
+
+def metrics_view(request):
+    """Histogrammes de performance au format texte Prometheus (tous workers confondus)"""
+    # Collecteur Prometheus : jeton Bearer (METRICS_TOKEN) ; sinon session administrateur
+    token = settings.METRICS_TOKEN
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return _metrics_response(request)
+    return admin_metrics_view(request)
+
+
+@admin_required
+def admin_metrics_view(request):
+    return _metrics_response(request)
+
+
+def _metrics_response(request):
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,15 +1,21 @@
 # Vues des opérations financières
+import uuid
+
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 
 from money_transfer.forms import DepositForm, WithdrawalForm, TransferForm, OTPValidationForm
-from money_transfer.services import TransactionService, OTPService, AccountService
+from money_transfer.services import TransactionService, OTPService, AccountService, IdempotencyService, PlatformConfigService
 from money_transfer.models.user import OTPType
-from money_transfer.models.account import Platform
 from money_transfer.decorators.decorators import active_user_required
 
 
+def get_idempotency_key(request):
+    # Clé fournie par le formulaire (champ caché) ou par l'en-tête Idempotency-Key des clients API
+    return request.POST.get('idempotency_key') or request.headers.get('Idempotency-Key')
+
+
 @active_user_required
 def deposit_view(request):
     """Vue de dépôt d'argent"""
@@ -21,10 +27,11 @@ def deposit_view(request):
         if form.is_valid():
             amount = form.cleaned_data['amount']
             
-            # Effectuer le dépôt
+            # Effectuer le dépôt (un rejeu avec la même clé renvoie la transaction d'origine)
             success, message, transaction = TransactionService.deposit(
                 user=user,
-                amount=amount
+                amount=amount,
+                idempotency_key=get_idempotency_key(request)
             )
             
             if success:
@@ -43,6 +50,7 @@ def deposit_view(request):
         'form': form,
         'user': user,
         'balance': balance,
+        'idempotency_key': get_idempotency_key(request) or uuid.uuid4().hex,
     }
     
     return render(request, 'money_transfer/transactions/deposit.html', context)
@@ -54,8 +62,7 @@ def withdrawal_request_view(request):
     user = request.user
     
     # Récupérer les infos de la plateforme pour afficher les frais
-    platform = Platform.objects.first()
-    fee_rate = platform.withdrawal_fee_rate if platform else 2
+    fee_rate = PlatformConfigService.get_fee_rate()
     
     if request.method == 'POST':
         form = WithdrawalForm(request.POST, user=user)
@@ -103,6 +110,13 @@ def withdrawal_confirm_view(request):
     """Vue de confirmation de retrait avec OTP (Étape 2)"""
     user = request.user
     
+    # Rejeu d'une confirmation déjà traitée : renvoyer vers la transaction d'origine
+    idempotency_key = get_idempotency_key(request)
+    if request.method == 'POST' and idempotency_key:
+        replayed = IdempotencyService.get_transaction(user, idempotency_key)
+        if replayed is not None:
+            return redirect('transaction_detail', reference=replayed.reference)
+    
     # Récupérer les infos de la session
     amount = request.session.get('withdrawal_amount')
     fee = request.session.get('withdrawal_fee', 0)
@@ -129,7 +143,8 @@ def withdrawal_confirm_view(request):
                 # Effectuer le retrait
                 success, msg, transaction = TransactionService.withdraw(
                     user=user,
-                    amount=amount
+                    amount=amount,
+                    idempotency_key=idempotency_key
                 )
                 
                 # Nettoyer la session
@@ -156,6 +171,7 @@ def withdrawal_confirm_view(request):
         'amount': amount,
         'fee': fee,
         'net_amount': net_amount,
+        'idempotency_key': idempotency_key or uuid.uuid4().hex,
     }
     
     return render(request, 'money_transfer/transactions/withdrawal_confirm.html', context)
@@ -173,11 +189,12 @@ def transfer_view(request):
             receiver_email = form.cleaned_data['receiver_email']
             amount = form.cleaned_data['amount']
             
-            # Effectuer le transfert
+            # Effectuer le transfert (un rejeu avec la même clé renvoie la transaction d'origine)
             success, message, transaction = TransactionService.transfer(
                 sender_user=user,
                 receiver_email=receiver_email,
-                amount=amount
+                amount=amount,
+                idempotency_key=get_idempotency_key(request)
             )
             
             if success:
@@ -196,6 +213,7 @@ def transfer_view(request):
         'form': form,
         'user': user,
         'balance': balance,
+        'idempotency_key': get_idempotency_key(request) or uuid.uuid4().hex,
     }
     
     return render(request, 'money_transfer/transactions/transfer.html', context)
\ No newline at end of file
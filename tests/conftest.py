@@ -0,0 +1,32 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from money_transfer.models import VirtualAccount
+from money_transfer.models.user import UserStatus
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Les caches (partagé et locaux synchronisés sur lui) ne doivent pas survivre à un test
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def make_active_user(db):
+    # Fabrique d'utilisateurs actifs et vérifiés avec leur compte virtuel (relation préchargée)
+    User = get_user_model()
+
+    def make(email, phone, balance=0, **fields):
+        user = User.objects.create_user(
+            email=email,
+            phone=phone,
+            password="pass1234",
+            status=UserStatus.ACTIVE,
+            is_verified=True,
+            **fields
+        )
+        VirtualAccount.objects.create(user=user, balance=balance, is_active=True)
+        return User.objects.select_related('virtual_account').get(pk=user.pk)
+    return make
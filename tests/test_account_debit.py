@@ -0,0 +1,48 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from money_transfer.models import VirtualAccount
+from money_transfer.services import AccountService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def account():
+    user = User.objects.create_user(
+        email="debit@test.com",
+        phone="95000000",
+        password="pass1234",
+        is_verified=True
+    )
+    return VirtualAccount.objects.create(user=user, balance=1000, is_active=True)
+
+
+@pytest.mark.django_db
+def test_debit_returns_new_balance_in_one_statement(account, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        new_balance = AccountService.debit(account, 400)
+
+    assert new_balance == 600
+    assert account.balance == 600
+    assert VirtualAccount.objects.get(pk=account.pk).balance == 600
+
+
+@pytest.mark.django_db
+def test_debit_refuses_insufficient_balance(account):
+    assert AccountService.debit(account, 1001) is None
+    assert VirtualAccount.objects.get(pk=account.pk).balance == 1000
+
+
+@pytest.mark.django_db
+def test_credit_returns_new_balance(account):
+    assert AccountService.credit(account, 250) == 1250
+    assert VirtualAccount.objects.get(pk=account.pk).balance == 1250
+
+
+@pytest.mark.django_db
+def test_balance_check_constraint(account):
+    with pytest.raises(IntegrityError):
+        with transaction.atomic():
+            VirtualAccount.objects.filter(pk=account.pk).update(balance=F('balance') - 2000)
@@ -0,0 +1,159 @@
+import pytest
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from money_transfer.models import AccountMonthlyStats
+from money_transfer.services import TransactionService, StatsService, AccountService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_rollup_follows_movements_and_matches_rebuild(make_active_user):
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    bob = make_active_user("bob@test.com", "92000001", 0)
+
+    TransactionService.deposit(alice, 10000)
+    TransactionService.transfer(alice, bob.email, 3000)
+    TransactionService.withdraw(alice, 1000)
+    TransactionService.bulk_transfer(bob, [(alice.email, 500), (alice.email, 200)])
+
+    stats = AccountMonthlyStats.objects.get(account=alice.virtual_account)
+    assert (stats.deposits_total, stats.deposits_count) == (10000, 1)
+    assert (stats.transfers_sent_total, stats.transfers_sent_count) == (3000, 1)
+    assert (stats.withdrawals_total, stats.withdrawals_count) == (1000, 1)
+    assert (stats.transfers_received_total, stats.transfers_received_count) == (700, 2)
+
+    incremental = AccountMonthlyStats.objects.values().get(account=alice.virtual_account)
+    StatsService.rebuild_account_month(alice.virtual_account, stats.month)
+    assert AccountMonthlyStats.objects.values().get(account=alice.virtual_account) == incremental
+
+
+@pytest.mark.django_db
+def test_failed_withdrawal_is_not_counted(make_active_user):
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    TransactionService.withdraw(alice, 1000)
+    assert not AccountMonthlyStats.objects.exists()
+
+
+@pytest.mark.django_db
+def test_dashboard_reads_one_rollup_row(client, make_active_user):
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    TransactionService.deposit(alice, 10000)
+    client.force_login(alice)
+
+    response = client.get('/dashboard/')
+    assert response.status_code == 200
+    assert response.context['deposits_this_month'] == {'total': 10000, 'count': 1}
+
+
+@pytest.mark.django_db
+def test_account_stats_cached_until_next_movement(settings, django_assert_num_queries, django_capture_on_commit_callbacks, make_active_user):
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    bob = make_active_user("bob@test.com", "92000001", 0)
+    TransactionService.deposit(alice, 10000)
+    TransactionService.transfer(alice, bob.email, 3000)
+    account = alice.virtual_account
+    settings.ACCOUNT_CACHE_ENABLED = True
+
+    with django_assert_num_queries(1):
+        stats = AccountService.get_account_stats(account)
+    assert stats['deposits'] == {'total': 10000, 'count': 1}
+    assert stats['transfers_sent'] == {'total': 3000, 'count': 1}
+    assert stats['transfers_received'] == {'total': 0, 'count': 0}
+
+    with django_assert_num_queries(0):
+        AccountService.get_account_stats(account)
+
+    # Un mouvement invalide le cache des deux comptes, après validation
+    with django_capture_on_commit_callbacks(execute=True):
+        TransactionService.transfer(bob, alice.email, 500)
+    assert AccountService.get_account_stats(account)['transfers_received'] == {'total': 500, 'count': 1}
+    assert AccountService.get_account_stats(bob.virtual_account)['transfers_sent'] == {'total': 500, 'count': 1}
+
+
+@pytest.mark.django_db
+def test_admin_user_detail_uses_account_stats(client, make_active_user):
+    admin = User.objects.create_superuser(email="admin@test.com", phone="92000009", password="pass1234")
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    TransactionService.deposit(alice, 10000)
+    client.force_login(admin)
+
+    response = client.get(reverse('admin_user_detail', args=[alice.id]))
+    assert response.status_code == 200
+    assert response.context['deposits'] == {'total': 10000, 'count': 1}
+
+
+@pytest.mark.django_db
+def test_dashboard_does_not_write_missing_month(client, make_active_user):
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    TransactionService.deposit(alice, 10000)
+    AccountMonthlyStats.objects.all().delete()
+    client.force_login(alice)
+
+    response = client.get('/dashboard/')
+    assert response.context['deposits_this_month'] == {'total': 10000, 'count': 1}
+    assert not AccountMonthlyStats.objects.exists()
+
+
+@pytest.mark.django_db
+def test_missing_month_is_seeded_from_history_on_next_movement(make_active_user):
+    # Ligne absente alors que le mois a déjà des mouvements : le prochain mouvement
+    # crée la ligne depuis l'agrégat complet, pas depuis son seul delta
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    bob = make_active_user("bob@test.com", "92000001", 0)
+    TransactionService.deposit(alice, 10000)
+    AccountMonthlyStats.objects.all().delete()
+
+    TransactionService.deposit(alice, 2000)
+    TransactionService.bulk_transfer(alice, [(bob.email, 300)])
+
+    stats = AccountMonthlyStats.objects.get(account=alice.virtual_account)
+    assert (stats.deposits_total, stats.deposits_count) == (12000, 2)
+    assert (stats.transfers_sent_total, stats.transfers_sent_count) == (300, 1)
+    received = AccountMonthlyStats.objects.get(account=bob.virtual_account)
+    assert (received.transfers_received_total, received.transfers_received_count) == (300, 1)
+
+    incremental = AccountMonthlyStats.objects.values().get(account=alice.virtual_account)
+    StatsService.rebuild_account_month(alice.virtual_account, stats.month)
+    assert AccountMonthlyStats.objects.values().get(account=alice.virtual_account) == incremental
+
+
+@pytest.mark.django_db
+def test_seeded_rows_survive_concurrent_insert(make_active_user, monkeypatch):
+    # Une écriture concurrente crée l'une des deux lignes manquantes entre la lecture des clés
+    # existantes et l'insertion : seule cette ligne reçoit le delta, l'autre garde l'agrégat
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    bob = make_active_user("bob@test.com", "92000001", 0)
+    TransactionService.deposit(bob, 4000)
+    _, _, alice_txn = TransactionService.deposit(alice, 1000)
+    _, _, bob_txn = TransactionService.deposit(bob, 2000)
+    AccountMonthlyStats.objects.all().delete()
+
+    seed = StatsService._seed_account_months
+
+    def racing_seed(keys):
+        AccountMonthlyStats.objects.create(
+            account=alice.virtual_account, month=keys[0][1], deposits_total=500, deposits_count=1
+        )
+        return seed(keys)
+
+    monkeypatch.setattr(StatsService, '_seed_account_months', racing_seed)
+    StatsService.record_account_transactions([alice_txn, bob_txn])
+
+    stats = {row.account_id: row for row in AccountMonthlyStats.objects.all()}
+    assert (stats[alice.virtual_account.id].deposits_total, stats[alice.virtual_account.id].deposits_count) == (1500, 2)
+    assert (stats[bob.virtual_account.id].deposits_total, stats[bob.virtual_account.id].deposits_count) == (6000, 2)
+
+
+@pytest.mark.django_db
+def test_account_stats_computed_without_shared_cache(settings, make_active_user):
+    # Cache local au processus : l'invalidation faite par un autre worker serait invisible
+    settings.ACCOUNT_CACHE_ENABLED = False
+    alice = make_active_user("alice@test.com", "92000000", 0)
+    account = alice.virtual_account
+    TransactionService.deposit(alice, 10000)
+    assert AccountService.get_account_stats(account)['deposits'] == {'total': 10000, 'count': 1}
+
+    # Dépôt sans exécution des callbacks on_commit (invalidation jamais reçue)
+    TransactionService.deposit(alice, 500)
+    assert AccountService.get_account_stats(account)['deposits'] == {'total': 10500, 'count': 2}
@@ -0,0 +1,68 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from money_transfer.services import TransactionService, AccountService, account_service
+from money_transfer.services.account_service import balance_version_cache_key
+
+User = get_user_model()
+
+
+@pytest.fixture
+def shared_cache(settings):
+    # Un seul processus de test : le cache local se comporte comme un cache partagé
+    settings.ACCOUNT_CACHE_ENABLED = True
+
+
+@pytest.mark.django_db
+def test_balance_read_through_cache(shared_cache, django_assert_num_queries, make_active_user):
+    alice = make_active_user("alice@test.com", "97000000", balance=5000)
+
+    # Première lecture : compte de l'utilisateur puis solde ; ensuite, plus aucune requête
+    user = User.objects.get(pk=alice.pk)
+    with django_assert_num_queries(2):
+        assert AccountService.get_balance(user) == 5000
+    with django_assert_num_queries(0):
+        assert AccountService.get_balance(User(pk=alice.pk, email=alice.email)) == 5000
+
+
+@pytest.mark.django_db
+def test_balance_never_stale_after_movement(shared_cache, django_capture_on_commit_callbacks, make_active_user):
+    alice = make_active_user("alice@test.com", "97000000", balance=5000)
+    bob = make_active_user("bob@test.com", "97000001")
+    assert AccountService.get_balance(alice) == 5000
+    assert AccountService.get_balance(bob) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TransactionService.transfer(User.objects.get(pk=alice.pk), bob.email, 1200)
+    assert AccountService.get_balance(alice) == 3800
+    assert AccountService.get_balance(bob) == 1200
+
+    # Lecture concurrente : solde lu en base avant le mouvement mais rangé après,
+    # sous la version lue au départ, qui n'est plus la version courante
+    account_id = AccountService._get_account_id(alice)
+    version = cache.get(balance_version_cache_key(account_id))
+    with django_capture_on_commit_callbacks(execute=True):
+        TransactionService.deposit(User.objects.get(pk=alice.pk), 200)
+    cache.set(f'money_transfer:balance:{account_id}:{version}', 3800)
+    assert AccountService.get_account_balance(account_id) == 4000
+
+
+@pytest.mark.django_db
+def test_balance_not_cached_without_shared_backend(settings, monkeypatch, django_capture_on_commit_callbacks, make_active_user):
+    # Deux processus, chacun son cache mémoire local : le mouvement fait par le second
+    # incrémente la version dans son propre cache, invisible du premier
+    settings.ACCOUNT_CACHE_ENABLED = False
+    alice = make_active_user("alice@test.com", "97000000", balance=5000)
+    first = LocMemCache('balance-first', {})
+    second = LocMemCache('balance-second', {})
+
+    monkeypatch.setattr(account_service, 'cache', first)
+    assert AccountService.get_balance(alice) == 5000
+
+    monkeypatch.setattr(account_service, 'cache', second)
+    with django_capture_on_commit_callbacks(execute=True):
+        TransactionService.deposit(User.objects.get(pk=alice.pk), 200)
+
+    monkeypatch.setattr(account_service, 'cache', first)
+    assert AccountService.get_balance(alice) == 5200
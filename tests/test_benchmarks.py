@@ -0,0 +1,61 @@
+"""
+Benchmarks de débit du TransactionService (exclus par défaut)
+Usage: BENCHMARK_OUTPUT=resultats.json pytest -m benchmark
+
+Version courte de la commande bench_throughput, sur la base de test : vérifie que
+chaque opération tient sous concurrence (aucune erreur, soldes cohérents) et
+écrit les mesures en JSON (BENCHMARK_OUTPUT, sinon répertoire temporaire du test).
+"""
+import json
+import os
+
+import pytest
+from django.db import connection
+from django.db.models import Sum
+
+from money_transfer.benchmarks import create_benchmark_users, measure_throughput, seed_transactions
+from money_transfer.management.commands.bench_throughput import OPERATIONS, make_operation
+from money_transfer.models import VirtualAccount
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db(transaction=True)]
+
+THREADS = [1, 4]
+OPERATIONS_PER_THREAD = 20
+DATASET = 10_000
+BALANCE = 10 ** 9
+
+
+@pytest.fixture
+def bench_users():
+    users = create_benchmark_users(max(THREADS) + 1, prefix='pytestbench', balance=BALANCE)
+    seed_transactions([user.virtual_account for user in users], DATASET)
+    return users
+
+
+@pytest.mark.parametrize('operation', OPERATIONS)
+def test_throughput(bench_users, operation, tmp_path):
+    user_ids = [user.id for user in bench_users]
+    results = []
+    for threads in THREADS:
+        summary = measure_throughput(make_operation(operation, user_ids, 100), threads, OPERATIONS_PER_THREAD)
+        summary.update({'dataset': DATASET, 'operation': operation, 'vendor': connection.vendor})
+        results.append(summary)
+
+        assert summary['count'] == threads * OPERATIONS_PER_THREAD
+        # SQLite sérialise les écritures : seules les erreurs de verrou y sont tolérées
+        if connection.vendor != 'sqlite' or threads == 1:
+            assert summary['error'] == 0
+        assert summary['refused'] == 0
+
+    if operation == 'transfer':
+        # Les transferts réussis ne créent ni ne détruisent d'argent
+        total = VirtualAccount.objects.filter(user_id__in=user_ids).aggregate(total=Sum('balance'))['total']
+        assert total == BALANCE * len(user_ids)
+
+    output = os.environ.get('BENCHMARK_OUTPUT') or str(tmp_path / 'benchmarks.json')
+    existing = []
+    if os.path.exists(output):
+        with open(output) as f:
+            existing = json.load(f)
+    with open(output, 'w') as f:
+        json.dump(existing + results, f, indent=2, sort_keys=True)
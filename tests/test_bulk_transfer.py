@@ -0,0 +1,69 @@
+import pytest
+from money_transfer.models import Transaction
+from money_transfer.services import TransactionService
+
+
+@pytest.mark.django_db
+def test_bulk_transfer_credits_receivers_and_debits_sender_once(make_active_user):
+    sender = make_active_user("payroll@test.com", "93000000", balance=10000)
+    alice = make_active_user("alice@test.com", "93000001")
+    bob = make_active_user("bob@test.com", "93000002")
+
+    success, message, results = TransactionService.bulk_transfer(sender, [
+        ("alice@test.com", 1000),
+        ("bob@test.com", 2000),
+        ("alice@test.com", 500),
+    ])
+
+    assert success
+    assert [result['success'] for result in results] == [True, True, True]
+    assert Transaction.objects.filter(sender_account=sender.virtual_account).count() == 3
+
+    sender.virtual_account.refresh_from_db()
+    alice.virtual_account.refresh_from_db()
+    bob.virtual_account.refresh_from_db()
+    assert sender.virtual_account.balance == 6500
+    assert alice.virtual_account.balance == 1500
+    assert bob.virtual_account.balance == 2000
+
+
+@pytest.mark.django_db
+def test_bulk_transfer_reports_failed_lines(make_active_user):
+    sender = make_active_user("payroll@test.com", "93000000", balance=1500)
+    make_active_user("alice@test.com", "93000001")
+
+    success, message, results = TransactionService.bulk_transfer(sender, [
+        ("alice@test.com", 1000),
+        ("unknown@test.com", 100),
+        ("payroll@test.com", 100),
+        ("alice@test.com", 0),
+        ("alice@test.com", 1000),
+    ])
+
+    assert success
+    assert [result['success'] for result in results] == [True, False, False, False, False]
+    assert results[0]['transaction'].reference
+
+    sender.virtual_account.refresh_from_db()
+    assert sender.virtual_account.balance == 500
+
+
+@pytest.mark.django_db
+def test_bulk_transfer_resolves_recipients_in_one_query(django_assert_max_num_queries, make_active_user):
+    sender = make_active_user("payroll@test.com", "93000000", balance=100000)
+    lines = []
+    for i in range(20):
+        make_active_user(f"employee{i}@test.com", f"9400{i:04d}")
+        lines.append((f"employee{i}@test.com", 100))
+
+    # Premier mouvement : crée le cumul mensuel de l'envoyeur et les compteurs de la plateforme
+    TransactionService.bulk_transfer(sender, lines[:1])
+
+    # Utilisateurs, verrous (+ écriture neutre sous SQLite), débit, crédits, insertion (+ savepoint),
+    # cumuls mensuels : UPDATE ... CASE, lecture, agrégat émis/reçus et bulk_create des destinataires
+    # (+ savepoint), compteurs de la plateforme et cumuls horaire/journalier : UPDATE ... CASE
+    with django_assert_max_num_queries(18):
+        success, message, results = TransactionService.bulk_transfer(sender, lines)
+
+    assert success
+    assert all(result['success'] for result in results)
@@ -1,16 +1,19 @@
 import pytest
 from django.contrib.auth import get_user_model
-from wallets.models import VirtualAccount
-from transactions.services import deposit_money
+from money_transfer.models import VirtualAccount
+from money_transfer.models.user import UserStatus
+from money_transfer.services import TransactionService
 
 User = get_user_model()
 
 
+@pytest.mark.django_db
 def test_deposit_money():
     user = User.objects.create_user(
         email="deposit@test.com",
         phone="91000000",
         password="pass1234",
+        status=UserStatus.ACTIVE,
         is_verified=True
     )
 
@@ -20,7 +23,9 @@ def test_deposit_money():
         is_active=True
     )
 
-    deposit_money(account, 10000)
+    success, message, transaction = TransactionService.deposit(user, 10000)
 
+    assert success, message
     account.refresh_from_db()
     assert account.balance == 10000
+    assert transaction.amount == 10000
@@ -0,0 +1,134 @@
+import smtplib
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+from money_transfer.models import OutgoingEmail
+from money_transfer.models.outbox import EmailStatus
+from money_transfer.models.user import OTPType
+from money_transfer.services import OTPService, EmailOutboxService
+
+User = get_user_model()
+
+
+class DisconnectedBackend(BaseEmailBackend):
+    # Serveur injoignable : chaque envoi échoue
+    def send_messages(self, email_messages):
+        raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+
+
+@pytest.mark.django_db
+def test_otp_is_queued_then_sent_by_worker():
+    user = User.objects.create_user(email="alice@test.com", phone="99000000", password="pass1234")
+
+    success, message, otp = OTPService.request_and_send_otp(user, OTPType.ACCOUNT_VALIDATION)
+
+    assert success
+    assert mail.outbox == []
+    email = OutgoingEmail.objects.get()
+    assert email.status == EmailStatus.PENDING
+    assert otp.code in email.body
+
+    sent, failed = EmailOutboxService.deliver_pending(get_connection())
+
+    assert (sent, failed) == (1, 0)
+    assert mail.outbox[0].to == ["alice@test.com"]
+    assert mail.outbox[0].alternatives[0][1] == 'text/html'
+    email.refresh_from_db()
+    assert email.status == EmailStatus.SENT
+    assert email.sent_at is not None
+
+
+@pytest.mark.django_db
+def test_email_rolled_back_with_its_transaction():
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            EmailOutboxService.enqueue("alice@test.com", "Sujet", "Message")
+            raise RuntimeError("inscription annulée")
+
+    assert not OutgoingEmail.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failed_send_is_retried_with_backoff_then_abandoned(settings):
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+    email = EmailOutboxService.enqueue("alice@test.com", "Sujet", "Message")
+
+    assert EmailOutboxService.deliver_pending(DisconnectedBackend()) == (0, 1)
+    email.refresh_from_db()
+    assert email.status == EmailStatus.PENDING
+    assert email.attempts == 1
+    assert email.next_attempt_at > timezone.now()
+    assert "closed" in email.last_error
+
+    # Pas encore dû : rien à envoyer
+    assert EmailOutboxService.deliver_pending(DisconnectedBackend()) == (0, 0)
+
+    OutgoingEmail.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+    assert EmailOutboxService.deliver_pending(DisconnectedBackend()) == (0, 1)
+    email.refresh_from_db()
+    assert email.status == EmailStatus.FAILED
+
+
+@pytest.mark.django_db
+def test_worker_drains_queue_in_batches():
+    for i in range(5):
+        EmailOutboxService.enqueue(f"user{i}@test.com", "Sujet", "Message")
+
+    call_command('process_email_outbox', '--once', '--batch-size', '2')
+
+    assert len(mail.outbox) == 5
+    assert not OutgoingEmail.objects.filter(status=EmailStatus.PENDING).exists()
+
+
+class RecordingBackend(BaseEmailBackend):
+    # Relève, à chaque envoi, la transaction ouverte et ce que voit un second worker
+    def __init__(self, fail_for=(), **kwargs):
+        super().__init__(**kwargs)
+        self.fail_for = fail_for
+        self.in_transaction = []
+        self.claimed_by_other = []
+
+    def send_messages(self, email_messages):
+        self.in_transaction.append(transaction.get_connection().in_atomic_block)
+        self.claimed_by_other.append(EmailOutboxService.deliver_pending(get_connection()))
+        if email_messages[0].to[0] in self.fail_for:
+            raise smtplib.SMTPRecipientsRefused({})
+        return len(email_messages)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_emails_are_sent_outside_transaction_and_recorded_one_by_one():
+    for i in range(3):
+        EmailOutboxService.enqueue(f"user{i}@test.com", "Sujet", "Message")
+    backend = RecordingBackend(fail_for=("user1@test.com",))
+
+    assert EmailOutboxService.deliver_pending(backend) == (2, 1)
+
+    # Aucun verrou pendant les envois, et le lot réservé n'est pas repris par un autre worker
+    assert backend.in_transaction == [False, False, False]
+    assert backend.claimed_by_other == [(0, 0)] * 3
+    assert mail.outbox == []
+    statuses = dict(OutgoingEmail.objects.values_list('to', 'status'))
+    assert statuses == {
+        "user0@test.com": EmailStatus.SENT,
+        "user1@test.com": EmailStatus.PENDING,
+        "user2@test.com": EmailStatus.SENT,
+    }
+
+
+@pytest.mark.django_db
+def test_claimed_email_is_retried_after_lease_expires():
+    email = EmailOutboxService.enqueue("alice@test.com", "Sujet", "Message")
+    assert EmailOutboxService._claim(10) == [email]
+
+    # Worker arrêté avant d'avoir enregistré le résultat : l'email reste réservé jusqu'à l'expiration
+    assert EmailOutboxService.deliver_pending(get_connection()) == (0, 0)
+    OutgoingEmail.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+    assert EmailOutboxService.deliver_pending(get_connection()) == (1, 0)
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from money_transfer.models import AccountMonthlyStats, Transaction, VirtualAccount, User
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from money_transfer.services import StatsService
+
+
+def generate(**options):
+    call_command('generate_dataset', stdout=StringIO(), **options)
+
+
+def total(queryset):
+    return queryset.aggregate(total=Sum('amount'))['total'] or 0
+
+
+@pytest.mark.django_db
+def test_generated_balances_match_ledger():
+    generate(users=15, transactions=800, chunk_size=128, seed=3, days=10)
+
+    assert User.objects.filter(email__endswith='@dataset.local').count() == 15
+    assert Transaction.objects.count() == 800
+    assert set(Transaction.objects.values_list('type', flat=True)) == set(TypeTransaction.values)
+
+    success = Transaction.objects.filter(status=TransactionStatus.SUCCESS)
+    for account in VirtualAccount.objects.filter(user__isnull=False):
+        credits = total(success.filter(
+            Q(type=TypeTransaction.DEPOSIT, sender_account=account)
+            | Q(type=TypeTransaction.TRANSFER, receiver_account=account)
+        ))
+        debits = total(success.filter(
+            type__in=[TypeTransaction.TRANSFER, TypeTransaction.WITHDRAWAL],
+            sender_account=account
+        ))
+        assert account.balance == credits - debits >= 0
+
+    platform_balance = VirtualAccount.objects.filter(platform__isnull=False).aggregate(total=Sum('balance'))['total']
+    assert platform_balance == total(success.filter(type=TypeTransaction.FEE))
+
+    # Historique réparti dans le passé, compteurs déjà recalculés
+    assert Transaction.objects.filter(created_at__lt=timezone.now() - timedelta(days=5)).exists()
+    changes = StatsService.reconcile_platform_counters()
+    assert all(before == after for before, after in changes.values())
+
+    # Cumuls mensuels reconstruits en masse : identiques à une reconstruction compte par compte
+    rebuilt = list(AccountMonthlyStats.objects.order_by('account_id', 'month').values())
+    active = set(success.exclude(type=TypeTransaction.FEE).values_list('sender_account_id', flat=True))
+    assert active and active <= {row['account_id'] for row in rebuilt}
+    for row in rebuilt:
+        StatsService.rebuild_account_month(VirtualAccount.objects.get(pk=row['account_id']), row['month'])
+    assert list(AccountMonthlyStats.objects.order_by('account_id', 'month').values()) == rebuilt
+
+
+@pytest.mark.django_db
+def test_generate_dataset_refuses_existing_prefix():
+    generate(users=2, transactions=10, seed=1)
+
+    with pytest.raises(CommandError):
+        generate(users=2, transactions=10)
+
+    generate(users=2, transactions=10, prefix='other')
+    assert User.objects.count() == 4
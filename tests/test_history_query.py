@@ -0,0 +1,78 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from money_transfer.models import Transaction
+from money_transfer.services import TransactionService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def users(make_active_user):
+    alice = make_active_user("alice@test.com", "91000000", 0)
+    bob = make_active_user("bob@test.com", "91000001", 0)
+    TransactionService.deposit(alice, 10000)
+    TransactionService.transfer(alice, bob.email, 1000)
+    TransactionService.transfer(bob, alice.email, 500)
+    TransactionService.withdraw(alice, 1000)
+    return alice, bob
+
+
+@pytest.mark.django_db
+def test_history_lists_each_transaction_once(users):
+    alice, bob = users
+    account = alice.virtual_account
+
+    history = list(TransactionService.get_user_transactions(alice, limit=None))
+    expected = Transaction.objects.filter(sender_account=account) | Transaction.objects.filter(receiver_account=account)
+    expected = list(expected.distinct().order_by('-created_at', '-id'))
+
+    assert [txn.id for txn in history] == [txn.id for txn in expected]
+    assert [txn.id for txn in TransactionService.get_user_transactions(alice, limit=2)] == [txn.id for txn in expected[:2]]
+
+
+@pytest.mark.django_db
+def test_history_sides_use_their_own_index(users):
+    alice, bob = users
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    sent, received = TransactionService._history_sides(alice.virtual_account)
+    sent_plan = sent[:50].explain()
+    received_plan = received[:50].explain()
+
+    assert 'transaction_sent_history_idx' in sent_plan
+    assert 'transaction_recv_history_idx' in received_plan
+    for plan in (sent_plan, received_plan):
+        # Index déjà trié : ni tri ni dédoublonnage
+        assert 'TEMP B-TREE' not in plan
+        assert 'Sort' not in plan
+        assert 'Unique' not in plan
+
+
+@pytest.mark.django_db
+def test_history_page_is_a_list_on_every_backend(users):
+    alice, bob = users
+    no_account = User.objects.create_user(email="none@test.com", phone="91000002", password="pass1234")
+
+    assert isinstance(TransactionService.get_user_transactions(alice, limit=2), list)
+    assert TransactionService.get_user_transactions(no_account, limit=2) == []
+
+
+@pytest.mark.django_db
+def test_history_page_uses_a_single_union_query(users):
+    if not connection.features.supports_slicing_ordering_in_compound:
+        pytest.skip("LIMIT par moitié dans un UNION non supporté (SQLite) : fusion en mémoire")
+    alice, bob = users
+    account = alice.virtual_account
+    expected = Transaction.objects.filter(sender_account=account) | Transaction.objects.filter(receiver_account=account)
+    expected = list(expected.distinct().order_by('-created_at', '-id')[:3])
+
+    with CaptureQueriesContext(connection) as queries:
+        page = TransactionService.get_user_transactions(alice, limit=3)
+
+    assert len(queries) == 1
+    assert 'UNION ALL' in queries.captured_queries[0]['sql']
+    assert [txn.id for txn in page] == [txn.id for txn in expected]
@@ -0,0 +1,103 @@
+import pytest
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from money_transfer.models import VirtualAccount, Transaction, IdempotencyKey
+from money_transfer.models.user import UserStatus
+from money_transfer.services import TransactionService, IdempotencyService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user():
+    user = User.objects.create_user(
+        email="idem@test.com",
+        phone="96000000",
+        password="pass1234",
+        status=UserStatus.ACTIVE,
+        is_verified=True
+    )
+    VirtualAccount.objects.create(user=user, balance=0, is_active=True)
+    return User.objects.select_related('virtual_account').get(pk=user.pk)
+
+
+@pytest.mark.django_db
+def test_replayed_deposit_returns_original_transaction(user):
+    success, message, first = TransactionService.deposit(user, 1000, idempotency_key="abc")
+    assert success
+
+    success, message, replay = TransactionService.deposit(user, 1000, idempotency_key="abc")
+    assert success
+    assert replay.pk == first.pk
+
+    assert Transaction.objects.filter(sender_account=user.virtual_account).count() == 1
+    user.virtual_account.refresh_from_db()
+    assert user.virtual_account.balance == 1000
+
+
+@pytest.mark.django_db
+def test_failed_operation_releases_key(user):
+    success, message, txn = TransactionService.withdraw(user, 1000, idempotency_key="retry-me")
+    assert not success
+    assert not IdempotencyKey.objects.filter(key="retry-me").exists()
+
+
+@pytest.mark.django_db
+def test_key_cannot_be_reused_for_another_operation(user):
+    TransactionService.deposit(user, 5000, idempotency_key="same")
+
+    success, message, txn = TransactionService.withdraw(user, 1000, idempotency_key="same")
+    assert not success
+    assert txn is None
+
+
+@pytest.mark.django_db
+def test_purge_expired_keys(user):
+    success, message, txn = TransactionService.deposit(user, 1000, idempotency_key="old")
+    IdempotencyKey.objects.filter(key="old").update(expires_at=timezone.now() - timedelta(seconds=1))
+
+    assert IdempotencyService.purge_expired(batch_size=1) == 1
+    assert not IdempotencyKey.objects.exists()
+
+
+@pytest.mark.django_db
+def test_key_cannot_be_replayed_with_other_arguments(user):
+    receiver = User.objects.create_user(
+        email="idem-receiver@test.com",
+        phone="96000001",
+        password="pass1234",
+        status=UserStatus.ACTIVE,
+        is_verified=True
+    )
+    VirtualAccount.objects.create(user=receiver, balance=0, is_active=True)
+    TransactionService.deposit(user, 10000)
+
+    success, message, first = TransactionService.transfer(user, receiver.email, 1000, idempotency_key="pay-1")
+    assert success
+
+    # Même clé, autre montant : refusé au lieu de renvoyer le transfert d'origine
+    success, message, txn = TransactionService.transfer(user, receiver.email, 5000, idempotency_key="pay-1")
+    assert not success
+    assert txn is None
+
+    # Même clé, autre destinataire : refusé aussi (lecture depuis le cache ou la base)
+    IdempotencyService._cache.clear()
+    success, message, txn = TransactionService.transfer(user, user.email, 1000, idempotency_key="pay-1")
+    assert not success
+
+    # Rejeu à l'identique : transaction d'origine
+    success, message, replay = TransactionService.transfer(user, receiver.email, 1000, idempotency_key="pay-1")
+    assert success and replay.pk == first.pk
+    assert Transaction.objects.filter(sender_account=user.virtual_account, type='TRANSFER').count() == 1
+
+
+@pytest.mark.django_db
+def test_key_without_fingerprint_is_not_replayed(user):
+    success, message, first = TransactionService.deposit(user, 1000, idempotency_key="blank")
+    IdempotencyKey.objects.filter(key="blank").update(fingerprint='')
+    IdempotencyService._cache.clear()
+
+    success, message, txn = TransactionService.deposit(user, 1000, idempotency_key="blank")
+    assert not success
+    assert txn is None
@@ -0,0 +1,115 @@
+from unittest import mock
+
+import pytest
+from django.db import connection, OperationalError
+from django.test.utils import CaptureQueriesContext
+from money_transfer.models import VirtualAccount, Transaction
+from money_transfer.models.transaction import TransactionStatus
+from money_transfer.services import AccountLockService, TransactionService, StatsService, retry_on_conflict
+
+
+class PgError(Exception):
+    # Erreur du pilote PostgreSQL (seul pgcode est lu)
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def pg_operational_error(pgcode):
+    error = OperationalError(f"pgcode {pgcode}")
+    error.__cause__ = PgError(pgcode)
+    return error
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(settings):
+    settings.TRANSACTION_RETRY_BACKOFF_MS = 0
+    AccountLockService.reset_stats()
+
+
+@pytest.mark.django_db
+def test_lock_accounts_in_ascending_order_without_duplicates(make_active_user):
+    accounts = [make_active_user(f"l{i}@test.com", f"9600000{i}", 0).virtual_account for i in range(3)]
+    first, second, third = sorted(accounts, key=lambda account: account.id)
+
+    with CaptureQueriesContext(connection) as context:
+        locked = AccountLockService.lock_accounts(third, first.id, None, third, second, first)
+
+    assert list(locked) == [first.id, second.id, third.id]
+    select = context.captured_queries[-1]['sql']
+    assert select.count(str(third.id)) == 1
+    assert 'ORDER BY' in select and select.rstrip().endswith('ASC')
+
+
+def test_lock_accounts_without_accounts_runs_no_query():
+    assert AccountLockService.lock_accounts(None) == {}
+
+
+@pytest.mark.parametrize('error', [
+    OperationalError('database is locked'),
+    pg_operational_error('40P01'),
+    pg_operational_error('40001'),
+    pg_operational_error('55P03'),
+])
+def test_retry_on_conflict_replays_retryable_errors(error):
+    calls = []
+
+    @retry_on_conflict
+    def operation():
+        calls.append(1)
+        if len(calls) < 3:
+            raise error
+        return 'ok'
+
+    assert operation() == 'ok'
+    assert len(calls) == 3
+    assert AccountLockService.get_stats() == {'retries': 2, 'conflicts': 2, 'gave_up': 0}
+
+
+def test_retry_on_conflict_gives_up_after_max_attempts(settings):
+    settings.TRANSACTION_MAX_ATTEMPTS = 2
+
+    @retry_on_conflict
+    def operation():
+        raise pg_operational_error('40P01')
+
+    with pytest.raises(OperationalError):
+        operation()
+    assert AccountLockService.get_stats()['gave_up'] == 1
+
+
+@pytest.mark.parametrize('error', [OperationalError('no such table: foo'), pg_operational_error('23505')])
+def test_retry_on_conflict_passes_non_retryable_errors_through(error):
+    calls = []
+
+    @retry_on_conflict
+    def operation():
+        calls.append(1)
+        raise error
+
+    with pytest.raises(OperationalError):
+        operation()
+    assert len(calls) == 1
+    assert AccountLockService.get_stats()['conflicts'] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_conflict_inside_operation_is_replayed_not_recorded_as_failure(make_active_user):
+    user = make_active_user("retry@test.com", "96000010", 0)
+    record = StatsService.record_transactions
+    failures = [pg_operational_error('40P01')]
+
+    def flaky_record(transactions):
+        # Interblocage sur les compteurs lors de la première tentative seulement
+        if failures:
+            raise failures.pop()
+        return record(transactions)
+
+    with mock.patch.object(StatsService, 'record_transactions', side_effect=flaky_record):
+        success, message, txn = TransactionService.deposit(user, 1000)
+
+    assert success, message
+    assert not Transaction.objects.filter(status=TransactionStatus.FAILED).exists()
+    assert Transaction.objects.count() == 1
+    assert VirtualAccount.objects.get(user=user).balance == 1000
+    assert AccountLockService.get_stats()['retries'] == 1
@@ -0,0 +1,77 @@
+import logging
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from money_transfer.metrics import registry, MetricsRegistry
+from money_transfer.models import VirtualAccount
+from money_transfer.models.user import UserStatus
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.fixture
+def admin_client(client, db):
+    admin = User.objects.create_superuser(email="admin@test.com", phone="91900000", password="pass1234")
+    VirtualAccount.objects.create(user=admin, balance=0, is_active=True)
+    client.force_login(admin)
+    return client
+
+
+def test_views_are_measured_and_exposed(admin_client):
+    admin_client.get(reverse('admin_dashboard'))
+    admin_client.get(reverse('admin_dashboard'))
+
+    response = admin_client.get(reverse('metrics'))
+
+    assert response.status_code == 200
+    body = response.content.decode()
+    assert 'money_transfer_request_duration_seconds_count{view="admin_dashboard",method="GET"} 2' in body
+    assert 'money_transfer_request_db_queries_bucket{view="admin_dashboard",method="GET",le="+Inf"} 2' in body
+    assert 'money_transfer_request_template_duration_seconds_sum{view="admin_dashboard",method="GET"}' in body
+    series = registry.snapshot()['money_transfer_request_template_duration_seconds']['admin_dashboard|GET']
+    assert series['sum'] > 0
+
+
+def test_metrics_endpoint_is_admin_only(client, settings, db):
+    settings.METRICS_TOKEN = 'secret'
+    user = User.objects.create_user(
+        email="alice@test.com", phone="91900001", password="pass1234", status=UserStatus.ACTIVE, is_verified=True
+    )
+    client.force_login(user)
+
+    assert client.get(reverse('metrics')).status_code == 302
+    client.logout()
+    assert client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret').status_code == 200
+
+
+def test_workers_are_aggregated_through_shared_directory(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    (tmp_path / '1.json').write_text(
+        '{"money_transfer_request_db_queries": {"dashboard|GET": '
+        '{"buckets": [1, 0, 0, 0, 0, 0, 0, 0, 0], "sum": 1, "count": 1}}}'
+    )
+
+    worker = MetricsRegistry()
+    worker.observe('dashboard', 'GET', {'money_transfer_request_db_queries': 4})
+
+    body = worker.render()
+    assert 'money_transfer_request_db_queries_count{view="dashboard",method="GET"} 2' in body
+    assert 'money_transfer_request_db_queries_bucket{view="dashboard",method="GET",le="5"} 2' in body
+
+
+def test_slow_requests_logged_with_sql(admin_client, settings, caplog):
+    settings.SLOW_REQUEST_THRESHOLD_MS = 0
+
+    with caplog.at_level(logging.WARNING, logger='money_transfer'):
+        admin_client.get(reverse('admin_users'))
+
+    slow = [record.getMessage() for record in caplog.records if 'Requête lente' in record.getMessage()]
+    assert slow and 'SELECT' in slow[0]
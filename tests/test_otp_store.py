@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from money_transfer.models import OTP
+from money_transfer.models.user import OTPType
+from money_transfer.services import OTPService
+from money_transfer.services.otp_store import (
+    CacheOTPStore, DatabaseOTPStore, OTP_VALID, OTP_EXPIRED, OTP_INVALID
+)
+
+User = get_user_model()
+
+STORES = [
+    'money_transfer.services.otp_store.DatabaseOTPStore',
+    'money_transfer.services.otp_store.CacheOTPStore',
+]
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(email="alice@test.com", phone="90000000", password="pass1234")
+
+
+@pytest.mark.parametrize('store', STORES)
+def test_otp_consumed_once_and_reissue_invalidates(settings, user, store):
+    settings.OTP_STORE = store
+
+    first = OTPService.create_otp(user, OTPType.WITHDRAWAL)
+    second = OTPService.create_otp(user, OTPType.WITHDRAWAL)
+
+    if first.code != second.code:
+        assert OTPService.validate_otp(user, first.code, OTPType.WITHDRAWAL)[0] is False
+    assert OTPService.validate_otp(user, second.code, OTPType.ACCOUNT_VALIDATION)[0] is False
+    assert OTPService.validate_otp(user, second.code, OTPType.WITHDRAWAL)[0] is True
+    assert OTPService.validate_otp(user, second.code, OTPType.WITHDRAWAL)[0] is False
+
+
+@pytest.mark.parametrize('store_class', [DatabaseOTPStore, CacheOTPStore])
+def test_expired_otp_is_reported(user, store_class):
+    store = store_class()
+    store.issue(user, OTPType.WITHDRAWAL, '123456', expires_at=timezone.now() - timedelta(seconds=1))
+
+    assert store.consume(user, OTPType.WITHDRAWAL, '123456') == OTP_EXPIRED
+    assert store.consume(user, OTPType.WITHDRAWAL, '654321') == OTP_INVALID
+
+
+def test_cache_store_keeps_only_a_hash(user):
+    store = CacheOTPStore()
+    store.issue(user, OTPType.WITHDRAWAL, '123456', expires_at=timezone.now() + timedelta(minutes=2))
+
+    entry = cache.get(CacheOTPStore._key(user, OTPType.WITHDRAWAL))
+    assert '123456' not in str(entry)
+    assert not OTP.objects.exists()
+    assert store.consume(user, OTPType.WITHDRAWAL, '123456') == OTP_VALID
+
+
+def test_database_cleanup_deletes_used_and_expired(settings, user):
+    settings.OTP_STORE = STORES[0]
+    store = DatabaseOTPStore()
+    store.issue(user, OTPType.WITHDRAWAL, '111111', expires_at=timezone.now() - timedelta(minutes=1))
+    store.issue(user, OTPType.ACCOUNT_VALIDATION, '222222', expires_at=timezone.now() + timedelta(minutes=2))
+    store.issue(user, OTPType.ACCOUNT_VALIDATION, '333333', expires_at=timezone.now() + timedelta(minutes=2))
+
+    assert OTPService.cleanup_expired_otps() == 2
+    assert list(OTP.objects.values_list('code', flat=True)) == ['333333']
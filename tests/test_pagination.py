@@ -0,0 +1,86 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from money_transfer.models import VirtualAccount, Transaction
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+from money_transfer.models.user import UserStatus
+from money_transfer.pagination import paginate_keyset, decode_cursor, encode_cursor
+
+User = get_user_model()
+
+
+@pytest.fixture
+def account():
+    user = User.objects.create_user(
+        email="pages@test.com",
+        phone="99000000",
+        password="pass1234",
+        status=UserStatus.ACTIVE,
+        is_verified=True
+    )
+    account = VirtualAccount.objects.create(user=user, balance=0, is_active=True)
+    Transaction.objects.bulk_create(
+        Transaction(
+            type=TypeTransaction.DEPOSIT,
+            status=TransactionStatus.SUCCESS,
+            amount=100,
+            net_amount=100,
+            sender_account=account,
+            receiver_account=account,
+        )
+        for _ in range(25)
+    )
+    return account
+
+
+@pytest.mark.django_db
+def test_keyset_pages_cover_history_without_overlap(account):
+    seen = []
+    cursor = None
+    while True:
+        items, next_cursor = paginate_keyset(Transaction.objects.all(), decode_cursor(cursor), page_size=10)
+        seen.extend(txn.id for txn in items)
+        if next_cursor is None:
+            break
+        cursor = next_cursor
+
+    expected = list(Transaction.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_keyset_query_never_uses_offset(account, django_assert_num_queries):
+    first = Transaction.objects.order_by('-created_at', '-id').first()
+    with django_assert_num_queries(1) as captured:
+        paginate_keyset(Transaction.objects.all(), decode_cursor(encode_cursor(first)), page_size=10)
+    assert 'OFFSET' not in captured.captured_queries[0]['sql'].upper()
+
+
+def test_invalid_cursor_is_ignored():
+    assert decode_cursor('not-a-cursor') is None
+    assert decode_cursor('') is None
+
+
+@pytest.mark.django_db
+def test_history_view_paginates(client, account, settings):
+    settings.TRANSACTIONS_PAGE_SIZE = 10
+    client.force_login(account.user)
+
+    response = client.get(reverse('transactions_history'))
+    assert response.status_code == 200
+    assert len(response.context['transactions']) == 10
+    assert response.context['next_cursor']
+
+    response = client.get(reverse('transactions_history'), {'cursor': response.context['next_cursor']})
+    assert len(response.context['transactions']) == 10
+
+
+@pytest.mark.django_db
+def test_admin_transactions_view_filters_then_paginates(client, account, settings):
+    settings.TRANSACTIONS_PAGE_SIZE = 10
+    admin = User.objects.create_superuser(email="admin@test.com", phone="99000001", password="pass1234")
+    client.force_login(admin)
+
+    response = client.get(reverse('admin_transactions'), {'type': 'DEPOSIT'})
+    assert response.status_code == 200
+    assert len(response.context['transactions']) == 10
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from money_transfer.forms.admin_forms import PlatformConfigForm
+from money_transfer.models import Platform
+from money_transfer.services import TransactionService, PlatformConfigService, platform_service
+
+
+def platform_queries(captured):
+    return [q['sql'] for q in captured if '"money_transfer_platform"' in q['sql']]
+
+
+@pytest.mark.django_db
+def test_withdrawal_does_not_query_platform_once_warm(make_active_user):
+    user = make_active_user("warm@test.com", "98000000", 100000)
+    TransactionService.withdraw(user, 1000)  # préchauffage du cache
+
+    with CaptureQueriesContext(connection) as queries:
+        success, message, txn = TransactionService.withdraw(user, 1000)
+
+    assert success
+    assert platform_queries(queries.captured_queries) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_config_form_invalidates_cache():
+    platform = PlatformConfigService.get_platform()
+    assert platform.withdrawal_fee_rate == 2
+
+    form = PlatformConfigForm({'name': platform.name, 'withdrawal_fee_rate': 5}, instance=platform)
+    assert form.is_valid()
+    form.save()
+
+    assert PlatformConfigService.get_fee_rate() == 5
+
+
+@pytest.mark.django_db(transaction=True)
+def test_direct_save_invalidates_cache():
+    # Enregistrement hors formulaire (admin Django, shell) : le signal post_save invalide le cache
+    platform = PlatformConfigService.get_platform()
+    platform.withdrawal_fee_rate = 7
+    platform.save()
+
+    assert PlatformConfigService.get_fee_rate() == 7
+
+
+@pytest.mark.django_db
+def test_local_copy_expires_without_shared_cache(settings, monkeypatch):
+    # Modification faite par un autre processus (version partagée invisible ici) :
+    # la copie locale est rechargée une fois PLATFORM_CONFIG_LOCAL_TTL écoulé
+    settings.PLATFORM_CONFIG_LOCAL_TTL = 30
+    platform = PlatformConfigService.get_platform()
+    assert platform.withdrawal_fee_rate == 2
+
+    Platform.objects.filter(pk=platform.pk).update(withdrawal_fee_rate=9)
+    assert PlatformConfigService.get_fee_rate() == 2
+
+    now = time.monotonic()
+    monkeypatch.setattr(platform_service.time, 'monotonic', lambda: now + 31)
+    assert PlatformConfigService.get_fee_rate() == 9
@@ -0,0 +1,74 @@
+import importlib
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from money_transfer.models import PlatformCounter, VirtualAccount
+from money_transfer.models.user import UserStatus
+from money_transfer.services import TransactionService, AccountService, StatsService
+
+User = get_user_model()
+
+
+def register_user(email, phone):
+    # Parcours d'inscription : utilisateur en attente + compte virtuel inactif
+    user = User.objects.create_user(email=email, phone=phone, password="pass1234")
+    AccountService.create_user_account(user)
+    return User.objects.select_related('virtual_account').get(pk=user.pk)
+
+
+@pytest.mark.django_db
+def test_counters_follow_service_layer_and_match_reconcile():
+    alice = register_user("alice@test.com", "95000000")
+    bob = register_user("bob@test.com", "95000001")
+    AccountService.activate_account(alice)
+    AccountService.activate_account(bob)
+    AccountService.suspend_account(bob)
+
+    TransactionService.deposit(alice, 10000)
+    TransactionService.withdraw(alice, 1000)
+    TransactionService.withdraw(alice, 100000)  # refusé : aucune ligne écrite
+    TransactionService.bulk_transfer(alice, [(bob.email, 100)])  # destinataire suspendu
+
+    counters = StatsService.get_platform_counters()
+    assert counters['users'] == 2
+    assert counters['users.status.ACTIVE'] == 1
+    assert counters['users.status.SUSPENDED'] == 1
+    assert counters['users.status.PENDING'] == 0
+    assert counters['transactions'] == 3  # dépôt, retrait, frais
+    assert counters['volume'] == 10000 + 1000 + 20
+    assert counters['fees'] == 20
+    assert counters['transactions_today'] == 3
+
+    changes = StatsService.reconcile_platform_counters()
+    assert all(before == after for before, after in changes.values())
+
+
+@pytest.mark.django_db
+def test_admin_dashboard_reads_counters(client):
+    admin = User.objects.create_superuser(email="admin@test.com", phone="95000009", password="pass1234")
+    VirtualAccount.objects.create(user=admin, balance=0, is_active=True)
+    StatsService.reconcile_platform_counters()
+    client.force_login(admin)
+
+    response = client.get(reverse('admin_dashboard'))
+    assert response.status_code == 200
+    assert response.context['total_users'] == 1
+
+
+@pytest.mark.django_db
+def test_migration_initializes_counters_of_existing_data():
+    # Base antérieure aux compteurs : la migration de données les calcule depuis les tables
+    alice = register_user("alice@test.com", "95000000")
+    AccountService.activate_account(alice)
+    TransactionService.deposit(alice, 10000)
+    PlatformCounter.objects.all().delete()
+
+    migration = importlib.import_module('money_transfer.migrations.0011_reconcile_platform_counters')
+    migration.reconcile_platform_counters(apps, None)
+
+    counters = StatsService.get_platform_counters()
+    assert counters['users'] == 1
+    assert counters['transactions'] == 1
+    assert counters['volume'] == 10000
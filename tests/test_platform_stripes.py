@@ -0,0 +1,33 @@
+import pytest
+from django.test import override_settings
+from money_transfer.models import Platform, Transaction
+from money_transfer.models.transaction import TypeTransaction
+from money_transfer.services import AccountService, TransactionService
+
+
+@pytest.mark.django_db
+@override_settings(PLATFORM_FEE_STRIPES=4)
+def test_withdrawal_fees_are_spread_over_stripes(make_active_user):
+    users = [make_active_user(f"s{i}@test.com", f"9700000{i}", 100000) for i in range(4)]
+
+    for user in users:
+        success, message, txn = TransactionService.withdraw(user, 10000)
+        assert success
+        fee = Transaction.objects.select_related('receiver_account').get(
+            sender_account=user.virtual_account,
+            type=TypeTransaction.FEE
+        )
+        assert fee.receiver_account.stripe == user.virtual_account.id % 4
+
+    platform = Platform.objects.get()
+    assert platform.virtual_accounts.count() == 4
+    # 2% de 10000 par retrait
+    assert AccountService.get_platform_balance(platform) == 4 * 200
+
+
+@pytest.mark.django_db
+def test_get_or_create_platform_account_is_stable():
+    first = AccountService.get_or_create_platform_account()
+    second = AccountService.get_or_create_platform_account()
+    assert first.pk == second.pk
+    assert first.stripe == 0
@@ -0,0 +1,120 @@
+"""
+Budgets de requêtes SQL et de taille de réponse par vue nommée.
+
+Les données semées remplissent chaque liste (historiques, utilisateurs, transactions) :
+un N+1 (template qui parcourt sender_account.user, par exemple) ajoute au moins une
+requête par ligne et dépasse le budget. Mesures à froid (caches vidés par conftest) ; les budgets laissent
+une petite marge au-dessus du nombre mesuré.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from money_transfer.models import Transaction
+from money_transfer.metrics import registry
+from money_transfer.services import TransactionService, AccountService
+
+
+USERS = 12
+
+
+@pytest.fixture
+def seeded(db, settings, make_active_user):
+    # Hachage rapide : le coût du semis ne doit pas dominer la suite
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    # Un administrateur, des utilisateurs actifs et un historique varié par compte
+    admin = make_active_user("admin@test.com", "93900000", is_staff=True, is_superuser=True)
+    users = [make_active_user(f"user{i}@test.com", f"939{i:05d}") for i in range(1, USERS + 1)]
+    alice = users[0]
+
+    for user in users:
+        TransactionService.deposit(user, 100000)
+    for i, user in enumerate(users):
+        receiver = users[(i + 1) % len(users)]
+        TransactionService.transfer(user, receiver.email, 1000 + i)
+        if user != alice:
+            TransactionService.transfer(alice, user.email, 100)
+    for user in users[:6]:
+        TransactionService.withdraw(user, 2000)
+    TransactionService.bulk_transfer(alice, [(user.email, 50) for user in users[1:]])
+    AccountService.suspend_account(users[-1])
+
+    return {
+        'admin': admin,
+        'alice': alice,
+        'suspended': users[-1],
+        'transaction': Transaction.objects.filter(sender_account=alice.virtual_account).latest('created_at'),
+    }
+
+
+def measure(client, url, **extra):
+    # Les réponses en flux (relevés CSV) sont consommées dans la mesure
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, **extra)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+    return response, content, len(context.captured_queries)
+
+
+# (nom de l'URL, argument (clé de `seeded`), budget de requêtes, budget en octets) ;
+# l'utilisateur connecté est fixé par chaque test (alice, puis l'administrateur)
+USER_VIEWS = [
+    ('dashboard', None, 8, 30000),
+    ('transactions_history', None, 6, 100000),
+    ('transaction_detail', 'transaction', 5, 20000),
+    ('transactions_statement', None, 5, 10000),
+    ('deposit', None, 5, 20000),
+    ('withdrawal_request', None, 5, 20000),
+    ('withdrawal_confirm', None, 4, 20000),
+    ('transfer', None, 5, 20000),
+    ('profile', None, 5, 25000),
+]
+
+ADMIN_VIEWS = [
+    ('admin_dashboard', None, 10, 50000),
+    ('admin_users', None, 7, 50000),
+    ('admin_user_detail', 'alice', 11, 35000),
+    ('admin_suspend_user', 'alice', 5, 15000),
+    ('admin_reactivate_user', 'suspended', 5, 15000),
+    ('admin_user_statement', 'alice', 6, 10000),
+    ('admin_platform_config', None, 5, 15000),
+    ('admin_transactions', None, 5, 100000),
+    ('admin_statistics', None, 5, 20000),
+    ('admin_statistics_json', None, 5, 2000),
+    ('metrics', None, 4, 20000),
+]
+
+
+def resolve(name, arg, seeded):
+    if arg == 'transaction':
+        return reverse(name, args=[seeded['transaction'].reference])
+    if arg:
+        return reverse(name, args=[seeded[arg].id])
+    return reverse(name)
+
+
+@pytest.mark.parametrize('name, arg, max_queries, max_bytes', USER_VIEWS)
+def test_user_view_budget(client, seeded, name, arg, max_queries, max_bytes):
+    client.force_login(seeded['alice'])
+    if name == 'withdrawal_confirm':
+        session = client.session
+        session.update({'withdrawal_amount': 1000, 'withdrawal_fee': 20, 'withdrawal_net': 980})
+        session.save()
+
+    response, content, queries = measure(client, resolve(name, arg, seeded))
+
+    assert response.status_code == 200
+    assert queries <= max_queries, f"{name} : {queries} requêtes SQL (budget {max_queries})"
+    assert len(content) <= max_bytes, f"{name} : {len(content)} octets (budget {max_bytes})"
+
+
+@pytest.mark.parametrize('name, arg, max_queries, max_bytes', ADMIN_VIEWS)
+def test_admin_view_budget(client, seeded, name, arg, max_queries, max_bytes):
+    client.force_login(seeded['admin'])
+    # Les histogrammes accumulés par les tests précédents gonfleraient /metrics
+    registry.reset()
+
+    response, content, queries = measure(client, resolve(name, arg, seeded))
+
+    assert response.status_code == 200
+    assert queries <= max_queries, f"{name} : {queries} requêtes SQL (budget {max_queries})"
+    assert len(content) <= max_bytes, f"{name} : {len(content)} octets (budget {max_bytes})"
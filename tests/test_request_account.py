@@ -0,0 +1,70 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from money_transfer.models import Transaction
+from money_transfer.services import TransactionService
+
+User = get_user_model()
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+ACCOUNT_BACKEND = 'money_transfer.backends.AccountModelBackend'
+
+
+def count_queries(client, user, backend, method, url, data=None):
+    client.force_login(user, backend=backend)
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data)
+    assert response.status_code in (200, 302)
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_request_account_loaded_with_user(client, make_active_user):
+    alice = make_active_user("alice@test.com", "98000000", balance=5000)
+    client.force_login(alice, backend=ACCOUNT_BACKEND)
+
+    response = client.get(reverse('dashboard'))
+    request = response.wsgi_request
+    assert request.account.id == alice.virtual_account.id
+    assert User.virtual_account.is_cached(request.user)
+
+
+@pytest.mark.django_db
+def test_sessions_of_previous_backend_stay_logged_in(client, make_active_user):
+    # Sessions ouvertes avant le passage à AccountModelBackend : toujours reconnues
+    alice = make_active_user("alice@test.com", "98000000")
+    client.force_login(alice, backend=MODEL_BACKEND)
+
+    response = client.get(reverse('dashboard'))
+    assert response.status_code == 200
+    assert response.wsgi_request.user == alice
+
+
+@pytest.mark.django_db
+def test_new_logins_use_account_backend(client, make_active_user):
+    make_active_user("alice@test.com", "98000000")
+    assert client.login(email="alice@test.com", password="pass1234")
+
+    assert client.session['_auth_user_backend'] == ACCOUNT_BACKEND
+
+
+@pytest.mark.django_db
+def test_views_save_one_round_trip(client, make_active_user):
+    alice = make_active_user("alice@test.com", "98000000", balance=5000)
+    TransactionService.deposit(User.objects.get(pk=alice.pk), 1000)
+    txn = Transaction.objects.get()
+
+    # Vues qui lisent le compte de l'utilisateur connecté ; chaque mesure part d'un cache chaud
+    views = [
+        ('get', reverse('dashboard'), None),
+        ('get', reverse('transactions_history'), None),
+        ('get', reverse('transaction_detail', args=[txn.reference]), None),
+        ('post', reverse('deposit'), {'amount': 100}),
+    ]
+    for method, url, data in views:
+        count_queries(client, alice, ACCOUNT_BACKEND, method, url, data)
+        before = count_queries(client, alice, MODEL_BACKEND, method, url, data)
+        after = count_queries(client, alice, ACCOUNT_BACKEND, method, url, data)
+        assert after <= before - 1, url
@@ -0,0 +1,59 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from money_transfer.models import OTP
+from money_transfer.models.user import OTPType
+from money_transfer.services import RetentionService
+
+User = get_user_model()
+
+
+def make_otps(user, count, **fields):
+    OTP.objects.bulk_create([
+        OTP(user=user, code=f"{i:06d}", otp_type=OTPType.WITHDRAWAL, **fields)
+        for i in range(count)
+    ])
+
+
+@pytest.mark.django_db
+def test_purge_deletes_in_bounded_pk_ranges():
+    user = User.objects.create_user(email="alice@test.com", phone="91000000", password="pass1234")
+    now = timezone.now()
+    make_otps(user, 5, expires_at=now - timedelta(minutes=1))
+    make_otps(user, 2, expires_at=now + timedelta(minutes=5))
+    make_otps(user, 3, expires_at=now + timedelta(minutes=5), is_used=True)
+
+    with CaptureQueriesContext(connection) as context:
+        deleted, elapsed = RetentionService.purge('otps', batch_size=3, sleep=0)
+
+    assert deleted == 8
+    assert OTP.objects.filter(is_used=False, expires_at__gt=now).count() == 2
+    assert OTP.objects.count() == 2
+    deletes = [query['sql'] for query in context.captured_queries if query['sql'].startswith('DELETE')]
+    assert len(deletes) == 3
+    assert all('BETWEEN' in sql or '>=' in sql for sql in deletes)
+
+
+@pytest.mark.django_db
+def test_command_purges_expired_sessions_and_reports_rate():
+    for _ in range(3):
+        session = SessionStore()
+        session.create()
+    Session.objects.update(expire_date=timezone.now() - timedelta(days=1))
+    live = SessionStore()
+    live.create()
+
+    out = StringIO()
+    call_command('purge_expired_data', '--batch-size', '2', '--sleep', '0', stdout=out)
+
+    assert list(Session.objects.values_list('session_key', flat=True)) == [live.session_key]
+    assert 'Lignes/s' in out.getvalue()
+    assert 'sessions' in out.getvalue()
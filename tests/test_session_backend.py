@@ -0,0 +1,71 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from money_transfer.models import VirtualAccount
+from money_transfer.models.user import UserStatus
+from money_transfer.session_backend import SessionStore
+
+User = get_user_model()
+
+
+@pytest.fixture
+def logged_client(client, db):
+    user = User.objects.create_user(
+        email="alice@test.com",
+        phone="91500000",
+        password="pass1234",
+        status=UserStatus.ACTIVE,
+        is_verified=True
+    )
+    VirtualAccount.objects.create(user=user, balance=0, is_active=True)
+    client.force_login(user)
+    return client
+
+
+def session_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    sqls = [query['sql'] for query in context.captured_queries if 'django_session' in query['sql']]
+    writes = [sql for sql in sqls if sql.startswith(('INSERT', 'UPDATE'))]
+    return len(sqls) - len(writes), len(writes)
+
+
+@pytest.mark.parametrize('use_cache', [False, True])
+def test_read_only_requests_do_not_write_session(settings, logged_client, use_cache):
+    settings.SESSION_WRITE_CACHE = use_cache
+    logged_client.get(reverse('dashboard'))
+
+    reads, writes = session_queries(logged_client, reverse('dashboard'))
+
+    assert writes == 0
+    assert reads == (0 if use_cache else 1)
+
+
+def test_session_refreshed_when_remaining_ttl_below_threshold(settings, logged_client):
+    expire_date = Session.objects.get().expire_date
+
+    # Durée restante toujours sous le seuil : chaque requête prolonge la session
+    settings.SESSION_REFRESH_THRESHOLD = settings.SESSION_COOKIE_AGE + 60
+    reads, writes = session_queries(logged_client, reverse('dashboard'))
+
+    assert writes == 1
+    assert Session.objects.get().expire_date > expire_date
+
+
+@pytest.mark.django_db
+def test_store_writes_only_modified_sessions(django_assert_num_queries):
+    store = SessionStore()
+    store['withdrawal_amount'] = 1000
+    store.create()
+
+    store = SessionStore(store.session_key)
+    assert store['withdrawal_amount'] == 1000
+    with django_assert_num_queries(0):
+        store.save()
+
+    store['withdrawal_fee'] = 20
+    store.save()
+    assert Session.objects.get().get_decoded() == {'withdrawal_amount': 1000, 'withdrawal_fee': 20}
@@ -0,0 +1,94 @@
+import csv
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from money_transfer.models import Transaction
+from money_transfer.services import TransactionService, StatementService
+
+User = get_user_model()
+
+
+@pytest.fixture
+def alice(db, make_active_user):
+    alice = make_active_user("alice@test.com", "94000001")
+    bob = make_active_user("bob@test.com", "94000002")
+    TransactionService.deposit(alice, 50000)
+    TransactionService.transfer(alice, bob.email, 10000)
+    TransactionService.deposit(bob, 3000)
+    TransactionService.transfer(bob, alice.email, 2500)
+    TransactionService.withdraw(alice, 5000)
+    return User.objects.select_related('virtual_account').get(pk=alice.pk)
+
+
+def read_statement(lines):
+    return list(csv.DictReader(StringIO(''.join(lines))))
+
+
+def test_statement_running_balance(alice):
+    rows = read_statement(StatementService.iter_csv(alice.virtual_account))
+
+    # Les frais ne sont pas une ligne à part : ils sont compris dans le retrait
+    assert [row['Type'] for row in rows] == ['Dépôt', 'Transfert', 'Transfert', 'Retrait']
+    assert [row['Solde'] for row in rows] == ['50000', '40000', '42500', '37500']
+    assert rows[1]['Contrepartie'] == 'bob@test.com'
+    assert rows[3]['Débit'] == '5000' and rows[3]['Frais'] == '100'
+    assert int(rows[-1]['Solde']) == alice.virtual_account.balance
+
+
+def test_statement_period_starts_with_opening_balance(alice):
+    first = Transaction.objects.filter(sender_account=alice.virtual_account).earliest('created_at')
+    Transaction.objects.filter(pk=first.pk).update(created_at=timezone.now() - timedelta(days=10))
+    today = timezone.localdate()
+
+    rows = read_statement(StatementService.iter_csv(alice.virtual_account, today, today))
+
+    assert rows[0]['Description'] == "Solde d'ouverture" and rows[0]['Solde'] == '50000'
+    assert [row['Solde'] for row in rows[1:]] == ['40000', '42500', '37500']
+
+
+def test_statement_reads_in_chunks_with_one_query(alice):
+    with CaptureQueriesContext(connection) as context:
+        lines = list(StatementService.iter_csv(alice.virtual_account, chunk_size=1))
+
+    assert len(lines) == 5
+    assert len(context.captured_queries) == 1
+
+
+def test_statement_view_streams_csv(client, alice):
+    client.force_login(alice)
+
+    response = client.get(reverse('transactions_statement'))
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response['Content-Type'].startswith('text/csv')
+    rows = read_statement(chunk.decode() for chunk in response.streaming_content)
+    assert rows[-1]['Solde'] == '37500'
+
+
+def test_admin_statement_requires_staff(client, alice, make_active_user):
+    client.force_login(alice)
+    response = client.get(reverse('admin_user_statement', args=[alice.id]))
+    assert not getattr(response, 'streaming', False)
+
+    admin = make_active_user("admin@test.com", "94000003", is_staff=True, is_superuser=True)
+    client.force_login(admin)
+    response = client.get(reverse('admin_user_statement', args=[alice.id]))
+    assert response.streaming
+
+
+def test_export_statement_command(alice, tmp_path):
+    output = tmp_path / 'releve.csv'
+    call_command('export_statement', email=alice.email, output=str(output), stderr=StringIO())
+
+    with open(output, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
@@ -0,0 +1,120 @@
+import importlib
+import json
+from datetime import timedelta
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from money_transfer.models import VirtualAccount, HourlyTransactionStats, DailyTransactionStats
+from money_transfer.services import TransactionService, StatsService
+
+User = get_user_model()
+
+
+def snapshot(model, field):
+    return sorted(
+        (str(getattr(row, field)), row.type, row.status, row.count, row.volume, row.fees)
+        for row in model.objects.all()
+    )
+
+
+@pytest.mark.django_db
+def test_rollups_follow_write_path_and_match_rebuild(make_active_user):
+    alice = make_active_user("alice@test.com", "96000000")
+    bob = make_active_user("bob@test.com", "96000001")
+
+    TransactionService.deposit(alice, 10000)
+    TransactionService.deposit(alice, 5000)
+    TransactionService.withdraw(alice, 1000)
+    TransactionService.bulk_transfer(alice, [(bob.email, 300), (bob.email, 200)])
+
+    today = timezone.localdate()
+    series = {point['type']: point for point in StatsService.get_transaction_series(today, today)}
+    assert series['DEPOSIT'] == {'bucket': today, 'type': 'DEPOSIT', 'count': 2, 'volume': 15000, 'fees': 0}
+    assert series['WITHDRAWAL']['fees'] == 20
+    assert series['FEE']['volume'] == 20
+    assert series['TRANSFER']['count'] == 2
+    assert series['TRANSFER']['volume'] == 500
+
+    hourly = StatsService.get_transaction_series(today, today, granularity='hour')
+    assert sum(point['count'] for point in hourly) == 6
+
+    # La reconstruction depuis les transactions donne les mêmes cumuls
+    daily_before = snapshot(DailyTransactionStats, 'day')
+    hourly_before = snapshot(HourlyTransactionStats, 'hour')
+    StatsService.rebuild_transaction_rollups()
+    assert snapshot(DailyTransactionStats, 'day') == daily_before
+    assert snapshot(HourlyTransactionStats, 'hour') == hourly_before
+
+
+@pytest.mark.django_db
+def test_migration_builds_rollups_of_existing_history(make_active_user):
+    # Historique antérieur aux cumuls : la migration de données le reprend
+    alice = make_active_user("alice@test.com", "96000000")
+    TransactionService.deposit(alice, 10000)
+    TransactionService.withdraw(alice, 1000)
+    daily = snapshot(DailyTransactionStats, 'day')
+    DailyTransactionStats.objects.all().delete()
+    HourlyTransactionStats.objects.all().delete()
+
+    migration = importlib.import_module('money_transfer.migrations.0012_rebuild_transaction_rollups')
+    migration.rebuild_transaction_rollups(apps, None)
+
+    assert snapshot(DailyTransactionStats, 'day') == daily
+    assert HourlyTransactionStats.objects.exists()
+
+
+@pytest.mark.django_db
+def test_series_reads_only_rollups(django_assert_num_queries, make_active_user):
+    alice = make_active_user("alice@test.com", "96000000")
+    TransactionService.deposit(alice, 10000)
+    today = timezone.localdate()
+
+    with django_assert_num_queries(1) as context:
+        StatsService.get_transaction_series(today.replace(day=1), today)
+    assert 'money_transfer_transaction"' not in context.captured_queries[0]['sql']
+
+
+@pytest.mark.django_db
+def test_admin_statistics_views(client, make_active_user):
+    admin = User.objects.create_superuser(email="admin@test.com", phone="96000009", password="pass1234")
+    VirtualAccount.objects.create(user=admin, balance=0, is_active=True)
+    alice = make_active_user("alice@test.com", "96000000")
+    TransactionService.deposit(alice, 10000)
+    client.force_login(admin)
+
+    response = client.get(reverse('admin_statistics'))
+    assert response.status_code == 200
+    assert response.context['granularity'] == 'day'
+    assert response.context['buckets'][0]['volume'] == 10000
+
+    response = client.get(reverse('admin_statistics_json'), {'period': 'today'})
+    assert response.status_code == 200
+    data = json.loads(response.content)
+    assert data['granularity'] == 'hour'
+    assert data['totals']['DEPOSIT'] == {'count': 1, 'volume': 10000, 'fees': 0}
+
+    response = client.get(reverse('admin_statistics_json'), {'period': 'custom'})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_hourly_granularity_is_capped(client):
+    admin = User.objects.create_superuser(email="admin@test.com", phone="96000009", password="pass1234")
+    VirtualAccount.objects.create(user=admin, balance=0, is_active=True)
+    client.force_login(admin)
+    today = timezone.localdate()
+
+    def granularity(date_from):
+        response = client.get(reverse('admin_statistics_json'), {
+            'period': 'custom',
+            'date_from': date_from.isoformat(),
+            'date_to': today.isoformat(),
+            'granularity': 'hour',
+        })
+        return json.loads(response.content)['granularity']
+
+    assert granularity(today - timedelta(days=30)) == 'hour'
+    assert granularity(today - timedelta(days=31)) == 'day'
@@ -0,0 +1,52 @@
+import pytest
+from django.contrib.auth import get_user_model
+from money_transfer.models import VirtualAccount, Transaction
+from money_transfer.models.transaction import TypeTransaction, TransactionStatus
+
+User = get_user_model()
+
+
+@pytest.fixture
+def txn():
+    user = User.objects.create_user(
+        email="transition@test.com",
+        phone="97000000",
+        password="pass1234",
+        is_verified=True
+    )
+    account = VirtualAccount.objects.create(user=user, balance=0, is_active=True)
+    return Transaction.objects.create(
+        type=TypeTransaction.DEPOSIT,
+        amount=1000,
+        net_amount=1000,
+        sender_account=account,
+        receiver_account=account,
+    )
+
+
+@pytest.mark.django_db
+def test_transition_is_a_single_conditional_update(txn, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        txn.transition(TransactionStatus.SUCCESS)
+
+    assert txn.status == TransactionStatus.SUCCESS
+    assert Transaction.objects.get(pk=txn.pk).status == TransactionStatus.SUCCESS
+
+
+@pytest.mark.django_db
+def test_transition_from_terminal_state_is_refused(txn):
+    txn.transition(TransactionStatus.FAILED)
+
+    with pytest.raises(ValueError):
+        txn.transition(TransactionStatus.SUCCESS)
+    assert Transaction.objects.get(pk=txn.pk).status == TransactionStatus.FAILED
+
+
+@pytest.mark.django_db
+def test_immutable_fields_are_checked_without_reading_the_row(txn, django_assert_num_queries):
+    loaded = Transaction.objects.get(pk=txn.pk)
+    loaded.amount = 1
+
+    with django_assert_num_queries(0):
+        with pytest.raises(Exception):
+            loaded.save()
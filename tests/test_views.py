@@ -1,6 +1,8 @@
 import pytest
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from money_transfer.models import VirtualAccount
+from money_transfer.models.user import UserStatus
 
 User = get_user_model()
 
@@ -11,17 +13,35 @@ def test_views_status_code_200(client):
         email="test@test.com",
         phone="90000000",
         password="pass1234",
+        status=UserStatus.ACTIVE,
         is_verified=True
     )
+    VirtualAccount.objects.create(user=user, balance=0, is_active=True)
 
     client.login(email="test@test.com", password="pass1234")
 
     urls = [
-        reverse("admin_dashboard"),
-        reverse("transaction_history"),
-        reverse("activate_account"),
+        reverse("dashboard"),
+        reverse("transactions_history"),
+        reverse("profile"),
     ]
 
     for url in urls:
         response = client.get(url)
         assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_admin_views_require_staff(client):
+    User.objects.create_user(
+        email="test@test.com",
+        phone="90000000",
+        password="pass1234",
+        status=UserStatus.ACTIVE,
+        is_verified=True
+    )
+
+    client.login(email="test@test.com", password="pass1234")
+
+    response = client.get(reverse("admin_dashboard"))
+    assert response.status_code != 200
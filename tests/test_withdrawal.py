@@ -1,7 +1,8 @@
 import pytest
 from django.contrib.auth import get_user_model
-from wallets.models import VirtualAccount
-from transactions.services import withdraw_money
+from money_transfer.models import VirtualAccount
+from money_transfer.models.user import UserStatus
+from money_transfer.services import TransactionService
 
 User = get_user_model()
 
@@ -12,6 +13,7 @@ def test_withdraw_money():
         email="withdraw@test.com",
         phone="92000000",
         password="pass1234",
+        status=UserStatus.ACTIVE,
         is_verified=True
     )
 
@@ -21,7 +23,11 @@ def test_withdraw_money():
         is_active=True
     )
 
-    withdraw_money(account, amount=5000, fee=500)
+    success, message, transaction = TransactionService.withdraw(user, 5000)
 
+    assert success, message
     account.refresh_from_db()
-    assert account.balance == 14500
+    assert account.balance == 15000
+    # Frais de retrait (2 %) prélevés sur le montant versé
+    assert transaction.fee == 100
+    assert transaction.net_amount == 4900